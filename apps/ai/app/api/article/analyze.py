@@ -43,9 +43,9 @@ async def article_analyze(request: Request, body: ArticleAnalyzeRequest) -> Arti
         logger.info(
             "article_analyze_complete",
             request_id=request_id,
-            sentence_count=result["meta"]["sentenceCount"],
-            expression_count=result["meta"]["expressionCount"],
-            processing_time=result["meta"]["processingTime"],
+            sentence_count=result.meta.sentence_count,
+            expression_count=result.meta.expression_count,
+            processing_time=result.meta.processing_time,
         )
 
         return ArticleAnalyzeResponse(success=True, data=result)
@@ -1,12 +1,12 @@
 """Health check endpoint"""
 
-import httpx
 import structlog
 from fastapi import APIRouter, Request
 
 from app import __version__
 from app.config import get_settings
 from app.models import HealthResponse, ServiceStatus
+from app.services.video.stt_backends import get_stt_backend_pool
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -17,25 +17,23 @@ async def health_check(request: Request) -> HealthResponse:
     """
     Health check endpoint
 
-    Returns service status and external service availability
+    Returns service status and external service availability. Public, so
+    booleans only; per-endpoint STT state is on /metrics.
     """
     request_id = getattr(request.state, "request_id", "unknown")
     settings = get_settings()
 
     openai_ok = bool(settings.openai_api_key)
-    stt_api_ok = False
-
-    # Check STT API availability (server reachable = ok)
-    try:
-        async with httpx.AsyncClient(timeout=settings.timeout_health) as client:
-            response = await client.get(f"{settings.stt_api_url}/")
-            # Any response means server is reachable (even 404)
-            stt_api_ok = response.status_code < 500
-    except Exception as e:
+
+    # Check every STT endpoint (server reachable = ok); read-only, ejected
+    # endpoints rejoin only through the pool's own cooldown probe
+    probes = await get_stt_backend_pool().check_all()
+    stt_api_ok = any(probes.values())
+    if not stt_api_ok:
         logger.warning(
             "stt_health_check_failed",
             request_id=request_id,
-            error=str(e)
+            backends=list(probes)
         )
 
     services = ServiceStatus(openai=openai_ok, stt_api=stt_api_ok)
@@ -48,7 +46,8 @@ async def health_check(request: Request) -> HealthResponse:
         request_id=request_id,
         status=status,
         openai=openai_ok,
-        stt_api=stt_api_ok
+        stt_api=stt_api_ok,
+        stt_backends=probes
     )
 
     return HealthResponse(
@@ -0,0 +1,19 @@
+"""Metrics endpoint"""
+
+from typing import Any
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict[str, Any]:
+    """
+    In-process metrics snapshot
+
+    Counters, gauges and summaries for this worker (LLM token usage,
+    latencies, pool statistics)
+    """
+    return metrics.snapshot()
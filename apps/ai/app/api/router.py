@@ -2,8 +2,8 @@
 
 from fastapi import APIRouter
 
-from . import health
-from .video import analyze, stt, translate
+from . import health, metrics
+from .video import analyze, analyze_translate, stt, stt_jobs, translate
 from .study import analyze as study_analyze
 from .article import analyze as article_analyze
 from .article import parse_sentence as article_parse
@@ -13,13 +13,16 @@ router = APIRouter()
 
 # Health check (root level)
 router.include_router(health.router, tags=["health"])
+router.include_router(metrics.router, tags=["health"])
 
 # STT endpoints (root level for backward compatibility)
 router.include_router(stt.router, tags=["stt"])
+router.include_router(stt_jobs.router, tags=["stt"])
 
 # API v1 endpoints
 router.include_router(analyze.router, prefix="/api/v1", tags=["analyze"])
 router.include_router(translate.router, prefix="/api/v1", tags=["translate"])
+router.include_router(analyze_translate.router, prefix="/api/v1", tags=["analyze"])
 router.include_router(study_analyze.router, prefix="/api/v1", tags=["study"])
 router.include_router(article_analyze.router, prefix="/api/v1", tags=["article"])
 router.include_router(article_parse.router, prefix="/api/v1", tags=["article"])
@@ -43,9 +43,9 @@ async def study_analyze(request: Request, body: StudyAnalyzeRequest) -> StudyAna
         logger.info(
             "study_analyze_complete",
             request_id=request_id,
-            sentence_count=result["meta"]["sentenceCount"],
-            expression_count=result["meta"]["expressionCount"],
-            processing_time=result["meta"]["processingTime"],
+            sentence_count=result.meta.sentence_count,
+            expression_count=result.meta.expression_count,
+            processing_time=result.meta.processing_time,
         )
 
         return StudyAnalyzeResponse(success=True, data=result)
@@ -0,0 +1,139 @@
+"""Fused analyze + translate endpoint"""
+
+import asyncio
+import time
+import structlog
+from fastapi import APIRouter, Request
+
+from app.models import (
+    AnalyzeTranslateRequest,
+    AnalyzeTranslateResponse,
+    AnalyzeTranslateData,
+    AnalyzeTranslateMeta,
+    TranslationData,
+    TranslatedSegment,
+)
+from app.services import LLMService
+from app.services.shared.translation import (
+    check_transcript_length,
+    prepare_transcript,
+    translate_segments_multi,
+)
+from app.core.rate_limiter import limiter, get_analyze_limit
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+async def _timed(coro) -> tuple[object, float]:
+    """Await a coroutine and return (result, elapsed seconds)"""
+    start_time = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start_time
+
+
+@router.post("/analyze-translate", response_model=AnalyzeTranslateResponse)
+@limiter.limit(get_analyze_limit)
+async def analyze_translate(
+    request: Request,
+    body: AnalyzeTranslateRequest
+) -> AnalyzeTranslateResponse:
+    """
+    Analyze a video and translate its segments in one request
+
+    The segment list is validated, formatted and batched once and both
+    stages start immediately from that shared transcript, so latency is
+    the slower of the two stages instead of their sum.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        body: Video metadata, segments, and translation languages
+
+    Returns:
+        Analysis result and translated segments
+
+    Raises:
+        AIServiceError: If the transcript is too long
+        LLMError: If OpenAI API call fails
+        RateLimitExceeded: If rate limit is exceeded
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    start_time = time.perf_counter()
+
+    segments = [
+        {"start": seg.start, "end": seg.end, "text": seg.text}
+        for seg in body.segments
+    ]
+    check_transcript_length(segments)
+    prepared = prepare_transcript(segments)
+
+    logger.info(
+        "analyze_translate_start",
+        request_id=request_id,
+        title=body.metadata.title[:50],
+        segments_count=len(segments),
+        source_language=body.source_language,
+        target_languages=body.target_languages
+    )
+
+    llm_service = LLMService()
+    analysis_task = asyncio.create_task(_timed(llm_service.analyze(
+        metadata=body.metadata,
+        segments=body.segments,
+        timestamped_transcript=prepared.timestamped_text
+    )))
+    translation_task = asyncio.create_task(_timed(translate_segments_multi(
+        segments=segments,
+        source_language=body.source_language,
+        target_languages=body.target_languages,
+        prepared=prepared
+    )))
+
+    try:
+        (analysis, analysis_time), (translated, translation_time) = await asyncio.gather(
+            analysis_task, translation_task
+        )
+    except BaseException:
+        # Don't leave the sibling stage running after a failure
+        analysis_task.cancel()
+        translation_task.cancel()
+        raise
+
+    primary_language = body.target_languages[0]
+    translated_segments = [
+        TranslatedSegment(
+            start=seg["start"],
+            end=seg["end"],
+            originalText=seg["original_text"],
+            translatedText=seg["translations"][primary_language],
+            translations=seg["translations"],
+        )
+        for seg in translated
+    ]
+
+    processing_time = time.perf_counter() - start_time
+
+    logger.info(
+        "analyze_translate_complete",
+        request_id=request_id,
+        watch_score=analysis.watch_score,
+        translated_count=len(translated_segments),
+        analysis_time=round(analysis_time, 3),
+        translation_time=round(translation_time, 3),
+        processing_time=round(processing_time, 3)
+    )
+
+    return AnalyzeTranslateResponse(
+        success=True,
+        data=AnalyzeTranslateData(
+            analysis=analysis,
+            translation=TranslationData(segments=translated_segments),
+        ),
+        meta=AnalyzeTranslateMeta(
+            translatedCount=len(translated_segments),
+            targetLanguages=body.target_languages,
+            analysisTime=round(analysis_time, 3),
+            translationTime=round(translation_time, 3),
+            processingTime=round(processing_time, 3),
+        ),
+    )
@@ -1,16 +1,21 @@
 """STT proxy endpoint"""
 
 import structlog
-from fastapi import APIRouter, File, Form, UploadFile, Request
+from fastapi import APIRouter, File, Form, Query, Response, UploadFile, Request
 
-from app.services import STTClient, YouTubeAudioDownloader
+from app.services import transcribe_audio
+from app.services.video import stt_pipeline
+from app.services.video.audio_probe import validate_audio_content
+from app.services.video.stt_client import STTClient
+from app.services.video.stt_jobs import get_job_manager
 from app.models import STTResponse
 from app.core.rate_limiter import limiter, get_stt_limit
-from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.responses import model_response
 from app.config import get_settings
+from app.api.video.uploads import ScratchUploadRoute
 
 logger = structlog.get_logger()
-router = APIRouter()
+router = APIRouter(route_class=ScratchUploadRoute)
 settings = get_settings()
 
 
@@ -19,8 +24,9 @@ settings = get_settings()
 async def transcribe(
     request: Request,
     audio: UploadFile = File(...),
-    language: str = Form(default="auto")
-) -> STTResponse:
+    language: str = Form(default="auto"),
+    max_seconds: int | None = Form(default=None, ge=1)
+) -> Response:
     """
     Transcribe audio using external STT API
 
@@ -31,33 +37,49 @@ async def transcribe(
         request: FastAPI request object (for rate limiting)
         audio: Audio file (webm, mp3, wav, m4a, ogg, flac)
         language: Language hint ("auto" for auto-detection)
+        max_seconds: Transcribe only the first N seconds (preview, partial result)
 
     Returns:
         STT result with text, language, and segments
 
     Raises:
-        ValidationError: If file validation fails
+        ValidationError: If file validation fails (size, extension, content)
+        AIServiceError 422: If the audio is longer than the STT limit
         STTError: If STT API call fails
         RateLimitExceeded: If rate limit is exceeded
     """
     request_id = getattr(request.state, "request_id", "unknown")
+    filename = audio.filename or "audio.webm"
 
     logger.info(
         "stt_request_received",
         request_id=request_id,
         filename=audio.filename,
         content_type=audio.content_type,
-        language=language
+        language=language,
+        max_seconds=max_seconds
     )
 
-    audio_data = await audio.read()
-    stt_client = STTClient()
-
-    result = await stt_client.transcribe(
-        audio_data=audio_data,
-        filename=audio.filename or "audio.webm",
-        language=language,
-        content_type=audio.content_type
+    # Reject non-audio and over-long files before queueing any STT work
+    STTClient().validate_file(audio.size, filename, audio.content_type)
+
+    # The form parser already spooled the upload into the scratch space
+    # (ScratchUploadRoute), where it counts against the quota until closed
+    await validate_audio_content(audio, filename, max_seconds)
+
+    # Stream the (spooled) upload through the pipeline instead of reading it
+    # into memory; the job pool bounds how many transcriptions run at once
+    result = await get_job_manager().run(
+        "upload",
+        lambda: transcribe_audio(
+            audio=audio,
+            filename=filename,
+            language=language,
+            content_type=audio.content_type,
+            file_size=audio.size,
+            max_seconds=max_seconds
+        ),
+        request_id=request_id
     )
 
     logger.info(
@@ -65,10 +87,11 @@ async def transcribe(
         request_id=request_id,
         text_length=len(result.text),
         language=result.language,
-        segments_count=len(result.segments)
+        segments_count=len(result.segments),
+        partial=result.partial
     )
 
-    return result
+    return model_response(result)
 
 
 # Backward compatible endpoint
@@ -78,13 +101,13 @@ async def transcribe_legacy(
     request: Request,
     audio: UploadFile = File(...),
     language: str = Form(default="auto")
-) -> STTResponse:
+) -> Response:
     """
     Legacy endpoint for backward compatibility
 
     Same as /stt/transcribe but with old path
     """
-    return await transcribe(request=request, audio=audio, language=language)
+    return await transcribe(request=request, audio=audio, language=language, max_seconds=None)
 
 
 @router.post("/stt/video/{video_id}", response_model=STTResponse)
@@ -92,8 +115,9 @@ async def transcribe_legacy(
 async def transcribe_video(
     request: Request,
     video_id: str,
-    language: str = "auto"
-) -> STTResponse:
+    language: str = "auto",
+    max_seconds: int | None = Query(default=None, ge=1)
+) -> Response:
     """
     Download audio from YouTube and transcribe using STT
 
@@ -102,10 +126,14 @@ async def transcribe_video(
     2. Send to external STT API
     3. Return transcription result
 
+    Synchronous wrapper over the job pool; use POST /stt/jobs/video/{video_id}
+    to avoid holding the connection open.
+
     Args:
         request: FastAPI request object (for rate limiting)
         video_id: YouTube video ID
         language: Language hint ("auto" for auto-detection)
+        max_seconds: Transcribe only the first N seconds (preview, partial result)
 
     Returns:
         STT result with text, language, and segments
@@ -121,49 +149,14 @@ async def transcribe_video(
         "stt_video_request_received",
         request_id=request_id,
         video_id=video_id,
-        language=language
-    )
-
-    # Download audio from YouTube
-    downloader = YouTubeAudioDownloader()
-    audio_data, duration = await downloader.download_audio(video_id)
-
-    if audio_data is None:
-        if duration and not downloader.is_within_limit(duration):
-            duration_minutes = duration / 60
-            max_minutes = downloader.max_duration_minutes
-            raise AIServiceError(
-                code=ErrorCode.AUDIO_TOO_LONG,
-                message=f"영상 길이({int(duration_minutes)}분)가 최대 허용 시간({max_minutes}분)을 초과했습니다. 더 짧은 영상을 시도해주세요!",
-                status_code=422,
-                details={
-                    "video_id": video_id,
-                    "duration_minutes": round(duration_minutes, 1),
-                    "max_duration_minutes": max_minutes
-                }
-            )
-        raise AIServiceError(
-            code=ErrorCode.STT_ERROR,
-            message=f"영상 오디오를 다운로드할 수 없습니다. 영상이 비공개이거나 접근이 제한되었을 수 있습니다.",
-            status_code=400,
-            details={"video_id": video_id}
-        )
-
-    logger.info(
-        "stt_video_audio_downloaded",
-        request_id=request_id,
-        video_id=video_id,
-        size_mb=round(len(audio_data) / 1024 / 1024, 2),
-        duration=duration
+        language=language,
+        max_seconds=max_seconds
     )
 
-    # Transcribe using STT
-    stt_client = STTClient()
-    result = await stt_client.transcribe(
-        audio_data=audio_data,
-        filename=f"{video_id}.m4a",
-        language=language,
-        content_type="audio/mp4"
+    result = await get_job_manager().run(
+        "video",
+        lambda: stt_pipeline.transcribe_video(video_id, language, max_seconds),
+        request_id=request_id
     )
 
     logger.info(
@@ -172,7 +165,8 @@ async def transcribe_video(
         video_id=video_id,
         text_length=len(result.text),
         language=result.language,
-        segments_count=len(result.segments)
+        segments_count=len(result.segments),
+        partial=result.partial
     )
 
-    return result
+    return model_response(result)
@@ -0,0 +1,168 @@
+"""Asynchronous STT job endpoints
+
+POST returns 202 with a job id right away; progress is read by polling
+GET /stt/jobs/{job_id} or streamed from GET /stt/jobs/{job_id}/events (SSE).
+"""
+
+import structlog
+from fastapi import APIRouter, File, Form, Query, Response, UploadFile, Request
+from fastapi.responses import StreamingResponse
+
+from app.services import transcribe_audio
+from app.services.video import stt_pipeline
+from app.services.video.audio_probe import validate_audio_content
+from app.services.video.multipart_stream import spool_source
+from app.services.video.stt_client import STTClient
+from app.services.video.stt_jobs import STTJob, get_job_manager
+from app.models import STTJobStatus
+from app.core.rate_limiter import limiter, get_stt_limit
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.responses import model_response
+from app.config import get_settings
+from app.api.video.uploads import ScratchUploadRoute
+
+logger = structlog.get_logger()
+router = APIRouter(route_class=ScratchUploadRoute)
+
+
+def _get_job(job_id: str) -> STTJob:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise AIServiceError(
+            code=ErrorCode.JOB_NOT_FOUND,
+            message="작업을 찾을 수 없습니다. 만료되었거나 잘못된 작업 ID입니다",
+            status_code=404,
+            details={"job_id": job_id}
+        )
+    return job
+
+
+@router.post("/stt/jobs", response_model=STTJobStatus, status_code=202)
+@limiter.limit(get_stt_limit)
+async def create_transcribe_job(
+    request: Request,
+    audio: UploadFile = File(...),
+    language: str = Form(default="auto"),
+    max_seconds: int | None = Form(default=None, ge=1)
+) -> STTJobStatus:
+    """
+    Queue transcription of an uploaded audio file
+
+    The upload is validated and copied to a spooled temp file owned by the
+    job (the UploadFile is closed once this request returns).
+
+    Raises:
+        ValidationError: If file validation fails (size, extension, content)
+        AIServiceError 422: If the audio is longer than the STT limit
+        AIServiceError 503: If the job queue is full
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    filename = audio.filename or "audio.webm"
+    STTClient().validate_file(audio.size, filename, audio.content_type)
+
+    source = await spool_source(audio)
+    try:
+        await validate_audio_content(source, filename, max_seconds)
+    except BaseException:
+        source.close()
+        raise
+
+    async def work():
+        try:
+            return await transcribe_audio(
+                audio=source,
+                filename=filename,
+                language=language,
+                content_type=audio.content_type,
+                file_size=source.size,
+                max_seconds=max_seconds
+            )
+        finally:
+            source.close()
+
+    try:
+        job = get_job_manager().submit("upload", work, request_id=request_id)
+    except AIServiceError:
+        source.close()
+        raise
+
+    logger.info(
+        "stt_job_created",
+        request_id=request_id,
+        job_id=job.id,
+        filename=filename,
+        language=language
+    )
+    return job.snapshot()
+
+
+@router.post("/stt/jobs/video/{video_id}", response_model=STTJobStatus, status_code=202)
+@limiter.limit(get_stt_limit)
+async def create_video_job(
+    request: Request,
+    video_id: str,
+    language: str = "auto",
+    max_seconds: int | None = Query(default=None, ge=1)
+) -> STTJobStatus:
+    """
+    Queue download + transcription of a YouTube video
+
+    Raises:
+        AIServiceError 503: If the job queue is full
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    job = get_job_manager().submit(
+        "video",
+        lambda: stt_pipeline.transcribe_video(video_id, language, max_seconds),
+        request_id=request_id
+    )
+
+    logger.info(
+        "stt_job_created",
+        request_id=request_id,
+        job_id=job.id,
+        video_id=video_id,
+        language=language
+    )
+    return job.snapshot()
+
+
+@router.get("/stt/jobs/{job_id}", response_model=STTJobStatus)
+async def get_job(job_id: str) -> Response:
+    """
+    Current job state; `result` is set once status is "completed"
+
+    Raises:
+        AIServiceError 404: If the job is unknown or expired
+    """
+    return model_response(_get_job(job_id).snapshot())
+
+
+@router.get("/stt/jobs/{job_id}/events")
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """
+    Job progress as Server-Sent Events
+
+    Sends a `progress` event with the STTJobStatus on every stage change,
+    then a final `completed` or `failed` event, and a comment line as
+    keep-alive while nothing changes.
+
+    Raises:
+        AIServiceError 404: If the job is unknown or expired
+    """
+    job = _get_job(job_id)
+    heartbeat = get_settings().stt_job_heartbeat_seconds
+
+    async def events():
+        async for status in job.changes(heartbeat):
+            if status is None:
+                yield ": keep-alive\n\n"
+                continue
+            event = status.status if status.status in ("completed", "failed") else "progress"
+            yield f"event: {event}\ndata: {status.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
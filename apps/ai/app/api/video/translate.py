@@ -11,18 +11,16 @@ from app.models.video_schemas import (
     TranslationMeta,
     TranslatedSegment,
 )
-from app.services.shared.translation import translate_segments
+from app.services.shared.translation import check_transcript_length, translate_segments_multi
 from app.core.rate_limiter import limiter
 from app.core.exceptions import AIServiceError, ErrorCode
-from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-settings = get_settings()
 
 
-@router.post("/translate", response_model=TranslateResponse)
+@router.post("/translate", response_model=TranslateResponse, response_model_exclude_none=True)
 @limiter.limit("30/minute")
 async def translate(
     request: Request,
@@ -34,56 +32,48 @@ async def translate(
     - Batch processing with context preservation
     - Concurrent batch execution for performance
     - Falls back to original text on error
+    - Multiple target languages share one batching pass (`targetLanguages`)
     """
     start_time = time.time()
+    target_languages = body.get_target_languages()
+    is_multi_target = body.target_languages is not None
 
     logger.info(
         "Translation request",
         extra={
             "segments_count": len(body.segments),
             "source_language": body.source_language,
-            "target_language": body.target_language,
+            "target_languages": target_languages,
         }
     )
 
-    # 총 텍스트 길이 체크
-    total_text_length = sum(len(seg.text) for seg in body.segments)
-    max_transcript_length = settings.max_transcript_length
+    # Convert request segments to translation format
+    segments = [
+        {"start": seg.start, "end": seg.end, "text": seg.text}
+        for seg in body.segments
+    ]
 
-    if total_text_length > max_transcript_length:
-        raise AIServiceError(
-            code=ErrorCode.TRANSCRIPT_TOO_LONG,
-            message=f"자막 텍스트가 너무 많아요! AI가 읽기 힘들어해요. (현재: {total_text_length:,}자, 최대: {max_transcript_length:,}자)",
-            status_code=400,
-            details={
-                "total_text_length": total_text_length,
-                "max_transcript_length": max_transcript_length,
-            }
-        )
+    # 총 텍스트 길이 체크
+    check_transcript_length(segments)
 
     try:
-        # Convert request segments to translation format
-        segments = [
-            {"start": seg.start, "end": seg.end, "text": seg.text}
-            for seg in body.segments
-        ]
-
-        # Perform translation
-        translated = await translate_segments(
+        # Perform translation (one batching pass for every target language)
+        translated = await translate_segments_multi(
             segments=segments,
             source_language=body.source_language,
-            target_language=body.target_language,
+            target_languages=target_languages,
         )
 
         processing_time = time.time() - start_time
 
-        # Build response
+        # Build response - translatedText carries the first target language
         translated_segments = [
             TranslatedSegment(
                 start=seg["start"],
                 end=seg["end"],
                 originalText=seg["original_text"],
-                translatedText=seg["translated_text"],
+                translatedText=seg["translations"][target_languages[0]],
+                translations=seg["translations"] if is_multi_target else None,
             )
             for seg in translated
         ]
@@ -102,6 +92,7 @@ async def translate(
             meta=TranslationMeta(
                 translatedCount=len(translated_segments),
                 processingTime=round(processing_time, 3),
+                targetLanguages=target_languages if is_multi_target else None,
             ),
         )
 
@@ -0,0 +1,220 @@
+"""Multipart uploads spooled into the scratch space
+
+Starlette's form parser spools each uploaded file to its own
+SpooledTemporaryFile: in memory up to 1 MB, then in the system temp dir,
+outside the scratch quota. Routes built with ScratchUploadRoute get a
+ScratchRequest instead, whose form() feeds request.stream() to
+python-multipart's MultipartParser itself and writes file parts into
+get_scratch_space().spool(), so SCRATCH_DIR, SCRATCH_MEMORY_THRESHOLD_MB
+and SCRATCH_QUOTA_MB apply while the upload is received. An upload that
+would exceed the quota gets 503 mid-transfer instead of filling the disk.
+
+Only public APIs are used (Request.stream(), FormData, UploadFile and the
+python-multipart parser), so Starlette upgrades can't silently change how
+uploads are spooled.
+"""
+
+import codecs
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from python_multipart import MultipartParser
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import parse_options_header
+from starlette.datastructures import FormData, Headers, UploadFile
+from starlette.exceptions import HTTPException
+
+from app.core.exceptions import AIServiceError
+from app.services.video.scratch import get_scratch_space
+
+
+def _decode(value: bytes, charset: str) -> str:
+    try:
+        return value.decode(charset)
+    except (UnicodeDecodeError, LookupError):
+        return value.decode("latin-1")
+
+
+def _charset(content_type_params: dict[bytes, bytes]) -> str:
+    try:
+        return codecs.lookup(content_type_params.get(b"charset", b"utf-8").decode("latin-1")).name
+    except LookupError:
+        return "latin-1"
+
+
+class _FormBuilder:
+    """MultipartParser callbacks that collect fields and spool file parts"""
+
+    def __init__(self, charset: str, max_files: int | float, max_fields: int | float, max_part_size: int):
+        self.charset = charset
+        self.max_files = max_files
+        self.max_fields = max_fields
+        self.max_part_size = max_part_size
+        self.items: list[tuple[str, str | UploadFile]] = []
+        self.uploads: list[UploadFile] = []
+        # File data is written after each parser.write(), outside the callbacks
+        self.pending: list[tuple[UploadFile, bytes]] = []
+        self._files = 0
+        self._fields = 0
+        self._header_name = b""
+        self._header_value = b""
+        self._headers: list[tuple[bytes, bytes]] = []
+        self._name = ""
+        self._data = bytearray()
+        self._upload: UploadFile | None = None
+
+    def callbacks(self) -> dict[str, Callable[..., None]]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+        self._data = bytearray()
+        self._upload = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._header_name.lower(), self._header_value))
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        disposition = next((value for name, value in self._headers if name == b"content-disposition"), b"")
+        _, options = parse_options_header(disposition)
+        if b"name" not in options:
+            raise HTTPException(400, 'The Content-Disposition header field "name" must be provided.')
+        self._name = _decode(options[b"name"], self.charset)
+        if b"filename" not in options:
+            self._fields += 1
+            if self._fields > self.max_fields:
+                raise HTTPException(400, f"Too many fields. Maximum number of fields is {self.max_fields}.")
+            return
+        self._files += 1
+        if self._files > self.max_files:
+            raise HTTPException(400, f"Too many files. Maximum number of files is {self.max_files}.")
+        self._upload = UploadFile(
+            file=get_scratch_space().spool(),
+            size=0,
+            filename=_decode(options[b"filename"], self.charset),
+            headers=Headers(raw=self._headers),
+        )
+        self.uploads.append(self._upload)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._upload is not None:
+            self.pending.append((self._upload, data[start:end]))
+            return
+        if len(self._data) + end - start > self.max_part_size:
+            raise HTTPException(400, f"Part exceeded maximum size of {int(self.max_part_size / 1024)}KB.")
+        self._data.extend(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._upload is None:
+            self.items.append((self._name, _decode(bytes(self._data), self.charset)))
+        else:
+            self.items.append((self._name, self._upload))
+
+    async def write_pending(self) -> None:
+        for upload, data in self.pending:
+            await upload.write(data)
+        self.pending.clear()
+
+    def close(self) -> None:
+        for upload in self.uploads:
+            upload.file.close()
+
+
+async def parse_scratch_form(
+    headers: Headers,
+    stream: AsyncIterator[bytes],
+    *,
+    max_files: int | float = 1000,
+    max_fields: int | float = 1000,
+    max_part_size: int = 1024 * 1024,
+) -> FormData:
+    """
+    Parse a multipart body, spooling file parts into the scratch space
+
+    Raises:
+        HTTPException: 400 for malformed multipart data or exceeded limits
+        AIServiceError: 503 if a file would exceed the scratch quota
+    """
+    _, params = parse_options_header(headers.get("Content-Type", ""))
+    if b"boundary" not in params:
+        raise HTTPException(400, "Missing boundary in multipart.")
+    builder = _FormBuilder(_charset(params), max_files, max_fields, max_part_size)
+    parser = MultipartParser(params[b"boundary"], builder.callbacks())
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            await builder.write_pending()
+        parser.finalize()
+        await builder.write_pending()
+        for upload in builder.uploads:
+            await upload.seek(0)
+    except BaseException as exc:
+        builder.close()
+        if isinstance(exc, FormParserError):
+            raise HTTPException(400, "Invalid multipart data.") from exc
+        raise
+    return FormData(builder.items)
+
+
+class ScratchRequest(Request):
+    """Request whose multipart form is parsed by parse_scratch_form"""
+
+    _scratch_form: FormData | None = None
+
+    async def form(
+        self,
+        *,
+        max_files: int | float = 1000,
+        max_fields: int | float = 1000,
+        max_part_size: int = 1024 * 1024,
+    ) -> FormData:
+        content_type, _ = parse_options_header(self.headers.get("Content-Type", ""))
+        if content_type != b"multipart/form-data":
+            return await super().form(max_files=max_files, max_fields=max_fields, max_part_size=max_part_size)
+        if self._scratch_form is None:
+            async with aclosing(self.stream()) as stream:
+                self._scratch_form = await parse_scratch_form(
+                    self.headers,
+                    stream,
+                    max_files=max_files,
+                    max_fields=max_fields,
+                    max_part_size=max_part_size,
+                )
+        return self._scratch_form
+
+
+class ScratchUploadRoute(APIRoute):
+    """APIRoute that hands its endpoint a ScratchRequest"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def scratch_handler(request: Request) -> Response:
+            try:
+                return await handler(ScratchRequest(request.scope, request.receive))
+            except HTTPException as exc:
+                # FastAPI turns any error while reading the body into a 400;
+                # a scratch quota rejection should stay a 503
+                if isinstance(exc.__cause__, AIServiceError):
+                    raise exc.__cause__ from None
+                raise
+
+        return scratch_handler
@@ -12,13 +12,95 @@ class Settings(BaseSettings):
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
 
+    # LLM routing (model / max_tokens / timeout chosen per call)
+    llm_model_small: str = ""  # Inputs <= llm_small_input_tokens (empty = openai_model)
+    llm_model_large: str = ""  # Inputs >= llm_large_input_tokens (empty = openai_model)
+    llm_small_input_tokens: int = 1000
+    llm_large_input_tokens: int = 20000
+    llm_max_output_tokens: int = 8192
+    llm_timeout_base: float = 5.0  # seconds
+    llm_timeout_min: float = 10.0
+    llm_timeout_max: float = 120.0
+    llm_input_tokens_per_second: float = 2000.0  # prompt processing estimate
+    llm_output_tokens_per_second: float = 80.0  # generation speed estimate
+
+    # LLM backend pool (OpenAI + OpenAI-compatible servers)
+    llm_openai_weight: float = 1.0  # Weight of the OpenAI backend (0 = disabled)
+    llm_backends: str = ""  # JSON list: [{"name", "base_url", "api_key", "weight", "models": {alias: model}}]
+    llm_backend_failure_threshold: int = 3  # Consecutive failures before cooldown
+    llm_backend_cooldown_seconds: float = 30.0
+
     # Internal API Key (for NestJS Gateway authentication)
     internal_api_key: str = ""  # Empty = disabled (development mode)
 
     # External STT API
     stt_api_url: str = "http://work.soundmind.life:12321"
+    stt_api_urls: str = ""  # Comma-separated WhisperX endpoints, least-loaded first (empty = stt_api_url)
+    stt_backend_failure_threshold: int = 3  # Consecutive failures before an endpoint is ejected
+    stt_backend_cooldown_seconds: float = 30.0  # Ejected endpoints are re-probed after this
+
+    # Adaptive concurrency limit for STT requests (AIMD, all endpoints together)
+    stt_concurrency_initial: int = 8
+    stt_concurrency_min: int = 1
+    stt_concurrency_max: int = 64
+    stt_concurrency_backoff: float = 0.5  # Limit multiplier on timeouts / 5xx
+    stt_concurrency_latency_tolerance: float = 2.0  # Slower than this x usual latency = no increase
+    stt_concurrency_queue_timeout: float = 10.0  # Wait for a slot before 503 (0 = fail fast)
     stt_max_duration_minutes: int = 120
 
+    # Audio normalization before STT upload (ffmpeg -> 16 kHz mono)
+    stt_normalize_audio: bool = True  # false = upload originals (no VAD/chunking); auto-off without ffmpeg
+    stt_normalize_codec: str = "opus"  # opus | flac
+    stt_normalize_bitrate: str = "24k"  # Opus only
+    stt_normalize_timeout: int = 300  # seconds
+    ffmpeg_binary: str = "ffmpeg"
+    ffprobe_binary: str = "ffprobe"  # Upload duration/codec check before STT (skipped if missing)
+
+    # Silence trimming before STT (energy-based VAD, needs ffmpeg)
+    stt_vad_enabled: bool = True
+    stt_vad_threshold_db: float = 12.0  # Speech = this many dB above the noise floor
+    stt_vad_min_silence_seconds: float = 2.0  # Shorter pauses are kept
+    stt_vad_padding_seconds: float = 0.3  # Context kept around each speech span
+
+    # /stt/video: use the video's captions when there are any (no audio download / STT)
+    stt_captions_enabled: bool = True
+    stt_captions_allow_auto: bool = True  # Accept YouTube's auto-generated captions
+    stt_captions_timeout: float = 10.0
+
+    # /stt/video: stream media URL -> ffmpeg -> STT upload (constant memory, needs ffmpeg)
+    stt_video_streaming: bool = True  # ffmpeg reads the media URL (false = yt-dlp download first)
+
+    # Chunked STT for long audio (needs ffmpeg)
+    stt_chunk_seconds: int = 600  # Max chunk length (0 = one request per file)
+    stt_chunk_overlap_seconds: float = 5.0  # Overlap between neighbouring chunks
+    stt_chunk_concurrency: int = 4  # Chunks transcribed at once per request
+
+    # yt-dlp worker pool (downloads run off the event loop)
+    ytdlp_pool_mode: str = "process"  # process | thread
+    ytdlp_workers: int = 4  # Concurrent yt-dlp calls per service process
+    ytdlp_queue_size: int = 16  # Calls waiting for a worker beyond this get 503
+    ytdlp_audio_min_abr: int = 48  # kbps; smallest audio format at or above this (0 = best quality)
+    ytdlp_audio_format: str = ""  # Explicit yt-dlp format selector (overrides YTDLP_AUDIO_MIN_ABR)
+    ytdlp_info_cache_size: int = 256  # Extracted video infos kept per process (0 = off)
+    ytdlp_info_cache_ttl_seconds: int = 1800  # Media URLs in the info expire after a few hours
+
+    # Asynchronous STT jobs (bounded in-process worker pool)
+    stt_job_workers: int = 4  # STT jobs run at once per process (sync endpoints included)
+    stt_job_queue_size: int = 100  # Waiting jobs beyond this are rejected with 503
+    stt_job_retention_seconds: int = 3600  # Finished jobs stay pollable this long
+    stt_job_heartbeat_seconds: float = 15.0  # SSE keep-alive interval
+
+    # Scratch space for spooled audio (job uploads, transcodes, decoded PCM)
+    scratch_dir: str = ""  # Empty = system temp dir (RAM on Cloud Run); point at a real disk or volume
+    scratch_memory_threshold_mb: int = 8  # Spools stay in memory up to this size
+    scratch_quota_mb: int = 256  # Disk per process; requests beyond it get 503 (0 = unlimited)
+
+    # Transcript cache (SQLite, keyed by video id and audio content hash)
+    transcript_cache_enabled: bool = True
+    transcript_cache_path: str = ""  # SQLite file on a persistent volume (empty = off)
+    transcript_cache_max_mb: int = 64
+    transcript_cache_ttl_hours: int = 168  # 7 days
+
     # File limits
     max_file_size_mb: int = 500
 
@@ -32,10 +114,17 @@ class Settings(BaseSettings):
     retry_base_delay: float = 1.0  # seconds
 
     # Timeouts (seconds)
-    timeout_analyze: int = 30
+    timeout_analyze: int = 30  # Deprecated, unused: LLM timeouts come from llm_timeout_*
     timeout_stt: int = 300
     timeout_health: int = 5
 
+    # Shared outbound HTTP client (STT API, health probes)
+    http2_enabled: bool = True  # Used only if the h2 package is installed
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # seconds
+    http_connect_timeout: float = 10.0  # seconds
+
     # CORS
     cors_origins: str = ""  # Comma-separated origins, empty = allow all (dev only)
 
@@ -51,6 +140,7 @@ class Settings(BaseSettings):
     max_description_length: int = 10000  # YouTube allows up to 5000, but some have more
     max_transcript_length: int = 50000
     max_segments_count: int = 1000
+    max_target_languages: int = 5
 
     @model_validator(mode="after")
     def validate_production_settings(self) -> "Settings":
@@ -31,16 +31,22 @@ def setup_exception_handlers(app: FastAPI) -> None:
             status_code=exc.status_code
         )
 
+        # Errors that carry retry_after (429, overload 503) also set the header
+        retry_after = exc.details.get("retry_after")
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+
         # Use flat format for STT endpoints (backward compatibility)
         if "/stt/" in request.url.path or "/whisperX/" in request.url.path:
             return JSONResponse(
                 status_code=exc.status_code,
-                content=exc.to_flat_dict()
+                content=exc.to_flat_dict(),
+                headers=headers
             )
 
         return JSONResponse(
             status_code=exc.status_code,
-            content=exc.to_dict()
+            content=exc.to_dict(),
+            headers=headers
         )
 
     @app.exception_handler(RequestValidationError)
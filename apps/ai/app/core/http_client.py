@@ -0,0 +1,100 @@
+"""Shared outbound HTTP client
+
+One pooled httpx.AsyncClient per worker, opened and closed by the app
+lifespan, so STT calls and health probes reuse keep-alive connections
+instead of paying DNS/TCP/TLS setup on every request and retry. HTTP/2 is
+used when the optional h2 package is installed.
+
+Callers pass their own per-request timeouts.
+"""
+
+import importlib.util
+from typing import Any
+
+import httpx
+import structlog
+
+from app.config import get_settings
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+_client: httpx.AsyncClient | None = None
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a pooled AsyncClient from Settings"""
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=settings.http2_enabled and http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.timeout_stt, connect=settings.http_connect_timeout),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared client
+
+    Created lazily when the lifespan hasn't run (tests, scripts).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Open the shared client (app startup)"""
+    settings = get_settings()
+    client = get_http_client()
+    logger.info(
+        "http_client_started",
+        http2=settings.http2_enabled and http2_available(),
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections
+    )
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connections (app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("http_client_closed")
+
+
+def pool_stats() -> dict[str, Any]:
+    """Connection pool usage: connections by state and queued requests"""
+    if _client is None:
+        return {"open": False}
+
+    # httpcore internals - read defensively, they aren't public API
+    pool = getattr(_client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    requests = list(getattr(pool, "_requests", []) or [])
+
+    idle = sum(1 for c in connections if c.is_idle())
+    return {
+        "open": not _client.is_closed,
+        "connections": len(connections),
+        "in_use": len(connections) - idle,
+        "idle": idle,
+        "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+        "waiters": sum(1 for r in requests if r.is_queued()),
+        "max_connections": get_settings().http_max_connections,
+    }
+
+
+metrics.register_collector("http_pool", pool_stats)
@@ -0,0 +1,115 @@
+"""In-process metrics registry
+
+Lightweight counters, gauges and summaries kept in memory per worker and
+exposed as JSON via GET /metrics. Labels are passed as keyword arguments.
+"""
+
+import threading
+from typing import Any, Callable
+
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Summary:
+    """Running count/sum/min/max of observed values"""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "min": round(self.min, 6) if self.count else 0.0,
+            "max": round(self.max, 6) if self.count else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry (LLM calls run in worker threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._summaries: dict[str, dict[LabelKey, _Summary]] = {}
+        self._collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increment a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one observation in a summary"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            series.setdefault(key, _Summary()).observe(value)
+
+    def register_collector(self, name: str, collector: Callable[[], dict[str, Any]]) -> None:
+        """Register a callback whose result is included in every snapshot"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict"""
+        with self._lock:
+            result: dict[str, Any] = {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "gauges": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._gauges.items()
+                },
+                "summaries": {
+                    name: [{"labels": dict(key), **summary.to_dict()} for key, summary in series.items()]
+                    for name, series in self._summaries.items()
+                },
+            }
+            collectors = dict(self._collectors)
+
+        result["collectors"] = {}
+        for name, collector in collectors.items():
+            try:
+                result["collectors"][name] = collector()
+            except Exception as e:
+                result["collectors"][name] = {"error": str(e)}
+        return result
+
+    def reset(self) -> None:
+        """Clear all recorded values (collectors are kept)"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
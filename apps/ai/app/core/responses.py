@@ -0,0 +1,21 @@
+"""Pre-serialized JSON responses"""
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    JSON response serialized straight from a model
+
+    A model returned from a route is dumped to Python objects, validated
+    against response_model again and then encoded. Returning this skips
+    the round trip: pydantic-core writes the JSON in one pass. Only for
+    models that already are the route's response_model (which still
+    documents the schema).
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
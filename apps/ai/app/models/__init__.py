@@ -12,12 +12,17 @@ from .video_schemas import (
     FlatErrorResponse,
     STTRequest,
     STTResponse,
+    STTJobStatus,
     TranslationSegment,
     TranslatedSegment,
     TranslateRequest,
     TranslateResponse,
     TranslationData,
     TranslationMeta,
+    AnalyzeTranslateRequest,
+    AnalyzeTranslateData,
+    AnalyzeTranslateMeta,
+    AnalyzeTranslateResponse,
     ServiceStatus,
     HealthResponse,
 )
@@ -34,12 +39,17 @@ __all__ = [
     "FlatErrorResponse",
     "STTRequest",
     "STTResponse",
+    "STTJobStatus",
     "TranslationSegment",
     "TranslatedSegment",
     "TranslateRequest",
     "TranslateResponse",
     "TranslationData",
     "TranslationMeta",
+    "AnalyzeTranslateRequest",
+    "AnalyzeTranslateData",
+    "AnalyzeTranslateMeta",
+    "AnalyzeTranslateResponse",
     "ServiceStatus",
     "HealthResponse",
 ]
@@ -0,0 +1,153 @@
+"""Internal LLM response schemas (compact protocol)
+
+These models are sent to OpenAI as strict structured-output schemas and
+parsed straight from the response JSON. Short keys and positional arrays
+keep output tokens low; each model converts itself into the public
+response schema it mirrors.
+
+Protocol:
+- CompactAnalysis          -> AnalysisResult
+- TranslationBatch         -> translations in input order
+- CompactArticleAnalysis   -> ArticleAnalysisResult (sentences split server-side)
+- CompactStudyAnalysis     -> StudyAnalysisResult (sentences split server-side)
+"""
+
+from typing import Literal
+from pydantic import BaseModel
+
+from .video_schemas import AnalysisResult, Highlight
+from .article_schemas import ArticleAnalysisResult, ArticleSentence, ArticleExpression, ArticleAnalysisMeta
+from .study_schemas import StudyAnalysisResult, StudySentence, StudyExpression, StudyAnalysisMeta
+
+
+# Public field limits (Highlight) - strict schemas can't carry length limits
+HIGHLIGHT_TITLE_MAX = 50
+HIGHLIGHT_DESCRIPTION_MAX = 100
+
+
+# === Video Analysis ===
+
+class CompactHighlight(BaseModel):
+    """Highlight: t=timestamp (seconds), n=title, d=description"""
+    t: int
+    n: str
+    d: str
+
+    def to_highlight(self) -> Highlight:
+        return Highlight(
+            timestamp=max(0, self.t),
+            title=self.n[:HIGHLIGHT_TITLE_MAX],
+            description=self.d[:HIGHLIGHT_DESCRIPTION_MAX],
+        )
+
+
+class CompactAnalysis(BaseModel):
+    """Video analysis: s=summary, sc=watchScore, r=watchScoreReason, k=keywords, h=highlights"""
+    s: str
+    sc: int
+    r: str
+    k: list[str]
+    h: list[CompactHighlight]
+
+    def to_result(self, highlights: list[Highlight] | None = None) -> AnalysisResult:
+        """Convert to AnalysisResult, optionally with already-validated highlights"""
+        return AnalysisResult(
+            summary=self.s or "요약을 생성할 수 없습니다.",
+            watchScore=min(10, max(1, self.sc)),
+            watchScoreReason=self.r or "분석 정보가 부족합니다.",
+            keywords=self.k,
+            highlights=highlights if highlights is not None else [h.to_highlight() for h in self.h],
+        )
+
+
+# === Translation ===
+
+class TranslationBatch(BaseModel):
+    """Translation batch: t=translations, same order and count as the input"""
+    t: list[str]
+
+
+# === Article Analysis ===
+
+def _sentence_pairs(sentences: list[str], translations: list[str]) -> list[tuple[int, str, str]]:
+    """Pair server-side sentences with positional translations (missing -> empty)"""
+    return [
+        (idx, original, translations[idx] if idx < len(translations) else "")
+        for idx, original in enumerate(sentences)
+    ]
+
+
+class CompactArticleExpression(BaseModel):
+    """Expression: e=expression, m=meaning, c=category, i=sentenceId, f=form in article"""
+    e: str
+    m: str
+    c: Literal["idiom", "phrasal_verb", "collocation", "technical_term"]
+    i: int
+    f: str
+
+    def to_expression(self) -> ArticleExpression:
+        return ArticleExpression(expression=self.e, meaning=self.m, category=self.c, sentenceId=self.i, context=self.f)
+
+
+class CompactArticleAnalysis(BaseModel):
+    """English article analysis: t=translations per numbered sentence, x=expressions"""
+    t: list[str]
+    x: list[CompactArticleExpression]
+
+    def to_result(self, sentences: list[str], processing_time: float) -> ArticleAnalysisResult:
+        pairs = [
+            ArticleSentence(id=idx, original=original, translated=translated)
+            for idx, original, translated in _sentence_pairs(sentences, self.t)
+        ]
+        expressions = [x.to_expression() for x in self.x]
+        return ArticleAnalysisResult(
+            sentences=pairs,
+            expressions=expressions,
+            meta=ArticleAnalysisMeta(
+                sentenceCount=len(pairs),
+                expressionCount=len(expressions),
+                processingTime=round(processing_time, 1),
+            ),
+        )
+
+
+# === Study Analysis ===
+
+class CompactStudyExpression(BaseModel):
+    """Expression: e=expression, m=meaning, c=category, i=sentenceId, f=form in article"""
+    e: str
+    m: str
+    c: Literal["idiom", "collocation", "slang", "formal_expression", "grammar_pattern"]
+    i: int
+    f: str
+
+    def to_expression(self) -> StudyExpression:
+        return StudyExpression(expression=self.e, meaning=self.m, category=self.c, sentenceId=self.i, context=self.f)
+
+
+class CompactStudyAnalysis(BaseModel):
+    """Korean article analysis: t=translations per numbered sentence, x=expressions"""
+    t: list[str]
+    x: list[CompactStudyExpression]
+
+    def to_result(
+        self,
+        sentences: list[str],
+        target_language: str,
+        processing_time: float,
+    ) -> StudyAnalysisResult:
+        pairs = [
+            StudySentence(id=idx, original=original, translated=translated)
+            for idx, original, translated in _sentence_pairs(sentences, self.t)
+        ]
+        expressions = [x.to_expression() for x in self.x]
+        return StudyAnalysisResult(
+            sentences=pairs,
+            expressions=expressions,
+            meta=StudyAnalysisMeta(
+                sentenceCount=len(pairs),
+                expressionCount=len(expressions),
+                targetLanguage=target_language,
+                processingTime=round(processing_time, 1),
+            ),
+        )
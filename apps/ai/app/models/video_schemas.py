@@ -1,6 +1,7 @@
 """Pydantic schemas for API request/response"""
 
-from typing import Any
+from datetime import datetime
+from typing import Any, Literal
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.config import get_settings
@@ -136,6 +137,8 @@ class STTResponse(BaseModel):
     language: str
     language_probability: float
     segments: list[STTSegment]
+    source: Literal["stt", "captions", "auto_captions"] = "stt"  # /stt/video: where the transcript came from
+    partial: bool = False  # Only the first max_seconds were transcribed (preview)
 
 
 class STTRequest(BaseModel):
@@ -143,8 +146,32 @@ class STTRequest(BaseModel):
     language: str = "auto"
 
 
+class STTJobStatus(BaseModel):
+    """Asynchronous STT job state (/stt/jobs)"""
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    stage: str  # queued, downloading, transcoding, transcribing, completed, failed
+    chunks_done: int | None = None
+    chunks_total: int | None = None
+    result: STTResponse | None = None
+    error: FlatErrorResponse | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 # === Translation ===
 
+def normalize_target_languages(v: list[str]) -> list[str]:
+    """Drop blanks and duplicates (keeping order) and enforce the language limit"""
+    languages = list(dict.fromkeys(lang.strip() for lang in v if lang.strip()))
+    if not languages:
+        raise ValueError("번역할 언어를 하나 이상 지정해야 합니다")
+    settings = get_settings()
+    if len(languages) > settings.max_target_languages:
+        raise ValueError(f"번역 언어는 {settings.max_target_languages}개 이내여야 합니다")
+    return languages
+
+
 class TranslationSegment(BaseModel):
     """Segment for translation"""
     start: float = Field(..., ge=0)
@@ -158,6 +185,7 @@ class TranslatedSegment(BaseModel):
     end: float
     original_text: str = Field(alias="originalText")
     translated_text: str = Field(alias="translatedText")
+    translations: dict[str, str] | None = None  # Only for multi-target requests
 
     class Config:
         populate_by_name = True
@@ -168,6 +196,7 @@ class TranslateRequest(BaseModel):
     segments: list[TranslationSegment] = Field(..., min_length=1)
     source_language: str = Field(default="en", alias="sourceLanguage")
     target_language: str = Field(default="ko", alias="targetLanguage")
+    target_languages: list[str] | None = Field(default=None, alias="targetLanguages")
 
     class Config:
         populate_by_name = True
@@ -180,11 +209,23 @@ class TranslateRequest(BaseModel):
             raise ValueError(f"세그먼트는 {settings.max_segments_count}개 이내여야 합니다")
         return v
 
+    @field_validator("target_languages")
+    @classmethod
+    def validate_target_languages(cls, v: list[str] | None) -> list[str] | None:
+        if v is None:
+            return v
+        return normalize_target_languages(v)
+
+    def get_target_languages(self) -> list[str]:
+        """Requested target languages (targetLanguages wins over targetLanguage)"""
+        return self.target_languages or [self.target_language]
+
 
 class TranslationMeta(BaseModel):
     """Translation metadata"""
     translated_count: int = Field(alias="translatedCount")
     processing_time: float = Field(alias="processingTime")
+    target_languages: list[str] | None = Field(default=None, alias="targetLanguages")
 
     class Config:
         populate_by_name = True
@@ -202,6 +243,57 @@ class TranslateResponse(BaseModel):
     meta: TranslationMeta
 
 
+# === Analyze + Translate ===
+
+class AnalyzeTranslateRequest(BaseModel):
+    """Request for /analyze-translate endpoint"""
+    metadata: VideoMetadata
+    segments: list[STTSegment] = Field(..., min_length=1)
+    source_language: str = Field(default="en", alias="sourceLanguage")
+    target_languages: list[str] = Field(default=["ko"], alias="targetLanguages")
+
+    class Config:
+        populate_by_name = True
+
+    @field_validator("segments")
+    @classmethod
+    def validate_segments(cls, v: list[STTSegment]) -> list[STTSegment]:
+        settings = get_settings()
+        if len(v) > settings.max_segments_count:
+            raise ValueError(f"세그먼트는 {settings.max_segments_count}개 이내여야 합니다")
+        return v
+
+    @field_validator("target_languages")
+    @classmethod
+    def validate_target_languages(cls, v: list[str]) -> list[str]:
+        return normalize_target_languages(v)
+
+
+class AnalyzeTranslateData(BaseModel):
+    """Combined analysis and translation result"""
+    analysis: AnalysisResult
+    translation: TranslationData
+
+
+class AnalyzeTranslateMeta(BaseModel):
+    """Analyze + translate metadata"""
+    translated_count: int = Field(alias="translatedCount")
+    target_languages: list[str] = Field(alias="targetLanguages")
+    analysis_time: float = Field(alias="analysisTime")
+    translation_time: float = Field(alias="translationTime")
+    processing_time: float = Field(alias="processingTime")
+
+    class Config:
+        populate_by_name = True
+
+
+class AnalyzeTranslateResponse(BaseModel):
+    """Response for /analyze-translate endpoint"""
+    success: bool = True
+    data: AnalyzeTranslateData
+    meta: AnalyzeTranslateMeta
+
+
 # === Health ===
 
 class ServiceStatus(BaseModel):
@@ -2,7 +2,8 @@
 
 from .video.llm import LLMService
 from .video.stt_client import STTClient
+from .video.stt_pipeline import transcribe_audio, transcribe_video
 from .video.youtube_audio import YouTubeAudioDownloader
 from .shared.translation import translate_segments
 
-__all__ = ["LLMService", "STTClient", "translate_segments", "YouTubeAudioDownloader"]
+__all__ = ["LLMService", "STTClient", "transcribe_audio", "transcribe_video", "translate_segments", "YouTubeAudioDownloader"]
@@ -1,11 +1,10 @@
 """Sentence structure parsing service"""
 
-import json
 import structlog
-from openai import OpenAI
 
-from app.config import get_settings
 from app.core.exceptions import AIServiceError, ErrorCode
+from app.models.article_schemas import SentenceParseResult
+from app.services.shared.llm_client import complete_structured
 
 logger = structlog.get_logger()
 
@@ -31,19 +30,11 @@ SYSTEM_PROMPT = """당신은 영어 문장 구조 분석 전문가입니다.
 JSON만 반환하세요."""
 
 
-def _get_openai_client() -> OpenAI:
-    settings = get_settings()
-    return OpenAI(api_key=settings.openai_api_key, timeout=30.0)
-
-
 async def parse_sentence(
     sentence: str,
     context: str | None = None,
-) -> dict:
+) -> SentenceParseResult:
     """Parse an English sentence into grammatical components."""
-    settings = get_settings()
-    client = _get_openai_client()
-
     user_content = f"분석할 문장: {sentence}"
     if context:
         user_content += f"\n\n전후 문맥: {context}"
@@ -51,39 +42,24 @@ async def parse_sentence(
     logger.info("sentence_parse_start", sentence_length=len(sentence))
 
     try:
-        response = client.chat.completions.create(
-            model=settings.openai_model,
+        result = await complete_structured(
+            endpoint="parse_sentence",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
-            response_format={"type": "json_object"},
+            response_model=SentenceParseResult,
             temperature=0.2,
-            timeout=30,
         )
 
-        content = response.choices[0].message.content
-        result = json.loads(content)
-
         logger.info(
             "sentence_parse_complete",
-            components_count=len(result.get("components", [])),
-            grammar_points_count=len(result.get("grammarPoints", [])),
+            components_count=len(result.components),
+            grammar_points_count=len(result.grammar_points),
         )
 
-        return {
-            "components": result.get("components", []),
-            "readingOrder": result.get("readingOrder", ""),
-            "grammarPoints": result.get("grammarPoints", []),
-        }
+        return result
 
-    except json.JSONDecodeError as e:
-        logger.error("sentence_parse_json_error", error=str(e))
-        raise AIServiceError(
-            code=ErrorCode.LLM_ERROR,
-            message="구조 분석 결과를 파싱할 수 없습니다",
-            status_code=500,
-        )
     except AIServiceError:
         raise
     except Exception as e:
@@ -1,5 +1,17 @@
 """Shared services"""
 
-from .translation import translate_segments
+from .translation import (
+    PreparedTranscript,
+    check_transcript_length,
+    prepare_transcript,
+    translate_segments,
+    translate_segments_multi,
+)
 
-__all__ = ["translate_segments"]
+__all__ = [
+    "PreparedTranscript",
+    "check_transcript_length",
+    "prepare_transcript",
+    "translate_segments",
+    "translate_segments_multi",
+]
@@ -0,0 +1,207 @@
+"""LLM backend pool - OpenAI and OpenAI-compatible servers
+
+Backends come from Settings: the default OpenAI backend (openai_api_key,
+weighted by llm_openai_weight) plus any extra backends in llm_backends, a
+JSON list such as:
+
+    [{"name": "local", "base_url": "http://gpu-1:8000/v1", "api_key": "x",
+      "weight": 2, "models": {"gpt-4o-mini": "qwen2.5-14b-instruct"}}]
+
+`models` maps the model chosen by the routing policy to the backend's own
+model name ("*" = any model). Each call tries backends in health-weighted
+random order and fails over on connection errors, timeouts, throttling and
+5xx responses. A backend that fails llm_backend_failure_threshold times in
+a row cools down for llm_backend_cooldown_seconds.
+"""
+
+import json
+import random
+import time
+from functools import lru_cache
+from typing import Any
+
+import structlog
+from openai import OpenAI, APIConnectionError, APIStatusError, RateLimitError
+from pydantic import BaseModel, Field, ValidationError as PydanticValidationError
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+DEFAULT_BACKEND_NAME = "openai"
+
+# Smoothing factor for per-backend success rate and latency
+HEALTH_EWMA_ALPHA = 0.2
+# Lowest health a backend can reach while not cooling down
+HEALTH_FLOOR = 0.05
+
+
+class LLMBackendConfig(BaseModel):
+    """One OpenAI-compatible backend"""
+    name: str
+    base_url: str | None = None
+    api_key: str = ""
+    weight: float = Field(default=1.0, ge=0)
+    models: dict[str, str] = Field(default_factory=dict)
+
+
+class LLMBackend:
+    """Backend client plus health state"""
+
+    def __init__(self, config: LLMBackendConfig, max_retries: int):
+        self.name = config.name
+        self.base_url = config.base_url
+        self.weight = config.weight
+        self.models = config.models
+        self.client = OpenAI(
+            api_key=config.api_key or "unused",
+            base_url=config.base_url,
+            max_retries=max_retries,
+        )
+        self.health = 1.0
+        self.latency = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def resolve_model(self, model: str) -> str:
+        """Map the routed model to this backend's model name"""
+        return self.models.get(model) or self.models.get("*") or model
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def effective_weight(self) -> float:
+        return self.weight * max(HEALTH_FLOOR, self.health)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url or "https://api.openai.com/v1",
+            "weight": self.weight,
+            "health": round(self.health, 3),
+            "latency": round(self.latency, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "cooling_down": not self.available(time.monotonic()),
+        }
+
+
+def is_failover_error(error: Exception) -> bool:
+    """Errors another backend may not have (connection, timeout, 429, 5xx)"""
+    if isinstance(error, (APIConnectionError, RateLimitError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def load_backend_configs() -> list[LLMBackendConfig]:
+    """Build backend configs from Settings"""
+    settings = get_settings()
+    configs: list[LLMBackendConfig] = []
+
+    if settings.openai_api_key and settings.llm_openai_weight > 0:
+        configs.append(LLMBackendConfig(
+            name=DEFAULT_BACKEND_NAME,
+            api_key=settings.openai_api_key,
+            weight=settings.llm_openai_weight,
+        ))
+
+    if settings.llm_backends.strip():
+        try:
+            raw = json.loads(settings.llm_backends)
+            configs.extend(LLMBackendConfig.model_validate(item) for item in raw)
+        except (json.JSONDecodeError, TypeError, PydanticValidationError) as e:
+            raise AIServiceError(
+                code=ErrorCode.CONFIGURATION_ERROR,
+                message="LLM_BACKENDS is not a valid backend list",
+                details={"error": str(e)[:500]},
+                status_code=500,
+            )
+
+    names = [c.name for c in configs]
+    if len(names) != len(set(names)):
+        raise AIServiceError(
+            code=ErrorCode.CONFIGURATION_ERROR,
+            message="LLM backend names must be unique",
+            details={"backends": names},
+            status_code=500,
+        )
+
+    return [c for c in configs if c.weight > 0]
+
+
+class BackendPool:
+    """Health-weighted selection and failover bookkeeping"""
+
+    def __init__(self, configs: list[LLMBackendConfig]):
+        settings = get_settings()
+        # With somewhere to fail over to, don't wait on SDK-level retries
+        max_retries = 0 if len(configs) > 1 else 2
+        self.backends = [LLMBackend(c, max_retries) for c in configs]
+        self.failure_threshold = settings.llm_backend_failure_threshold
+        self.cooldown_seconds = settings.llm_backend_cooldown_seconds
+
+    def candidates(self) -> list[LLMBackend]:
+        """
+        Order backends for one call
+
+        Available backends are drawn by weighted random sampling (weight x
+        health) without replacement; cooling-down backends go last, soonest
+        to recover first, so a call still has somewhere to go.
+        """
+        if not self.backends:
+            raise AIServiceError(
+                code=ErrorCode.CONFIGURATION_ERROR,
+                message="No LLM backend configured",
+                status_code=500,
+            )
+
+        now = time.monotonic()
+        pool = [b for b in self.backends if b.available(now)]
+        cooling = sorted(
+            (b for b in self.backends if not b.available(now)),
+            key=lambda b: b.cooldown_until,
+        )
+
+        ordered: list[LLMBackend] = []
+        while pool:
+            choice = random.choices(pool, weights=[b.effective_weight() for b in pool])[0]
+            ordered.append(choice)
+            pool.remove(choice)
+
+        return ordered + cooling
+
+    def record_success(self, backend: LLMBackend, latency: float) -> None:
+        backend.health += HEALTH_EWMA_ALPHA * (1.0 - backend.health)
+        backend.latency = latency if backend.latency == 0 else (
+            backend.latency + HEALTH_EWMA_ALPHA * (latency - backend.latency)
+        )
+        backend.consecutive_failures = 0
+        backend.cooldown_until = 0.0
+        metrics.observe("llm_backend_latency_seconds", latency, backend=backend.name, outcome="ok")
+
+    def record_failure(self, backend: LLMBackend, latency: float, error: Exception) -> None:
+        backend.health -= HEALTH_EWMA_ALPHA * backend.health
+        backend.consecutive_failures += 1
+        metrics.observe("llm_backend_latency_seconds", latency, backend=backend.name, outcome="error")
+        metrics.inc("llm_backend_errors", backend=backend.name, error=type(error).__name__)
+
+        if backend.consecutive_failures >= self.failure_threshold:
+            backend.cooldown_until = time.monotonic() + self.cooldown_seconds
+            logger.warning(
+                "llm_backend_cooldown",
+                backend=backend.name,
+                failures=backend.consecutive_failures,
+                cooldown=self.cooldown_seconds
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {b.name: b.snapshot() for b in self.backends}
+
+
+@lru_cache
+def get_backend_pool() -> BackendPool:
+    """Get the process-wide backend pool (cache_clear() to rebuild)"""
+    pool = BackendPool(load_backend_configs())
+    metrics.register_collector("llm_backends", pool.snapshot)
+    logger.info("llm_backend_pool", backends=[b.name for b in pool.backends])
+    return pool
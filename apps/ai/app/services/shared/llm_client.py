@@ -0,0 +1,179 @@
+"""Shared LLM call layer - structured outputs with strict JSON schemas"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, TypeVar
+
+import structlog
+from pydantic import BaseModel, ValidationError as PydanticValidationError
+
+from app.core.exceptions import LLMError
+from app.core.metrics import metrics
+from app.services.shared.llm_backends import get_backend_pool, is_failover_error
+from app.services.shared.llm_routing import plan_route
+from app.services.shared.llm_usage import record_usage
+
+logger = structlog.get_logger()
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# JSON Schema keywords that strict structured outputs reject or ignore
+_UNSUPPORTED_KEYWORDS = {
+    "title", "default", "examples",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+    "minLength", "maxLength", "pattern", "format",
+    "minItems", "maxItems", "uniqueItems",
+}
+
+
+def _make_strict(schema: dict[str, Any]) -> dict[str, Any]:
+    """Recursively close objects and require every property (strict mode rules)"""
+    result: dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in _UNSUPPORTED_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            # Keys here are field/definition names, not keywords
+            result[key] = {name: _make_strict(sub) for name, sub in value.items()}
+        elif key == "items" and isinstance(value, dict):
+            result[key] = _make_strict(value)
+        elif key in ("anyOf", "allOf", "oneOf"):
+            result[key] = [_make_strict(sub) for sub in value]
+        else:
+            result[key] = value
+
+    if result.get("type") == "object" and "properties" in result:
+        result["additionalProperties"] = False
+        result["required"] = list(result["properties"])
+
+    return result
+
+
+def strict_json_schema(model_cls: type[BaseModel]) -> dict[str, Any]:
+    """Derive a strict structured-output JSON schema from a pydantic model"""
+    return _make_strict(model_cls.model_json_schema(by_alias=True))
+
+
+@lru_cache
+def structured_response_format(model_cls: type[BaseModel]) -> dict[str, Any]:
+    """response_format payload for a pydantic model (cached per model)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_cls.__name__,
+            "schema": strict_json_schema(model_cls),
+            "strict": True,
+        },
+    }
+
+
+def parse_structured(response: Any, model_cls: type[ModelT]) -> ModelT:
+    """
+    Parse a chat completion straight into a model
+
+    Raises:
+        LLMError: If the model refused or the content doesn't match the schema
+    """
+    message = response.choices[0].message
+
+    refusal = getattr(message, "refusal", None)
+    if isinstance(refusal, str) and refusal:
+        logger.warning("llm_refusal", schema=model_cls.__name__, refusal=refusal[:200])
+        raise LLMError(
+            message="AI가 요청을 처리하지 못했습니다",
+            details={"refusal": refusal[:200]}
+        )
+
+    try:
+        return model_cls.model_validate_json(message.content or "")
+    except PydanticValidationError as e:
+        metrics.inc("llm_malformed_responses", schema=model_cls.__name__)
+        logger.error("llm_response_parse_error", schema=model_cls.__name__, error=str(e)[:500])
+        raise LLMError(
+            message="AI 응답을 파싱할 수 없습니다",
+            details={"error": str(e)[:500]}
+        )
+
+
+async def complete_structured(
+    *,
+    endpoint: str,
+    messages: list[dict[str, str]],
+    response_model: type[ModelT],
+    temperature: float,
+) -> ModelT:
+    """
+    Run a chat completion constrained to response_model's strict schema
+
+    Model, max_tokens and timeout come from the routing policy; the backend
+    comes from the backend pool, failing over to the next backend on
+    connection errors, timeouts, throttling and 5xx responses. The blocking
+    SDK call runs in a worker thread so concurrent calls overlap.
+
+    Raises:
+        LLMError: If the response can't be parsed into response_model
+        openai.APIError: Propagated (last backend's error) for callers'
+            retry/error mapping
+    """
+    route = plan_route(endpoint, messages)
+    labels = {"endpoint": endpoint, "tier": route.tier, "model": route.model}
+
+    logger.info(
+        "llm_route",
+        endpoint=endpoint,
+        tier=route.tier,
+        model=route.model,
+        input_tokens=route.input_tokens,
+        max_tokens=route.max_tokens,
+        timeout=route.timeout
+    )
+    metrics.inc("llm_route_decisions", **labels)
+
+    pool = get_backend_pool()
+    candidates = pool.candidates()
+    start_time = time.perf_counter()
+
+    for attempt, backend in enumerate(candidates):
+        attempt_start = time.perf_counter()
+        try:
+            response = await asyncio.to_thread(
+                backend.client.chat.completions.create,
+                model=backend.resolve_model(route.model),
+                messages=messages,
+                temperature=temperature,
+                max_tokens=route.max_tokens,
+                response_format=structured_response_format(response_model),
+                timeout=route.timeout,
+            )
+        except Exception as e:
+            if not is_failover_error(e):
+                metrics.observe("llm_latency_seconds", time.perf_counter() - start_time, outcome="error", **labels)
+                raise
+
+            pool.record_failure(backend, time.perf_counter() - attempt_start, e)
+            if attempt == len(candidates) - 1:
+                metrics.observe("llm_latency_seconds", time.perf_counter() - start_time, outcome="error", **labels)
+                raise
+
+            metrics.inc("llm_backend_failovers", backend=backend.name, endpoint=endpoint)
+            logger.warning(
+                "llm_backend_failover",
+                endpoint=endpoint,
+                backend=backend.name,
+                next_backend=candidates[attempt + 1].name,
+                error=type(e).__name__
+            )
+            continue
+
+        pool.record_success(backend, time.perf_counter() - attempt_start)
+        break
+
+    metrics.observe("llm_latency_seconds", time.perf_counter() - start_time, outcome="ok", **labels)
+    record_usage(endpoint, response)
+
+    if getattr(response.choices[0], "finish_reason", None) == "length":
+        metrics.inc("llm_output_truncated", **labels)
+        logger.warning("llm_output_truncated", endpoint=endpoint, max_tokens=route.max_tokens)
+
+    return parse_structured(response, response_model)
@@ -0,0 +1,90 @@
+"""LLM routing policy - model, max_tokens and timeout per call
+
+Every call is classified by endpoint and estimated input size:
+- model:      small / default / large tier chosen by input tokens
+- max_tokens: endpoint budget (fixed part + share of the user input)
+- timeout:    derived from input and output token budgets
+"""
+
+from pydantic import BaseModel
+
+from app.config import get_settings
+
+
+class OutputBudget(BaseModel):
+    """Output token budget for an endpoint class"""
+    base_tokens: int
+    per_input_token: float = 0.0
+
+
+# Output budgets per endpoint class. Proportional parts apply to the user
+# message only (system prompts are fixed size).
+ENDPOINT_BUDGETS: dict[str, OutputBudget] = {
+    "video_analyze": OutputBudget(base_tokens=1200),
+    "translate": OutputBudget(base_tokens=128, per_input_token=2.0),
+    "article_analyze": OutputBudget(base_tokens=1500, per_input_token=1.5),
+    "study_analyze": OutputBudget(base_tokens=1500, per_input_token=1.5),
+    "parse_sentence": OutputBudget(base_tokens=1200, per_input_token=0.5),
+    "word_lookup": OutputBudget(base_tokens=500),
+}
+DEFAULT_BUDGET = OutputBudget(base_tokens=1024, per_input_token=1.0)
+
+
+class LLMRoute(BaseModel):
+    """Routing decision for one LLM call"""
+    endpoint: str
+    tier: str
+    model: str
+    input_tokens: int
+    max_tokens: int
+    timeout: float
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate without a tokenizer
+
+    ASCII text averages ~4 characters per token; Hangul/CJK is closer to
+    one token per character.
+    """
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def plan_route(endpoint: str, messages: list[dict[str, str]]) -> LLMRoute:
+    """Choose model, max_tokens and timeout for a call"""
+    settings = get_settings()
+
+    input_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+    user_tokens = sum(
+        estimate_tokens(m.get("content", "")) for m in messages if m.get("role") == "user"
+    )
+
+    if input_tokens <= settings.llm_small_input_tokens and settings.llm_model_small:
+        tier, model = "small", settings.llm_model_small
+    elif input_tokens >= settings.llm_large_input_tokens and settings.llm_model_large:
+        tier, model = "large", settings.llm_model_large
+    else:
+        tier, model = "default", settings.openai_model
+
+    budget = ENDPOINT_BUDGETS.get(endpoint, DEFAULT_BUDGET)
+    max_tokens = min(
+        settings.llm_max_output_tokens,
+        budget.base_tokens + int(user_tokens * budget.per_input_token),
+    )
+
+    timeout = (
+        settings.llm_timeout_base
+        + input_tokens / settings.llm_input_tokens_per_second
+        + max_tokens / settings.llm_output_tokens_per_second
+    )
+    timeout = min(settings.llm_timeout_max, max(settings.llm_timeout_min, timeout))
+
+    return LLMRoute(
+        endpoint=endpoint,
+        tier=tier,
+        model=model,
+        input_tokens=input_tokens,
+        max_tokens=max_tokens,
+        timeout=round(timeout, 1),
+    )
@@ -0,0 +1,32 @@
+"""LLM token usage accounting"""
+
+import structlog
+
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Bumped whenever the response protocol changes, so token usage can be
+# compared across deployments per endpoint
+RESPONSE_PROTOCOL = "compact-v1"
+
+
+def record_usage(endpoint: str, response: object) -> None:
+    """Record prompt/completion token counts of a chat completion response"""
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+
+    if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+        return
+
+    metrics.observe("llm_prompt_tokens", prompt_tokens, endpoint=endpoint, protocol=RESPONSE_PROTOCOL)
+    metrics.observe("llm_completion_tokens", completion_tokens, endpoint=endpoint, protocol=RESPONSE_PROTOCOL)
+
+    logger.info(
+        "llm_usage",
+        endpoint=endpoint,
+        protocol=RESPONSE_PROTOCOL,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens
+    )
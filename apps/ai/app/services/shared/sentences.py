@@ -0,0 +1,73 @@
+"""Sentence splitting for article analysis
+
+Articles are split on the server so the LLM only has to return
+translations by position instead of echoing every source sentence.
+"""
+
+import re
+
+# Common English abbreviations that end with a period but not a sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "gen", "gov",
+    "sen", "rep", "rev", "capt", "col", "lt", "sgt", "vs", "etc", "inc",
+    "ltd", "co", "corp", "dept", "univ", "est", "approx", "fig", "no", "vol",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct",
+    "nov", "dec", "e.g", "i.e", "a.m", "p.m", "u.s", "u.k", "u.n", "d.c",
+}
+
+# Terminal punctuation, optionally followed by closing quotes/brackets
+_BOUNDARY = re.compile(r"([.!?。！？…]+[\"'”’)\]」』]*)(\s+|$)")
+_LAST_TOKEN = re.compile(r"(\S+)$")
+_INITIALS = re.compile(r"^(?:[A-Za-z]\.)*[A-Za-z]$")
+
+
+def _ends_with_abbreviation(chunk: str) -> bool:
+    """Check whether a chunk ending in '.' stops on an abbreviation or initial"""
+    match = _LAST_TOKEN.search(chunk.rstrip(".").rstrip())
+    if not match:
+        return False
+    token = match.group(1).lstrip("\"'“‘([")
+    return token.lower() in ABBREVIATIONS or bool(_INITIALS.match(token))
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split text into sentences
+
+    Handles abbreviations (U.S., Dr., etc.), initials, decimals and closing
+    quotes. Line breaks always end a sentence.
+    """
+    sentences: list[str] = []
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        start = 0
+        for match in _BOUNDARY.finditer(line):
+            end = match.end(1)
+            chunk = line[start:end]
+            rest = line[match.end():]
+
+            # "U.S. officials", "Dr. Kim", "Jan. 5" - not a boundary
+            if match.group(1) == "." and rest and _ends_with_abbreviation(chunk):
+                continue
+            # '"Is it over?" she asked' - lowercase continuation
+            if rest and rest[0].islower() and rest[0].isascii():
+                continue
+
+            if chunk.strip():
+                sentences.append(chunk.strip())
+            start = match.end()
+
+        tail = line[start:].strip()
+        if tail:
+            sentences.append(tail)
+
+    return sentences
+
+
+def number_sentences(sentences: list[str]) -> str:
+    """Render sentences as numbered lines ([0] ..., [1] ...) for prompts"""
+    return "\n".join(f"[{idx}] {sentence}" for idx, sentence in enumerate(sentences))
@@ -3,8 +3,9 @@
 import json
 import logging
 import asyncio
-from typing import TypedDict
-from openai import OpenAI, APIConnectionError, RateLimitError, APIStatusError
+from dataclasses import dataclass
+from typing import Iterable, TypedDict
+from openai import APIConnectionError, RateLimitError, APIStatusError
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -14,7 +15,9 @@ from tenacity import (
 )
 
 from app.config import get_settings
-from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.exceptions import AIServiceError, ErrorCode, LLMError
+from app.models.llm_schemas import TranslationBatch
+from app.services.shared.llm_client import complete_structured
 
 logger = logging.getLogger(__name__)
 
@@ -32,22 +35,49 @@ class TranslatedSegmentOutput(TypedDict):
     translated_text: str
 
 
+class MultiTranslatedSegmentOutput(TypedDict):
+    start: float
+    end: float
+    original_text: str
+    translations: dict[str, str]
+
+
 # Batch configuration
 BATCH_SIZE = 10
 CONTEXT_SIZE = 2
 CONCURRENT_BATCHES = 3
 
+# Language names used in generic translation prompts
+LANGUAGE_NAMES = {
+    "ko": "한국어",
+    "en": "영어",
+    "ja": "일본어",
+    "zh": "중국어",
+    "es": "스페인어",
+    "fr": "프랑스어",
+    "de": "독일어",
+    "vi": "베트남어",
+    "th": "태국어",
+    "id": "인도네시아어",
+}
+
 
-def get_openai_client() -> OpenAI:
-    """Get OpenAI client"""
+def check_transcript_length(segments: list[SegmentInput]) -> None:
+    """Reject segment lists whose total text exceeds max_transcript_length"""
     settings = get_settings()
-    if not settings.openai_api_key:
+    total_text_length = sum(len(seg["text"]) for seg in segments)
+    max_transcript_length = settings.max_transcript_length
+
+    if total_text_length > max_transcript_length:
         raise AIServiceError(
-            code=ErrorCode.CONFIGURATION_ERROR,
-            message="OpenAI API key not configured",
-            status_code=500,
+            code=ErrorCode.TRANSCRIPT_TOO_LONG,
+            message=f"자막 텍스트가 너무 많아요! AI가 읽기 힘들어해요. (현재: {total_text_length:,}자, 최대: {max_transcript_length:,}자)",
+            status_code=400,
+            details={
+                "total_text_length": total_text_length,
+                "max_transcript_length": max_transcript_length,
+            }
         )
-    return OpenAI(api_key=settings.openai_api_key)
 
 
 def chunk_array(array: list, size: int) -> list[list]:
@@ -55,93 +85,105 @@ def chunk_array(array: list, size: int) -> list[list]:
     return [array[i:i + size] for i in range(0, len(array), size)]
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception_type((APIConnectionError, RateLimitError)),
-    before_sleep=before_sleep_log(logger, logging.WARNING),
-)
-async def translate_batch(
-    client: OpenAI,
-    segments: list[SegmentInput],
-    source_language: str,
-    target_language: str,
-    context_text: str = "",
-) -> list[str]:
-    """Translate a single batch of segments"""
-    settings = get_settings()
-
-    segments_json = [{"id": idx, "text": seg["text"]} for idx, seg in enumerate(segments)]
+def format_timestamped_transcript(lines: Iterable[tuple[float, str]]) -> str:
+    """(start, text) pairs as "[N초] text" lines, the format the analysis prompt reads"""
+    # [N초] 형식 사용 - LLM이 이해하기 쉬움
+    return "\n".join(f"[{int(start)}초] {text}" for start, text in lines)
 
-    prompt = (
-        f'이전 문맥: "{context_text}"\n\n번역할 자막:\n{json.dumps(segments_json, ensure_ascii=False, indent=2)}'
-        if context_text
-        else f'번역할 자막:\n{json.dumps(segments_json, ensure_ascii=False, indent=2)}'
-    )
 
-    # Determine translation direction
+def _build_system_prompt(source_language: str, target_language: str) -> str:
+    """Build the system prompt for a translation direction"""
     if source_language == "ko" and target_language == "en":
-        system_prompt = """당신은 한국어→영어 자막 번역 전문가입니다.
+        return """당신은 한국어→영어 자막 번역 전문가입니다.
 
 규칙:
 1. 자연스러운 영어로 번역하세요
 2. 기술 용어는 적절한 영어 용어로 번역하세요
 3. 구어체 표현은 자연스럽게 의역하세요
-4. 번역 결과만 JSON 배열로 반환하세요
+4. 입력 배열과 같은 순서, 같은 개수로 번역 결과만 반환하세요
 
 출력 형식:
-{
-  "translations": [
-    {"id": 0, "text": "Translated text"},
-    {"id": 1, "text": "Translated text"}
-  ]
-}
+{"t": ["Translated text", "Translated text"]}
 
 JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
-    else:
-        system_prompt = """당신은 영어→한국어 자막 번역 전문가입니다.
+
+    if target_language == "ko":
+        return """당신은 영어→한국어 자막 번역 전문가입니다.
 
 규칙:
 1. 자연스러운 한국어로 번역하세요
 2. 기술 용어는 필요시 원어를 괄호 안에 병기하세요 (예: API(API))
 3. 구어체 표현은 자연스럽게 의역하세요
-4. 번역 결과만 JSON 배열로 반환하세요
+4. 입력 배열과 같은 순서, 같은 개수로 번역 결과만 반환하세요
 
 출력 형식:
-{
-  "translations": [
-    {"id": 0, "text": "번역된 텍스트"},
-    {"id": 1, "text": "번역된 텍스트"}
-  ]
-}
+{"t": ["번역된 텍스트", "번역된 텍스트"]}
 
 JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
 
+    source_name = LANGUAGE_NAMES.get(source_language, source_language)
+    target_name = LANGUAGE_NAMES.get(target_language, target_language)
+    return f"""당신은 {source_name}→{target_name} 자막 번역 전문가입니다.
+
+규칙:
+1. 자연스러운 {target_name}(언어 코드: {target_language})로 번역하세요
+2. 기술 용어는 해당 언어에서 통용되는 용어로 번역하세요
+3. 구어체 표현은 자연스럽게 의역하세요
+4. 입력 배열과 같은 순서, 같은 개수로 번역 결과만 반환하세요
+
+출력 형식:
+{{"t": ["...", "..."]}}
+
+JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception_type((APIConnectionError, RateLimitError)),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+)
+async def translate_batch(
+    segments: list[SegmentInput],
+    source_language: str,
+    target_language: str,
+    context_text: str = "",
+) -> list[str]:
+    """Translate a single batch of segments"""
+
+    # Positional array in, positional array out - no ids, no echoed text
+    segments_json = json.dumps([seg["text"] for seg in segments], ensure_ascii=False)
+
+    prompt = (
+        f'이전 문맥: "{context_text}"\n\n번역할 자막 ({len(segments)}개):\n{segments_json}'
+        if context_text
+        else f'번역할 자막 ({len(segments)}개):\n{segments_json}'
+    )
+
+    system_prompt = _build_system_prompt(source_language, target_language)
+
     try:
-        response = client.chat.completions.create(
-            model=settings.openai_model,
+        result = await complete_structured(
+            endpoint="translate",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt},
             ],
+            response_model=TranslationBatch,
             temperature=0.3,
-            response_format={"type": "json_object"},
         )
 
-        result = json.loads(response.choices[0].message.content or "{}")
-        translations = result.get("translations", [])
-
-        # Sort by id and extract text
-        return [
-            next(
-                (t["text"] for t in translations if t["id"] == idx),
-                segments[idx]["text"]  # Fallback to original
+        if len(result.t) != len(segments):
+            logger.warning(
+                f"Translation count mismatch: expected {len(segments)}, "
+                f"got {len(result.t)}; using original text"
             )
-            for idx in range(len(segments))
-        ]
+            return [seg["text"] for seg in segments]
+
+        return result.t
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse translation response: {e}")
+    except LLMError as e:
+        logger.error(f"Failed to parse translation response: {e.message}")
         return [seg["text"] for seg in segments]
     except (APIConnectionError, RateLimitError):
         raise
@@ -150,72 +192,159 @@ JSON만 반환하세요. 다른 설명은 포함하지 마세요."""
         return [seg["text"] for seg in segments]
 
 
-async def translate_segments(
-    segments: list[SegmentInput],
-    source_language: str = "en",
-    target_language: str = "ko",
-) -> list[TranslatedSegmentOutput]:
+def _batch_contexts(batches: list[list[SegmentInput]]) -> list[str]:
     """
-    Translate all segments with batch processing.
+    Previous-context text for each batch.
 
-    - Processes segments in batches for efficiency
-    - Maintains context across batches
-    - Concurrent batch processing
+    Batches are scheduled in groups of CONCURRENT_BATCHES; every batch in a
+    group sees the tail of the last batch of the previous group. Context only
+    depends on source text, so it can be computed once up front and shared by
+    every target language.
     """
-    if not segments:
-        return []
+    contexts = []
+    for batch_idx in range(len(batches)):
+        group_start = batch_idx - batch_idx % CONCURRENT_BATCHES
+        if group_start == 0:
+            contexts.append("")
+            continue
+        context_segments = batches[group_start - 1][-CONTEXT_SIZE:]
+        contexts.append(" ".join(seg["text"] for seg in context_segments))
+    return contexts
+
+
+@dataclass(frozen=True)
+class PreparedTranscript:
+    """
+    A segment list formatted once for every LLM stage that reads it
+
+    /analyze-translate builds this once and hands it to both the analysis
+    (timestamped text) and the translation (batches and their contexts).
+    """
+    segments: list[SegmentInput]
+    timestamped_text: str
+    batches: list[list[SegmentInput]]
+    contexts: list[str]
 
-    logger.info(f"Starting translation: {len(segments)} segments")
 
-    client = get_openai_client()
+def prepare_transcript(segments: list[SegmentInput]) -> PreparedTranscript:
+    """Format and batch segments once"""
     batches = chunk_array(segments, BATCH_SIZE)
-    translated_segments: list[TranslatedSegmentOutput] = []
+    return PreparedTranscript(
+        segments=segments,
+        timestamped_text=format_timestamped_transcript(
+            (seg["start"], seg["text"]) for seg in segments
+        ),
+        batches=batches,
+        contexts=_batch_contexts(batches),
+    )
 
-    logger.info(f"Created {len(batches)} batches (size: {BATCH_SIZE})")
 
-    previous_context = ""
+async def translate_segments_multi(
+    segments: list[SegmentInput],
+    source_language: str = "en",
+    target_languages: list[str] | None = None,
+    prepared: PreparedTranscript | None = None,
+) -> list[MultiTranslatedSegmentOutput]:
+    """
+    Translate all segments into one or more target languages.
 
-    for i in range(0, len(batches), CONCURRENT_BATCHES):
-        concurrent_batches = batches[i:i + CONCURRENT_BATCHES]
+    - Segments are batched once and the batches are shared by all languages
+      (or taken from `prepared`, which then also supplies the segments)
+    - Every (language, batch) call runs concurrently, bounded by
+      CONCURRENT_BATCHES in total
+    """
+    if prepared is not None:
+        segments = prepared.segments
+    if not segments:
+        return []
 
-        # Process batches concurrently
-        async def process_batch(batch: list[SegmentInput], batch_idx: int) -> list[TranslatedSegmentOutput]:
-            absolute_batch_idx = i + batch_idx
-            context = "" if absolute_batch_idx == 0 else previous_context
+    target_languages = target_languages or ["ko"]
 
-            logger.debug(f"Translating batch {absolute_batch_idx + 1}/{len(batches)}")
+    logger.info(
+        f"Starting translation: {len(segments)} segments -> {', '.join(target_languages)}"
+    )
 
+    if prepared is not None:
+        batches, contexts = prepared.batches, prepared.contexts
+    else:
+        batches = chunk_array(segments, BATCH_SIZE)
+        contexts = _batch_contexts(batches)
+    semaphore = asyncio.Semaphore(CONCURRENT_BATCHES)
+    total_calls = len(batches) * len(target_languages)
+    completed = 0
+
+    logger.info(f"Created {len(batches)} batches (size: {BATCH_SIZE}, calls: {total_calls})")
+
+    async def process_batch(target_language: str, batch_idx: int) -> list[str]:
+        nonlocal completed
+        async with semaphore:
+            logger.debug(f"Translating batch {batch_idx + 1}/{len(batches)} ({target_language})")
             translations = await translate_batch(
-                client, batch, source_language, target_language, context
+                batches[batch_idx],
+                source_language,
+                target_language,
+                contexts[batch_idx],
             )
-
-            return [
-                {
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "original_text": seg["text"],
-                    "translated_text": translations[idx],
-                }
-                for idx, seg in enumerate(batch)
-            ]
-
-        tasks = [
-            process_batch(batch, batch_idx)
-            for batch_idx, batch in enumerate(concurrent_batches)
+        completed += 1
+        logger.info(f"Batch progress: {completed}/{total_calls}")
+        return translations
+
+    results = await asyncio.gather(*[
+        process_batch(target_language, batch_idx)
+        for target_language in target_languages
+        for batch_idx in range(len(batches))
+    ])
+
+    # Flatten per-language results back into segment order
+    per_language: dict[str, list[str]] = {}
+    for lang_idx, target_language in enumerate(target_languages):
+        language_results = results[lang_idx * len(batches):(lang_idx + 1) * len(batches)]
+        per_language[target_language] = [
+            text for batch_result in language_results for text in batch_result
         ]
-        results = await asyncio.gather(*tasks)
-
-        for batch_result in results:
-            translated_segments.extend(batch_result)
-
-        # Update context for next batch
-        last_batch = concurrent_batches[-1]
-        if last_batch:
-            context_segments = last_batch[-CONTEXT_SIZE:]
-            previous_context = " ".join(seg["text"] for seg in context_segments)
 
-        logger.info(f"Batch progress: {min(i + CONCURRENT_BATCHES, len(batches))}/{len(batches)}")
+    translated_segments: list[MultiTranslatedSegmentOutput] = [
+        {
+            "start": seg["start"],
+            "end": seg["end"],
+            "original_text": seg["text"],
+            "translations": {
+                target_language: per_language[target_language][idx]
+                for target_language in target_languages
+            },
+        }
+        for idx, seg in enumerate(segments)
+    ]
 
     logger.info(f"Translation completed: {len(translated_segments)} segments")
 
     return translated_segments
+
+
+async def translate_segments(
+    segments: list[SegmentInput],
+    source_language: str = "en",
+    target_language: str = "ko",
+) -> list[TranslatedSegmentOutput]:
+    """
+    Translate all segments with batch processing.
+
+    - Processes segments in batches for efficiency
+    - Maintains context across batches
+    - Concurrent batch processing
+    """
+    translated = await translate_segments_multi(
+        segments,
+        source_language=source_language,
+        target_languages=[target_language],
+    )
+
+    return [
+        {
+            "start": seg["start"],
+            "end": seg["end"],
+            "original_text": seg["original_text"],
+            "translated_text": seg["translations"][target_language],
+        }
+        for seg in translated
+    ]
@@ -1,12 +1,13 @@
 """Korean article analysis service — translation + expression extraction"""
 
-import json
 import time
 import structlog
-from openai import OpenAI
 
-from app.config import get_settings
 from app.core.exceptions import AIServiceError, ErrorCode
+from app.models.study_schemas import StudyAnalysisResult
+from app.models.llm_schemas import CompactStudyAnalysis
+from app.services.shared.llm_client import complete_structured
+from app.services.shared.sentences import number_sentences, split_sentences
 
 logger = structlog.get_logger()
 
@@ -25,27 +26,29 @@ SYSTEM_PROMPTS = {
     ),
 }
 
-TASK_PROMPT = """Analyze the given Korean article and return a JSON response with:
+TASK_PROMPT = """Analyze the given Korean article. It is already split into numbered sentences ([0], [1], ...).
+Return a JSON response with:
 
-1. "sentences": Array of objects, each with:
-   - "id": sentence index (0-based)
-   - "original": the Korean sentence
-   - "translated": natural translation in the target language
+1. "t": Array of natural translations in the target language
+   - One entry per numbered sentence, in the same order and with the same count
+   - Do not repeat the Korean sentences
 
-2. "expressions": Array of 5-15 Korean idioms, collocations, and key vocabulary:
-   - "expression": the Korean expression
-   - "meaning": translation in the target language
-   - "category": one of "idiom", "collocation", "slang", "formal_expression", "grammar_pattern"
-   - "sentenceId": sentence index where it appears (0-based)
-   - "context": the form used in the article
+2. "x": Array of 5-15 Korean idioms, collocations, and key vocabulary:
+   - "e": the Korean expression (base form)
+   - "m": meaning in the target language
+   - "c": one of "idiom", "collocation", "slang", "formal_expression", "grammar_pattern"
+   - "i": sentence number where it appears
+   - "f": the form used in the article
+
+Output format:
+{"t": ["...", "..."], "x": [{"e": "...", "m": "...", "c": "idiom", "i": 0, "f": "..."}]}
 
 Focus on expressions that are:
 - Commonly used in Korean but hard for foreigners to understand
 - Different from literal word-by-word translation
 - Important for understanding Korean news/media
 
-Split the text into sentences carefully. Handle abbreviations and quotation marks properly.
-Return ONLY valid JSON with "sentences" and "expressions" keys."""
+Return ONLY valid JSON with "t" and "x" keys."""
 
 
 def _get_system_prompt(target_language: str) -> str:
@@ -58,70 +61,35 @@ def _get_system_prompt(target_language: str) -> str:
     return base
 
 
-def get_openai_client() -> OpenAI:
-    settings = get_settings()
-    if not settings.openai_api_key:
-        raise AIServiceError(
-            code=ErrorCode.CONFIGURATION_ERROR,
-            message="OpenAI API key not configured",
-            status_code=500,
-        )
-    return OpenAI(api_key=settings.openai_api_key, timeout=30.0)
-
-
 async def analyze_article(
     text: str,
     target_language: str = "en",
     title: str | None = None,
-) -> dict:
+) -> StudyAnalysisResult:
     """Analyze a Korean article: split sentences, translate, extract expressions."""
     start_time = time.time()
-    settings = get_settings()
-    client = get_openai_client()
 
     system_prompt = _get_system_prompt(target_language)
     user_content = f"Target language: {target_language}\n\n"
     if title:
         user_content += f"Title: {title}\n\n"
-    user_content += f"Article:\n{text}"
+    sentences = split_sentences(text)
+    user_content += f"Article ({len(sentences)} sentences):\n{number_sentences(sentences)}"
 
     try:
-        response = client.chat.completions.create(
-            model=settings.openai_model,
+        compact = await complete_structured(
+            endpoint="study_analyze",
             messages=[
                 {"role": "system", "content": system_prompt + "\n\n" + TASK_PROMPT},
                 {"role": "user", "content": user_content},
             ],
-            response_format={"type": "json_object"},
+            response_model=CompactStudyAnalysis,
             temperature=0.3,
         )
 
-        content = response.choices[0].message.content
-        result = json.loads(content)
-
-        sentences = result.get("sentences", [])
-        expressions = result.get("expressions", [])
-
         processing_time = (time.time() - start_time) * 1000
+        return compact.to_result(sentences, target_language, processing_time)
 
-        return {
-            "sentences": sentences,
-            "expressions": expressions,
-            "meta": {
-                "sentenceCount": len(sentences),
-                "expressionCount": len(expressions),
-                "targetLanguage": target_language,
-                "processingTime": round(processing_time, 1),
-            },
-        }
-
-    except json.JSONDecodeError as e:
-        logger.error("openai_response_parse_failed", error=str(e))
-        raise AIServiceError(
-            code=ErrorCode.LLM_ERROR,
-            message="Failed to parse analysis result",
-            status_code=500,
-        )
     except AIServiceError:
         raise
     except Exception as e:
@@ -2,6 +2,7 @@
 
 from .llm import LLMService
 from .stt_client import STTClient
+from .stt_pipeline import transcribe_audio, transcribe_video
 from .youtube_audio import YouTubeAudioDownloader
 
-__all__ = ["LLMService", "STTClient", "YouTubeAudioDownloader"]
+__all__ = ["LLMService", "STTClient", "transcribe_audio", "transcribe_video", "YouTubeAudioDownloader"]
@@ -0,0 +1,250 @@
+"""Audio normalization before STT upload
+
+WhisperX resamples everything to 16 kHz mono, so uploading the original
+m4a/webm/flac wastes bandwidth. ffmpeg transcodes the audio to 16 kHz mono
+Opus (or FLAC) in a subprocess: the source is streamed into stdin and the
+output is collected in a spooled temp file, so memory stays bounded.
+
+Sources already on disk (spooled uploads, downloads) are handed to ffmpeg
+as /dev/fd/N instead of being piped through Python.
+
+Normalization is best-effort - if ffmpeg is missing, fails, times out or
+doesn't shrink the file, the original audio is uploaded instead.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+import structlog
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.services.video.multipart_stream import AudioSource, CHUNK_SIZE, SpooledSource, backing_file
+from app.services.video.scratch import get_scratch_space
+
+logger = structlog.get_logger()
+
+TARGET_SAMPLE_RATE = 16000
+
+FFMPEG_INPUT_ARGS = ("-hide_banner", "-loglevel", "error", "-nostdin")
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    codec_args: tuple[str, ...]
+    container: str
+    extension: str
+    content_type: str
+
+
+def upload_format() -> OutputFormat:
+    """Upload format from Settings (stt_normalize_codec / stt_normalize_bitrate)"""
+    settings = get_settings()
+    codec, bitrate = settings.stt_normalize_codec, settings.stt_normalize_bitrate
+    if codec == "flac":
+        return OutputFormat(("-c:a", "flac", "-sample_fmt", "s16"), "flac", "flac", "audio/flac")
+    return OutputFormat(
+        ("-c:a", "libopus", "-b:a", bitrate, "-application", "voip"),
+        "ogg", "ogg", "audio/ogg",
+    )
+
+
+class NormalizedAudio(SpooledSource):
+    """Transcoded audio (AudioSource over a spooled temp file)"""
+
+    def __init__(self, file: tempfile.SpooledTemporaryFile, size: int, output: OutputFormat):
+        super().__init__(file, size)
+        self.extension = output.extension
+        self.content_type = output.content_type
+
+
+def find_ffmpeg() -> str | None:
+    """Resolve the ffmpeg binary (None if not installed)"""
+    return shutil.which(get_settings().ffmpeg_binary)
+
+
+def ffmpeg_limit_args(max_seconds: float | None) -> list[str]:
+    """Stop the output after max_seconds of audio (preview mode)"""
+    return ["-t", str(max_seconds)] if max_seconds else []
+
+
+def ffmpeg_output_args(output: OutputFormat, max_seconds: float | None = None) -> list[str]:
+    """Arguments that encode 16 kHz mono audio to the STT upload format"""
+    return [
+        "-vn", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+        *output.codec_args,
+        *ffmpeg_limit_args(max_seconds),
+        "-f", output.container, "pipe:1",
+    ]
+
+
+async def run_ffmpeg(
+    args: list[str],
+    chunks: AsyncIterator[bytes] | None,
+    on_output: Callable[[bytes], None],
+    timeout: float,
+    pass_fds: tuple[int, ...] = (),
+) -> tuple[int, bytes, int]:
+    """
+    Run ffmpeg, streaming chunks into stdin and each stdout chunk to on_output
+
+    With chunks=None ffmpeg reads its input itself (see ffmpeg_input).
+
+    Returns:
+        (returncode, stderr, bytes written to stdin)
+
+    Raises:
+        asyncio.TimeoutError: If ffmpeg doesn't finish in time (it is killed)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL if chunks is None else asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        pass_fds=pass_fds,
+    )
+
+    async def feed_stdin() -> int:
+        if chunks is None:
+            return 0
+        sent = 0
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+                sent += len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited early; its exit code tells us why
+            pass
+        finally:
+            process.stdin.close()
+        return sent
+
+    async def read_stdout() -> None:
+        while chunk := await process.stdout.read(CHUNK_SIZE):
+            on_output(chunk)
+
+    try:
+        sent, _, stderr, returncode = await asyncio.wait_for(
+            asyncio.gather(feed_stdin(), read_stdout(), process.stderr.read(), process.wait()),
+            timeout=timeout,
+        )
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    return returncode, stderr, sent
+
+
+async def read_source(source: AudioSource) -> AsyncIterator[bytes]:
+    """Stream an AudioSource from the start in CHUNK_SIZE pieces"""
+    await source.seek(0)
+    while chunk := await source.read(CHUNK_SIZE):
+        yield chunk
+
+
+async def ffmpeg_input(source: AudioSource) -> tuple[list[str], AsyncIterator[bytes] | None, tuple[int, ...]]:
+    """
+    ffmpeg input arguments, stdin chunks and fds to pass for a source
+
+    Files on disk are opened by ffmpeg as /dev/fd/N (it can seek, and no
+    bytes go through Python); remote media (FFmpegStreamSource) is read
+    from its URL; anything else is streamed into stdin.
+    """
+    url_input = getattr(source, "input_args", None)
+    if url_input is not None:
+        return url_input(), None, ()
+    await source.seek(0)
+    file = backing_file(source)
+    if file is None:
+        return ["-i", "pipe:0"], read_source(source), ()
+    await asyncio.to_thread(file.flush)
+    fd = file.fileno()
+    return ["-i", f"/dev/fd/{fd}"], None, (fd,)
+
+
+def skip(reason: str, **details) -> None:
+    """Record why preprocessing fell back to the original audio"""
+    metrics.inc("stt_normalize_skipped", reason=reason)
+    logger.warning("audio_normalize_skipped", reason=reason, **details)
+
+
+def record_normalized(input_size: int, output_size: int, elapsed: float, **details) -> None:
+    """Record before/after size metrics for a transcoded upload"""
+    metrics.observe("stt_audio_bytes", input_size, stage="original")
+    metrics.observe("stt_audio_bytes", output_size, stage="normalized")
+    metrics.observe("stt_normalize_ratio", input_size / output_size)
+    metrics.observe("stt_normalize_seconds", elapsed)
+    logger.info(
+        "audio_normalized",
+        codec=get_settings().stt_normalize_codec,
+        input_size=input_size,
+        output_size=output_size,
+        ratio=round(input_size / output_size, 1),
+        elapsed=round(elapsed, 2),
+        **details
+    )
+
+
+async def normalize_audio(
+    source: AudioSource,
+    input_size: int | None = None,
+    max_seconds: int | None = None
+) -> NormalizedAudio | None:
+    """
+    Transcode audio to 16 kHz mono for STT
+
+    With max_seconds only that much audio is transcoded (preview).
+
+    Returns:
+        NormalizedAudio, or None if the original should be uploaded as-is
+    """
+    settings = get_settings()
+    if not settings.stt_normalize_audio:
+        return None
+
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        skip("ffmpeg_missing")
+        return None
+
+    output = upload_format()
+    input_args, chunks, pass_fds = await ffmpeg_input(source)
+    args = [ffmpeg, *FFMPEG_INPUT_ARGS, *input_args, *ffmpeg_output_args(output, max_seconds)]
+
+    start_time = time.perf_counter()
+    spool = get_scratch_space().spool()
+    try:
+        returncode, stderr, input_bytes = await run_ffmpeg(
+            args, chunks, spool.write, settings.stt_normalize_timeout, pass_fds
+        )
+    except asyncio.TimeoutError:
+        spool.close()
+        skip("timeout", timeout=settings.stt_normalize_timeout)
+        return None
+    except BaseException:
+        spool.close()
+        raise
+
+    input_size = input_size or input_bytes
+    output_bytes = spool.tell()
+
+    if returncode != 0 or output_bytes == 0:
+        spool.close()
+        skip("ffmpeg_error", returncode=returncode, stderr=stderr.decode(errors="replace")[-500:])
+        return None
+
+    if output_bytes >= input_size:
+        spool.close()
+        skip("not_smaller", input_size=input_size, output_size=output_bytes)
+        return None
+
+    record_normalized(input_size, output_bytes, time.perf_counter() - start_time)
+
+    spool.seek(0)
+    return NormalizedAudio(spool, output_bytes, output)
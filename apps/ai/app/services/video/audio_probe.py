@@ -0,0 +1,206 @@
+"""Upload validation from the audio itself
+
+The extension and Content-Type of an upload are whatever the client says.
+Before any STT work the first bytes are checked against the magic numbers
+of the supported containers, and ffprobe reads the real duration and codec
+so over-long audio is rejected with AUDIO_TOO_LONG up front instead of
+after WhisperX has spent minutes on it.
+
+ffprobe gets the spooled upload as /dev/fd/N (the spool is moved to disk
+first), so it can seek for the duration instead of reading the whole file
+through a pipe. Probing is best-effort: without ffprobe, or if it fails,
+the upload goes on to STT as before.
+"""
+
+import asyncio
+import io
+import json
+import shutil
+import time
+from dataclasses import dataclass
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode, ValidationError
+from app.core.metrics import metrics
+from app.services.video.multipart_stream import AudioSource
+
+logger = structlog.get_logger()
+
+# Enough for every signature below
+SNIFF_BYTES = 16
+
+PROBE_TIMEOUT_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class AudioProbe:
+    """What ffprobe found in an upload"""
+    format_name: str
+    codec: str | None
+    duration: float | None
+
+
+def sniff_audio_format(head: bytes) -> str | None:
+    """Container of an audio file from its first bytes (None if unknown)"""
+    if head.startswith(b"ID3") or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"  # ID3 tag or MPEG audio frame sync
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"  # EBML (Matroska/WebM)
+    if head[4:8] == b"ftyp":
+        return "m4a"  # ISO BMFF (mp4/m4a)
+    return None
+
+
+def find_ffprobe() -> str | None:
+    """Resolve the ffprobe binary (None if not installed)"""
+    return shutil.which(get_settings().ffprobe_binary)
+
+
+def _fileno(source: AudioSource) -> int | None:
+    """Descriptor of the file behind a source (UploadFile wraps its spool in .file)"""
+    file = getattr(source, "file", source)
+    fileno = getattr(file, "fileno", None)
+    if fileno is None:
+        return None
+    try:
+        return fileno()
+    except (OSError, io.UnsupportedOperation):
+        return None
+
+
+async def probe_audio(source: AudioSource) -> AudioProbe | None:
+    """
+    Run ffprobe on a source backed by a file
+
+    Returns:
+        AudioProbe, or None if ffprobe is missing, fails or the source has
+        no file behind it
+    """
+    ffprobe = find_ffprobe()
+    if not ffprobe:
+        metrics.inc("stt_probe_skipped", reason="ffprobe_missing")
+        return None
+    fd = await asyncio.to_thread(_fileno, source)  # may roll a spool to disk
+    if fd is None:
+        metrics.inc("stt_probe_skipped", reason="no_file")
+        return None
+
+    start_time = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        ffprobe, "-v", "error",
+        "-show_entries", "format=format_name,duration:stream=codec_type,codec_name",
+        "-of", "json", f"/dev/fd/{fd}",
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        pass_fds=(fd,),
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=PROBE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        metrics.inc("stt_probe_skipped", reason="timeout")
+        logger.warning("audio_probe_failed", reason="timeout")
+        return None
+
+    try:
+        if process.returncode != 0:
+            raise ValueError(stderr.decode(errors="replace")[-500:])
+        data = json.loads(stdout)
+    except ValueError as e:
+        metrics.inc("stt_probe_skipped", reason="ffprobe_error")
+        logger.warning("audio_probe_failed", returncode=process.returncode, error=str(e))
+        return None
+
+    fmt = data.get("format") or {}
+    audio_streams = [s for s in data.get("streams") or [] if s.get("codec_type") == "audio"]
+    duration = fmt.get("duration")
+    probe = AudioProbe(
+        format_name=fmt.get("format_name") or "",
+        codec=audio_streams[0].get("codec_name") if audio_streams else None,
+        duration=float(duration) if duration not in (None, "N/A") else None,
+    )
+    metrics.observe("stt_probe_seconds", time.perf_counter() - start_time)
+    logger.info(
+        "audio_probed",
+        format_name=probe.format_name,
+        codec=probe.codec,
+        duration=probe.duration,
+        elapsed=round(time.perf_counter() - start_time, 3)
+    )
+    return probe
+
+
+async def validate_audio_content(
+    source: AudioSource,
+    filename: str,
+    max_seconds: int | None = None
+) -> AudioProbe | None:
+    """
+    Check an upload's bytes before any STT work (source is rewound)
+
+    Args:
+        source: Upload (UploadFile or a spooled source)
+        filename: Client filename, for logs
+        max_seconds: Preview length; only that much counts against the limit
+
+    Returns:
+        AudioProbe, or None if the upload couldn't be probed
+
+    Raises:
+        ValidationError: If the file doesn't start like a supported audio file
+            or has no audio stream
+        AIServiceError: 422 AUDIO_TOO_LONG if it is over stt_max_duration_minutes
+    """
+    await source.seek(0)
+    head = await source.read(SNIFF_BYTES)
+    await source.seek(0)
+
+    detected = sniff_audio_format(head)
+    if detected is None:
+        metrics.inc("stt_upload_rejected", reason="unknown_format")
+        raise ValidationError(
+            ErrorCode.INVALID_FILE,
+            "오디오 파일 형식을 인식할 수 없습니다",
+            details={"filename": filename}
+        )
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension and extension != detected:
+        logger.info("audio_extension_mismatch", filename=filename, detected=detected)
+
+    probe = await probe_audio(source)
+    if probe is None:
+        return None
+    if probe.codec is None:
+        metrics.inc("stt_upload_rejected", reason="no_audio_stream")
+        raise ValidationError(
+            ErrorCode.INVALID_FILE,
+            "오디오 스트림이 없는 파일입니다",
+            details={"filename": filename}
+        )
+
+    max_duration_minutes = get_settings().stt_max_duration_minutes
+    duration = probe.duration or 0
+    if max_seconds:
+        duration = min(duration, max_seconds)
+    if duration > max_duration_minutes * 60:
+        metrics.inc("stt_upload_rejected", reason="too_long")
+        raise AIServiceError(
+            code=ErrorCode.AUDIO_TOO_LONG,
+            message=f"오디오 길이({int(duration / 60)}분)가 최대 허용 시간({max_duration_minutes}분)을 초과했습니다",
+            status_code=422,
+            details={
+                "duration_minutes": round(duration / 60, 1),
+                "max_duration_minutes": max_duration_minutes
+            }
+        )
+    return probe
@@ -0,0 +1,142 @@
+"""Stream remote audio through ffmpeg straight into the STT upload
+
+ffmpeg reads the resolved media URL itself and writes the 16 kHz mono
+upload format to a pipe; FFmpegStreamSource exposes that pipe as an
+AudioSource, so StreamingMultipartBody pulls encoded chunks as the STT
+upload consumes them. Nothing is written to disk and memory stays at a
+few pipe buffers: when the upload stalls, ffmpeg blocks on the full pipe
+and stops reading from the network (back-pressure).
+
+A pipe can't be rewound, so seek(0) restarts ffmpeg from the URL - that
+is how STT retries resend the audio. With max_seconds ffmpeg stops after
+that much audio, so only the start of the media is fetched (preview).
+
+The source also carries its URL input arguments (input_args), so other
+ffmpeg stages such as decode_audio read the URL directly instead of the
+encoded pipe.
+"""
+
+import asyncio
+from collections import deque
+
+import structlog
+
+from app.core.exceptions import STTError
+from app.core.metrics import metrics
+from app.services.video.audio_normalizer import FFMPEG_INPUT_ARGS, OutputFormat, ffmpeg_output_args
+
+logger = structlog.get_logger()
+
+# Tail of ffmpeg's stderr kept for error reports
+STDERR_TAIL_BYTES = 4096
+
+
+class FFmpegStreamSource:
+    """AudioSource reading ffmpeg's output for a remote media URL"""
+
+    def __init__(
+        self,
+        ffmpeg: str,
+        url: str,
+        output: OutputFormat,
+        http_headers: dict[str, str] | None = None,
+        max_seconds: float | None = None,
+    ):
+        self.ffmpeg = ffmpeg
+        self.url = url
+        self.extension = output.extension
+        self.content_type = output.content_type
+        self.bytes_read = 0
+        self.starts = 0
+        self._output = output
+        self._http_headers = http_headers or {}
+        self._max_seconds = max_seconds
+        self._process: asyncio.subprocess.Process | None = None
+        self._stderr_task: asyncio.Task | None = None
+        self._stderr: deque[bytes] = deque()
+        self._stderr_size = 0
+
+    def input_args(self) -> list[str]:
+        """ffmpeg arguments that read the media URL (see ffmpeg_input)"""
+        input_args = []
+        if self.url.startswith(("http://", "https://")):
+            input_args += ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+            if self._http_headers:
+                headers = "".join(f"{k}: {v}\r\n" for k, v in self._http_headers.items())
+                input_args += ["-headers", headers]
+        return [*input_args, "-i", self.url]
+
+    def _args(self) -> list[str]:
+        return [
+            self.ffmpeg, *FFMPEG_INPUT_ARGS, *self.input_args(),
+            *ffmpeg_output_args(self._output, self._max_seconds),
+        ]
+
+    async def _drain_stderr(self, stream: asyncio.StreamReader) -> None:
+        """Keep stderr flowing (a full stderr pipe would stall ffmpeg)"""
+        while chunk := await stream.read(1024):
+            self._stderr.append(chunk)
+            self._stderr_size += len(chunk)
+            while self._stderr_size > STDERR_TAIL_BYTES and len(self._stderr) > 1:
+                self._stderr_size -= len(self._stderr.popleft())
+
+    async def _start(self) -> None:
+        await self.close()
+        self._stderr.clear()
+        self._stderr_size = 0
+        self.bytes_read = 0
+        self.starts += 1
+        self._process = await asyncio.create_subprocess_exec(
+            *self._args(),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self._process.stderr))
+
+    async def read(self, size: int = -1) -> bytes:
+        """
+        Next chunk of encoded audio (b"" at the end)
+
+        Raises:
+            STTError: If ffmpeg exits with an error (e.g. the URL expired)
+        """
+        if self._process is None:
+            await self._start()
+        process = self._process
+        chunk = await (process.stdout.read(size) if size > 0 else process.stdout.read())
+        if chunk:
+            self.bytes_read += len(chunk)
+            return chunk
+
+        returncode = await process.wait()
+        if self._stderr_task is not None:
+            await self._stderr_task
+        if returncode != 0 or self.bytes_read == 0:
+            stderr = b"".join(self._stderr).decode(errors="replace")[-500:]
+            metrics.inc("stt_stream_errors")
+            logger.warning("audio_stream_failed", returncode=returncode, stderr=stderr)
+            raise STTError(
+                message="영상 오디오를 스트리밍할 수 없습니다",
+                details={"returncode": returncode}
+            )
+        return b""
+
+    async def seek(self, offset: int) -> int:
+        """Restart the stream (only offset 0 is supported)"""
+        if offset != 0:
+            raise ValueError("FFmpegStreamSource can only seek to 0")
+        if self._process is not None and self.bytes_read > 0:
+            await self._start()
+        return 0
+
+    async def close(self) -> None:
+        """Stop ffmpeg and reap it (no zombie, no transport left to a closed loop)"""
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+            self._stderr_task = None
+        process, self._process = self._process, None
+        if process is not None:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
@@ -0,0 +1,200 @@
+"""Caption fast path for /stt/video
+
+Many videos already carry captions, uploaded by the creator or generated
+by YouTube. The yt-dlp info extracted for the audio lists them
+("subtitles" / "automatic_captions"), so fetching one is a single small
+HTTP request instead of an audio download plus STT. Tracks are parsed
+from WebVTT or YouTube's timedtext XML (srv1-3) into STTSegments.
+
+Only tracks in the video's own language are used for auto captions -
+YouTube also lists machine translations of them for every language.
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+from xml.etree import ElementTree
+
+import structlog
+
+from app.config import get_settings
+from app.core.http_client import get_http_client
+from app.core.metrics import metrics
+from app.models import STTResponse, STTSegment
+
+logger = structlog.get_logger()
+
+# Preferred track formats, best first
+CAPTION_FORMATS = ("vtt", "srv3", "srv2", "srv1")
+
+_TIMESTAMP = r"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+_CUE_TIMING = re.compile(rf"{_TIMESTAMP}\s+-->\s+{_TIMESTAMP}")
+_TAG = re.compile(r"<[^>]*>")
+
+
+@dataclass(frozen=True)
+class CaptionTrack:
+    """A caption track listed in the yt-dlp info"""
+    language: str
+    url: str
+    ext: str
+    automatic: bool
+
+
+def _base_language(code: str) -> str:
+    return code.split("-")[0].lower()
+
+
+def _pick_format(formats: list[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    by_ext = {f.get("ext"): f for f in formats if f.get("url")}
+    for ext in CAPTION_FORMATS:
+        if ext in by_ext:
+            return by_ext[ext]
+    return None
+
+
+def select_caption_track(info: dict[str, Any], language: str) -> Optional[CaptionTrack]:
+    """
+    Best caption track for the requested language
+
+    Uploaded captions win over auto-generated ones. With language "auto"
+    the video's own language is used (or its only uploaded track).
+
+    Returns:
+        CaptionTrack, or None if no acceptable track exists
+    """
+    video_language = info.get("language")
+    wanted = video_language if language == "auto" else language
+    subtitles = {k: v for k, v in (info.get("subtitles") or {}).items() if k != "live_chat"}
+
+    manual = [k for k in subtitles if wanted and _base_language(k) == _base_language(wanted)]
+    if not manual and language == "auto" and len(subtitles) == 1:
+        manual = list(subtitles)
+    for code in manual:
+        fmt = _pick_format(subtitles[code])
+        if fmt:
+            return CaptionTrack(code, fmt["url"], fmt["ext"], automatic=False)
+
+    if not get_settings().stt_captions_allow_auto or not wanted:
+        return None
+    if video_language and _base_language(wanted) != _base_language(video_language):
+        return None  # would be a machine translation
+    automatic = info.get("automatic_captions") or {}
+    for code in (f"{wanted}-orig", wanted):
+        fmt = _pick_format(automatic.get(code) or [])
+        if fmt:
+            return CaptionTrack(wanted, fmt["url"], fmt["ext"], automatic=True)
+    return None
+
+
+def _clean(text: str) -> str:
+    return " ".join(html.unescape(_TAG.sub("", text)).split())
+
+
+def _seconds(hours: Optional[str], minutes: str, seconds: str, millis: str) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def _append(segments: list[STTSegment], start: float, end: float, text: str) -> None:
+    if text:
+        segments.append(STTSegment(start=start, end=max(start, end), text=text))
+
+
+def parse_vtt(content: str) -> list[STTSegment]:
+    """
+    Parse WebVTT cues
+
+    YouTube's auto captions "roll": each cue repeats the previous cue's
+    line before adding a new one, with short cues that only repeat it.
+    Repeated lines are dropped so every word appears once.
+    """
+    segments: list[STTSegment] = []
+    previous: list[str] = []
+    for block in re.split(r"\n\s*\n", content.replace("\r\n", "\n").strip()):
+        lines = block.split("\n")
+        timing_index = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if timing_index is None:
+            continue  # header, NOTE, STYLE
+        match = _CUE_TIMING.search(lines[timing_index])
+        if not match:
+            continue
+        start = _seconds(*match.groups()[:4])
+        end = _seconds(*match.groups()[4:])
+
+        cue_lines = [line for line in (_clean(l) for l in lines[timing_index + 1:]) if line]
+        new_lines = [line for line in cue_lines if line not in previous]
+        previous = cue_lines
+        if new_lines:
+            _append(segments, start, end, " ".join(new_lines))
+        elif cue_lines and segments:
+            last = segments[-1]
+            segments[-1] = STTSegment(start=last.start, end=max(last.end, end), text=last.text)
+    return segments
+
+
+def parse_srv(content: str) -> list[STTSegment]:
+    """Parse YouTube timedtext XML (srv1 <text start dur>, srv2/3 <p|text t d> in ms)"""
+    segments: list[STTSegment] = []
+    for element in ElementTree.fromstring(content).iter():
+        if element.tag not in ("text", "p"):
+            continue
+        if "start" in element.attrib:
+            start = float(element.get("start"))
+            end = start + float(element.get("dur", 0))
+        elif "t" in element.attrib:
+            start = int(element.get("t")) / 1000
+            end = start + int(element.get("d", 0)) / 1000
+        else:
+            continue
+        _append(segments, start, end, _clean("".join(element.itertext())))
+    return segments
+
+
+def parse_captions(content: str, ext: str) -> list[STTSegment]:
+    return parse_vtt(content) if ext == "vtt" else parse_srv(content)
+
+
+async def fetch_captions(info: dict[str, Any], language: str) -> Optional[STTResponse]:
+    """
+    Transcript from the video's captions
+
+    Returns:
+        STTResponse (source "captions" or "auto_captions"), or None if there
+        is no acceptable track or it can't be fetched (fall back to STT)
+    """
+    track = select_caption_track(info, language)
+    if track is None:
+        metrics.inc("stt_caption_lookups", result="none")
+        return None
+
+    settings = get_settings()
+    try:
+        response = await get_http_client().get(track.url, timeout=settings.stt_captions_timeout)
+        response.raise_for_status()
+        segments = parse_captions(response.text, track.ext)
+    except Exception as e:
+        metrics.inc("stt_caption_lookups", result="error")
+        logger.warning("caption_fetch_failed", video_id=info.get("id"), language=track.language, error=str(e))
+        return None
+
+    if not segments:
+        metrics.inc("stt_caption_lookups", result="empty")
+        return None
+
+    source = "auto_captions" if track.automatic else "captions"
+    metrics.inc("stt_caption_lookups", result=source)
+    logger.info(
+        "caption_transcript",
+        video_id=info.get("id"),
+        language=track.language,
+        source=source,
+        segments_count=len(segments)
+    )
+    return STTResponse(
+        text=" ".join(seg.text for seg in segments),
+        language=_base_language(track.language),
+        language_probability=1.0,
+        segments=segments,
+        source=source,
+    )
@@ -1,9 +1,8 @@
 """OpenAI LLM Service for video analysis"""
 
-import json
 import logging
 import structlog
-from openai import OpenAI, APIError, APIConnectionError, RateLimitError as OpenAIRateLimitError
+from openai import APIError, APIConnectionError, RateLimitError as OpenAIRateLimitError
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -14,7 +13,10 @@ from tenacity import (
 
 from app.config import get_settings
 from app.models import VideoMetadata, STTSegment, AnalysisResult, Highlight
+from app.models.llm_schemas import CompactAnalysis
 from app.core.exceptions import LLMError
+from app.services.shared.llm_client import complete_structured
+from app.services.shared.translation import format_timestamped_transcript
 
 logger = structlog.get_logger()
 
@@ -24,9 +26,6 @@ class LLMService:
 
     def __init__(self):
         settings = get_settings()
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.model = settings.openai_model
-        self.timeout = settings.timeout_analyze
         self.retry_max_attempts = settings.retry_max_attempts
         self.retry_base_delay = settings.retry_base_delay
 
@@ -37,19 +36,17 @@ class LLMService:
     ) -> tuple[str | None, bool]:
         """Format transcript with timestamps if segments available"""
         if segments and len(segments) > 0:
-            # [N초] 형식 사용 - LLM이 이해하기 쉬움
-            formatted = "\n".join(
-                f"[{int(seg.start)}초] {seg.text}"
-                for seg in segments
+            formatted = format_timestamped_transcript(
+                (seg.start, seg.text) for seg in segments
             )
             return formatted, True
         return transcript, False
 
     def _validate_highlights(
         self,
-        highlights: list[dict],
+        highlights: list[Highlight],
         segments: list[STTSegment] | None
-    ) -> list[dict]:
+    ) -> list[Highlight]:
         """Validate and correct highlight timestamps against actual segments"""
         if not segments or len(segments) == 0 or len(highlights) == 0:
             return highlights
@@ -65,12 +62,12 @@ class LLMService:
             last_segment_end=video_duration,
             segments_count=len(segments),
             highlights_count=len(highlights),
-            raw_timestamps=[h.get("timestamp") for h in highlights]
+            raw_timestamps=[h.timestamp for h in highlights]
         )
 
         validated = []
         for idx, h in enumerate(highlights):
-            timestamp = h.get("timestamp", 0)
+            timestamp = h.timestamp
             original_timestamp = timestamp
             correction_reason = None
 
@@ -83,7 +80,7 @@ class LLMService:
                     timestamp=timestamp,
                     video_duration=video_duration,
                     excess_seconds=timestamp - video_duration,
-                    title=h.get("title")
+                    title=h.title
                 )
                 # 마지막 세그먼트의 시작 시간으로 보정
                 timestamp = int(segments[-1].start)
@@ -96,7 +93,7 @@ class LLMService:
                     highlight_index=idx,
                     timestamp=timestamp,
                     first_segment_start=first_segment_start,
-                    title=h.get("title")
+                    title=h.title
                 )
                 timestamp = int(first_segment_start)
 
@@ -128,20 +125,17 @@ class LLMService:
                         reason=correction_reason
                     )
 
-            validated.append({
-                **h,
-                "timestamp": corrected_timestamp
-            })
+            validated.append(h.model_copy(update={"timestamp": corrected_timestamp}))
 
         # 검증 완료 로그
         logger.info(
             "timestamp_validation_complete",
             video_duration=video_duration,
-            original_timestamps=[h.get("timestamp") for h in highlights],
-            validated_timestamps=[h.get("timestamp") for h in validated],
+            original_timestamps=[h.timestamp for h in highlights],
+            validated_timestamps=[h.timestamp for h in validated],
             corrections_made=sum(
                 1 for orig, val in zip(highlights, validated)
-                if orig.get("timestamp") != val.get("timestamp")
+                if orig.timestamp != val.timestamp
             )
         )
 
@@ -151,7 +145,8 @@ class LLMService:
         self,
         metadata: VideoMetadata,
         transcript: str | None = None,
-        segments: list[STTSegment] | None = None
+        segments: list[STTSegment] | None = None,
+        timestamped_transcript: str | None = None
     ) -> AnalysisResult:
         """
         Analyze video content using LLM
@@ -160,6 +155,8 @@ class LLMService:
             metadata: Video metadata (title, channel, description)
             transcript: Full transcript text
             segments: Timestamped segments
+            timestamped_transcript: segments already formatted as [N초] lines
+                (PreparedTranscript.timestamped_text); skips formatting
 
         Returns:
             AnalysisResult with summary, score, keywords, highlights
@@ -167,9 +164,12 @@ class LLMService:
         Raises:
             LLMError: If OpenAI API call fails
         """
-        formatted_transcript, has_timestamps = self._format_transcript(
-            transcript, segments
-        )
+        if timestamped_transcript and segments:
+            formatted_transcript, has_timestamps = timestamped_transcript, True
+        else:
+            formatted_transcript, has_timestamps = self._format_transcript(
+                transcript, segments
+            )
 
         if formatted_transcript:
             content = f"""영상 제목: {metadata.title}
@@ -187,26 +187,29 @@ class LLMService:
 
         system_prompt = """당신은 YouTube 영상 분석 전문가입니다. 영상의 내용을 분석하여 다음 정보를 JSON 형식으로 제공해주세요.
 
-중요: 영상이 어떤 언어든 상관없이 모든 응답(summary, keywords, highlights의 title/description)은 반드시 한국어로 작성하세요.
+중요: 영상이 어떤 언어든 상관없이 모든 응답(s, k, h의 n/d)은 반드시 한국어로 작성하세요.
 
-1. summary: 영상 내용을 3문장으로 요약 (각 문장은 50자 이내)
+1. s: 영상 내용을 3문장으로 요약 (각 문장은 50자 이내)
    - 중요: 반드시 스크립트(자막 또는 음성 인식 텍스트)를 읽고 실제 영상에서 다루는 핵심 내용을 요약하세요
    - 제목이나 설명이 아닌, 스크립트에서 말하는 구체적인 내용을 기반으로 작성하세요
-2. watchScore: 시청 가치 점수 (1-10, 정수)
-3. watchScoreReason: 점수 근거 (50자 이내)
-4. keywords: 핵심 키워드 배열 (5-10개) - 스크립트에서 자주 언급되는 주요 개념
-5. highlights: 핵심 구간 배열 (각각 timestamp(초), title(20자이내), description(50자이내))
+2. sc: 시청 가치 점수 (1-10, 정수)
+3. r: 점수 근거 (50자 이내)
+4. k: 핵심 키워드 배열 (5-10개) - 스크립트에서 자주 언급되는 주요 개념
+5. h: 핵심 구간 배열 (각 항목은 {"t": 시작 시간(초), "n": 제목(20자이내), "d": 설명(50자이내)})
    - 기준: 주제가 전환되는 구간을 챕터처럼 선정하세요
    - 개수는 실제 주제 전환 횟수에 맞게 자유롭게 결정하세요
-   - 전환점이 2개면 2개, 7개면 7개 - 억지로 늘리거나 줄이지 마세요"""
+   - 전환점이 2개면 2개, 7개면 7개 - 억지로 늘리거나 줄이지 마세요
+
+출력 형식:
+{"s": "...", "sc": 7, "r": "...", "k": ["..."], "h": [{"t": 120, "n": "...", "d": "..."}]}"""
 
         if has_timestamps:
             system_prompt += """
 
 타임스탬프 규칙:
 - 스크립트에 [N초] 형식으로 타임스탬프가 표시되어 있습니다 (예: [120초], [450초])
-- highlights의 timestamp는 반드시 스크립트에 있는 숫자를 그대로 사용하세요
-- 예: [120초]가 있으면 timestamp: 120
+- h의 t는 반드시 스크립트에 있는 숫자를 그대로 사용하세요
+- 예: [120초]가 있으면 "t": 120
 - 절대로 스크립트에 없는 시간을 만들어내지 마세요"""
 
         system_prompt += "\n\nJSON만 반환하세요. 다른 텍스트는 포함하지 마세요."
@@ -215,7 +218,6 @@ class LLMService:
         if segments and len(segments) > 0:
             logger.info(
                 "llm_analysis_start",
-                model=self.model,
                 has_transcript=bool(formatted_transcript),
                 has_timestamps=has_timestamps,
                 title_length=len(metadata.title),
@@ -232,7 +234,6 @@ class LLMService:
         else:
             logger.info(
                 "llm_analysis_start",
-                model=self.model,
                 has_transcript=bool(formatted_transcript),
                 has_timestamps=has_timestamps,
                 title_length=len(metadata.title)
@@ -259,21 +260,15 @@ class LLMService:
                 message="OpenAI API 호출에 실패했습니다",
                 details={"error": str(e)}
             )
-        except json.JSONDecodeError as e:
-            logger.error("llm_json_parse_error", error=str(e))
-            raise LLMError(
-                message="AI 응답을 파싱할 수 없습니다",
-                details={"error": str(e)}
-            )
 
         # 타임스탬프 검증 및 보정
-        raw_highlights = result.get("highlights", [])
+        raw_highlights = [h.to_highlight() for h in result.h]
 
         # LLM 원본 응답 로그 (DEBUG)
         logger.debug(
             "llm_raw_response",
             raw_highlights=[
-                {"timestamp": h.get("timestamp"), "title": h.get("title")}
+                {"timestamp": h.timestamp, "title": h.title}
                 for h in raw_highlights
             ]
         )
@@ -283,28 +278,20 @@ class LLMService:
         # 보정 전후 비교 로그
         logger.info(
             "llm_analysis_complete",
-            watch_score=result.get("watchScore"),
-            keywords_count=len(result.get("keywords", [])),
+            watch_score=result.sc,
+            keywords_count=len(result.k),
             highlights_count=len(validated_highlights),
-            raw_timestamps=[h.get("timestamp") for h in raw_highlights],
-            validated_timestamps=[h.get("timestamp") for h in validated_highlights]
+            raw_timestamps=[h.timestamp for h in raw_highlights],
+            validated_timestamps=[h.timestamp for h in validated_highlights]
         )
 
-        return AnalysisResult(
-            summary=result.get("summary", "요약을 생성할 수 없습니다."),
-            watchScore=min(10, max(1, result.get("watchScore", 5))),
-            watchScoreReason=result.get("watchScoreReason", "분석 정보가 부족합니다."),
-            keywords=result.get("keywords", []),
-            highlights=[
-                Highlight(**h) for h in validated_highlights
-            ]
-        )
+        return result.to_result(highlights=validated_highlights)
 
     async def _call_openai_with_retry(
         self,
         system_prompt: str,
         content: str
-    ) -> dict:
+    ) -> CompactAnalysis:
         """Call OpenAI API with retry logic"""
         settings = get_settings()
 
@@ -319,17 +306,15 @@ class LLMService:
             before_sleep=before_sleep_log(logger, logging.WARNING),
             reraise=True
         )
-        def _do_request() -> dict:
-            response = self.client.chat.completions.create(
-                model=self.model,
+        async def _do_request() -> CompactAnalysis:
+            return await complete_structured(
+                endpoint="video_analyze",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": content},
                 ],
-                temperature=0.7,
-                response_format={"type": "json_object"},
-                timeout=self.timeout
+                response_model=CompactAnalysis,
+                temperature=0.7
             )
-            return json.loads(response.choices[0].message.content or "{}")
 
-        return _do_request()
+        return await _do_request()
@@ -0,0 +1,206 @@
+"""Streaming multipart/form-data encoder for STT uploads
+
+Audio is read from its source in fixed-size chunks and written straight
+into the outgoing request body, so memory use stays near CHUNK_SIZE no
+matter how large the file is. The size limit is enforced while streaming.
+"""
+
+import asyncio
+import os
+import tempfile
+import uuid
+from typing import AsyncIterator, BinaryIO, Protocol
+
+from app.core.exceptions import ValidationError, ErrorCode
+from app.services.video.scratch import get_scratch_space
+
+# Bytes read from the source per chunk
+CHUNK_SIZE = 64 * 1024
+
+
+class AudioSource(Protocol):
+    """Async readable, rewindable file (UploadFile, BytesSource, FileSource)"""
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+    async def seek(self, offset: int) -> object: ...
+
+
+class BytesSource:
+    """AudioSource over in-memory bytes"""
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._pos = 0
+        self.size = len(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        end = self.size if size < 0 else min(self.size, self._pos + size)
+        chunk = bytes(self._data[self._pos:end])
+        self._pos = end
+        return chunk
+
+    async def seek(self, offset: int) -> int:
+        self._pos = offset
+        return offset
+
+
+class SpooledSource:
+    """AudioSource over a spooled temp file (in memory until it rolls to disk)"""
+
+    def __init__(self, file: tempfile.SpooledTemporaryFile, size: int):
+        self._file = file
+        self.size = size
+
+    @property
+    def _on_disk(self) -> bool:
+        return bool(getattr(self._file, "_rolled", False))
+
+    async def read(self, size: int = -1) -> bytes:
+        if self._on_disk:
+            return await asyncio.to_thread(self._file.read, size)
+        return self._file.read(size)
+
+    async def seek(self, offset: int) -> int:
+        return self._file.seek(offset)
+
+    def fileno(self) -> int:
+        """Descriptor of the backing file (moves the spool to disk)"""
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class FileSource:
+    """AudioSource over a file on disk (reads run in worker threads)"""
+
+    def __init__(self, path: str | os.PathLike):
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(self._file.read, size)
+
+    async def seek(self, offset: int) -> int:
+        return self._file.seek(offset)
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def backing_file(source: AudioSource) -> BinaryIO | None:
+    """
+    The file on disk behind a source (UploadFile, SpooledSource, FileSource)
+
+    In-memory spools return None rather than being rolled to disk.
+    """
+    file = getattr(source, "file", None)  # UploadFile
+    if file is None and isinstance(source, (SpooledSource, FileSource)):
+        file = source._file
+    if isinstance(file, tempfile.SpooledTemporaryFile) and not file._rolled:
+        return None
+    return file if hasattr(file, "fileno") else None
+
+
+async def spool_source(source: AudioSource) -> SpooledSource:
+    """
+    Copy an AudioSource into a scratch spool the caller owns
+
+    Raises:
+        AIServiceError: 503 if the scratch quota is exhausted
+    """
+    spool = get_scratch_space().spool()
+    size = 0
+    try:
+        await source.seek(0)
+        while chunk := await source.read(CHUNK_SIZE):
+            if getattr(spool, "_rolled", False):
+                await asyncio.to_thread(spool.write, chunk)
+            else:
+                spool.write(chunk)
+            size += len(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return SpooledSource(spool, size)
+
+
+def file_too_large_error(max_file_size_mb: int, file_size: int) -> ValidationError:
+    return ValidationError(
+        ErrorCode.FILE_TOO_LARGE,
+        f"파일 크기가 {max_file_size_mb}MB를 초과합니다",
+        details={"file_size_mb": round(file_size / (1024 * 1024), 2)}
+    )
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
+
+
+class StreamingMultipartBody:
+    """
+    multipart/form-data body with one streamed file part
+
+    Iterate once per request; the source is rewound at the start of every
+    iteration so retries resend the whole file.
+    """
+
+    def __init__(
+        self,
+        source: AudioSource,
+        field_name: str,
+        filename: str,
+        content_type: str,
+        fields: dict[str, str],
+        max_file_size_mb: int,
+        file_size: int | None = None,
+    ):
+        self.source = source
+        self.max_file_size_mb = max_file_size_mb
+        self.max_bytes = max_file_size_mb * 1024 * 1024
+        self.file_size = file_size
+        self.boundary = uuid.uuid4().hex
+
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'.encode()
+            + value.encode() + b"\r\n"
+            for name, value in fields.items()
+        )
+        self._head = head + (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(field_name)}"; filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def headers(self) -> dict[str, str]:
+        """Request headers (Content-Length only when the file size is known)"""
+        headers = {"Content-Type": self.content_type}
+        if self.file_size is not None:
+            headers["Content-Length"] = str(len(self._head) + self.file_size + len(self._tail))
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await self.source.seek(0)
+        yield self._head
+
+        sent = 0
+        while True:
+            chunk = await self.source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sent += len(chunk)
+            if sent > self.max_bytes:
+                raise file_too_large_error(self.max_file_size_mb, sent)
+            yield chunk
+
+        yield self._tail
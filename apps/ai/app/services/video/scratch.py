@@ -0,0 +1,139 @@
+"""Scratch space for spooled audio
+
+Uploads (spooled by the form parser, see api/video/uploads), transcoded
+audio and decoded PCM are kept in spooled temp files: in memory up to SCRATCH_MEMORY_THRESHOLD_MB, then on disk under
+SCRATCH_DIR. Disk use is counted per process against SCRATCH_QUOTA_MB, so
+a burst of large uploads gets 503 instead of filling the disk. SCRATCH_DIR
+should be a real disk or volume: the default system temp dir is tmpfs on
+Cloud Run, where it shares the container's memory limit, which is why the
+default quota is small.
+
+Temp files are unlinked on creation, so the OS reclaims them even if the
+process dies. Quota is given back when a file is closed - callers close
+in finally blocks, and a finalizer covers files that are only dropped
+(e.g. a queued job cancelled before it ran).
+"""
+
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+
+class ScratchSpace:
+    """Scratch directory with a per-process disk quota"""
+
+    def __init__(self, directory: str | None, memory_threshold: int, quota_bytes: int):
+        self.directory = directory or None
+        self.memory_threshold = memory_threshold
+        self.quota_bytes = quota_bytes
+        self._used = 0
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def reserve(self, nbytes: int) -> None:
+        """
+        Count nbytes of disk against the quota
+
+        Raises:
+            AIServiceError: 503 if the quota would be exceeded
+        """
+        with self._lock:
+            if self.quota_bytes and self._used + nbytes > self.quota_bytes:
+                metrics.inc("scratch_quota_rejected")
+                logger.warning("scratch_quota_exceeded", used=self._used, requested=nbytes, quota=self.quota_bytes)
+                raise AIServiceError(
+                    code=ErrorCode.SERVICE_UNAVAILABLE,
+                    message="처리 중인 오디오가 많아 임시 저장 공간이 부족합니다. 잠시 후 다시 시도해주세요",
+                    status_code=503,
+                    details={"quota_mb": self.quota_bytes // (1024 * 1024)}
+                )
+            self._used += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._lock:
+            self._used = max(0, self._used - nbytes)
+
+    @contextmanager
+    def hold(self, nbytes: int) -> Iterator[None]:
+        """Reserve nbytes for the duration of the block (files spooled elsewhere)"""
+        self.reserve(nbytes)
+        try:
+            yield
+        finally:
+            self.release(nbytes)
+
+    def spool(self) -> "ScratchFile":
+        """New spooled temp file counted against this space"""
+        return ScratchFile(self)
+
+    def stats(self) -> dict[str, int]:
+        return {"used_bytes": self._used, "quota_bytes": self.quota_bytes}
+
+
+class _Reservation:
+    """Disk bytes held by one ScratchFile (released once)"""
+
+    def __init__(self, space: ScratchSpace):
+        self.space = space
+        self.nbytes = 0
+
+    def add(self, nbytes: int) -> None:
+        self.space.reserve(nbytes)
+        self.nbytes += nbytes
+
+    def release(self) -> None:
+        self.space.release(self.nbytes)
+        self.nbytes = 0
+
+
+class ScratchFile(tempfile.SpooledTemporaryFile):
+    """SpooledTemporaryFile in the scratch directory whose disk use counts against the quota"""
+
+    def __init__(self, space: ScratchSpace):
+        super().__init__(max_size=space.memory_threshold, dir=space.directory)
+        self._reservation = _Reservation(space)
+        self._finalizer = weakref.finalize(self, self._reservation.release)
+
+    def rollover(self) -> None:
+        if not self._rolled:
+            self._reservation.add(len(self._file.getbuffer()))
+        super().rollover()
+
+    def write(self, s) -> int:
+        if self._rolled:
+            self._reservation.add(len(s))
+        return super().write(s)
+
+    def close(self) -> None:
+        super().close()
+        self._finalizer()
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._reservation.nbytes
+
+
+@lru_cache
+def get_scratch_space() -> ScratchSpace:
+    """Get the process-wide scratch space"""
+    settings = get_settings()
+    space = ScratchSpace(
+        settings.scratch_dir,
+        settings.scratch_memory_threshold_mb * 1024 * 1024,
+        settings.scratch_quota_mb * 1024 * 1024,
+    )
+    metrics.register_collector("scratch", space.stats)
+    return space
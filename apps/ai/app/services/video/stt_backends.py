@@ -0,0 +1,240 @@
+"""STT endpoint pool - one or more WhisperX servers
+
+Endpoints come from Settings: stt_api_urls (comma-separated) or, if that
+is empty, the single stt_api_url. Each request goes to the endpoint with
+the lowest (outstanding requests + 1) x latency, so a slow or busy server
+gets less traffic and an idle one picks it up.
+
+An endpoint that fails stt_backend_failure_threshold times in a row
+(connection errors, timeouts, 5xx) is ejected for
+stt_backend_cooldown_seconds. After the cooldown it is re-probed with a
+GET / in the background and only rejoins the rotation once it answers.
+Ejected endpoints are still tried last, so a request has somewhere to go
+when every endpoint is down. /health only checks reachability and never
+re-admits an endpoint; per-endpoint state is on /metrics (stt_backends).
+"""
+
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlsplit
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.http_client import get_http_client
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Smoothing factor for per-endpoint latency
+LATENCY_EWMA_ALPHA = 0.2
+# Latency assumed for endpoints without a completed request yet
+DEFAULT_LATENCY_SECONDS = 1.0
+
+
+class STTBackend:
+    """One STT endpoint plus load and health state"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.name = urlsplit(self.url).netloc or self.url
+        self.outstanding = 0
+        self.latency = 0.0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejected = False
+        self.probing = False
+        self.last_probe_ok: bool | None = None
+
+    def probe_due(self, now: float) -> bool:
+        return self.ejected and not self.probing and now >= self.ejected_until
+
+    def score(self, default_latency: float) -> float:
+        return (self.outstanding + 1) * (self.latency or default_latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "latency": round(self.latency, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "ejected": self.ejected,
+            "last_probe_ok": self.last_probe_ok,
+        }
+
+
+def load_backend_urls() -> list[str]:
+    """Endpoint URLs from Settings (stt_api_urls, else stt_api_url)"""
+    settings = get_settings()
+    urls = [u.strip() for u in settings.stt_api_urls.split(",") if u.strip()]
+    if not urls and settings.stt_api_url:
+        urls = [settings.stt_api_url]
+
+    names = [STTBackend(u).name for u in urls]
+    if len(names) != len(set(names)):
+        raise AIServiceError(
+            code=ErrorCode.CONFIGURATION_ERROR,
+            message="STT endpoints must be unique",
+            details={"endpoints": urls},
+            status_code=500,
+        )
+    return urls
+
+
+class STTBackendPool:
+    """Least-loaded selection, ejection and re-probing"""
+
+    def __init__(self, urls: list[str]):
+        settings = get_settings()
+        self.backends = [STTBackend(u) for u in urls]
+        self.failure_threshold = settings.stt_backend_failure_threshold
+        self.cooldown_seconds = settings.stt_backend_cooldown_seconds
+        self.probe_timeout = settings.timeout_health
+        self._probes: set[asyncio.Task] = set()
+
+    def _default_latency(self) -> float:
+        observed = [b.latency for b in self.backends if b.latency]
+        return sum(observed) / len(observed) if observed else DEFAULT_LATENCY_SECONDS
+
+    def candidates(self, exclude: frozenset[str] = frozenset()) -> list[STTBackend]:
+        """
+        Order endpoints for one attempt
+
+        Available endpoints by score (ties broken at random), then ejected
+        ones, soonest to be re-probed first. Endpoints named in exclude
+        (already tried by this request) go after the rest. Ejected
+        endpoints whose cooldown is over get a background re-probe.
+        """
+        if not self.backends:
+            raise AIServiceError(
+                code=ErrorCode.CONFIGURATION_ERROR,
+                message="No STT endpoint configured",
+                status_code=500,
+            )
+
+        now = time.monotonic()
+        for backend in self.backends:
+            if backend.probe_due(now):
+                self._schedule_probe(backend)
+
+        default_latency = self._default_latency()
+        return sorted(
+            self.backends,
+            key=lambda b: (
+                b.name in exclude,
+                b.ejected,
+                b.ejected_until if b.ejected else b.score(default_latency),
+                random.random(),
+            ),
+        )
+
+    def acquire(self, exclude: frozenset[str] = frozenset()) -> STTBackend:
+        """Pick the endpoint for one request and count it as outstanding"""
+        backend = self.candidates(exclude)[0]
+        backend.outstanding += 1
+        return backend
+
+    def untried(self, exclude: frozenset[str]) -> bool:
+        """Whether an available endpoint is left that this request hasn't tried"""
+        return any(not b.ejected and b.name not in exclude for b in self.backends)
+
+    def record_success(self, backend: STTBackend, latency: float) -> None:
+        backend.outstanding -= 1
+        backend.latency = latency if backend.latency == 0 else (
+            backend.latency + LATENCY_EWMA_ALPHA * (latency - backend.latency)
+        )
+        backend.consecutive_failures = 0
+        metrics.observe("stt_backend_latency_seconds", latency, backend=backend.name, outcome="ok")
+
+    def release(self, backend: STTBackend) -> None:
+        """End a request that says nothing about the endpoint's health"""
+        backend.outstanding -= 1
+
+    def record_failure(self, backend: STTBackend, latency: float, error: Exception) -> None:
+        backend.outstanding -= 1
+        backend.consecutive_failures += 1
+        metrics.observe("stt_backend_latency_seconds", latency, backend=backend.name, outcome="error")
+        metrics.inc("stt_backend_errors", backend=backend.name, error=type(error).__name__)
+
+        if backend.consecutive_failures >= self.failure_threshold and not backend.ejected:
+            self._eject(backend)
+
+    def _eject(self, backend: STTBackend) -> None:
+        backend.ejected = True
+        backend.ejected_until = time.monotonic() + self.cooldown_seconds
+        metrics.inc("stt_backend_ejections", backend=backend.name)
+        logger.warning(
+            "stt_backend_ejected",
+            backend=backend.name,
+            failures=backend.consecutive_failures,
+            cooldown=self.cooldown_seconds
+        )
+
+    def _schedule_probe(self, backend: STTBackend) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop (sync caller); probed on the next async call
+        backend.probing = True  # before the task runs, so it is scheduled once
+        task = loop.create_task(self.probe(backend))
+        self._probes.add(task)
+        task.add_done_callback(self._probes.discard)
+
+    async def _reachable(self, backend: STTBackend) -> bool:
+        """GET / answered with a status below 500 (no state change)"""
+        try:
+            response = await get_http_client().get(f"{backend.url}/", timeout=self.probe_timeout)
+            return response.status_code < 500
+        except Exception as e:
+            logger.warning("stt_backend_probe_failed", backend=backend.name, error=str(e))
+            return False
+
+    async def probe(self, backend: STTBackend) -> bool:
+        """
+        Check an endpoint is reachable (any response below 500)
+
+        An ejected endpoint rejoins the rotation if the probe succeeds and
+        starts another cooldown if it fails.
+        """
+        backend.probing = True
+        try:
+            ok = await self._reachable(backend)
+        finally:
+            backend.probing = False
+
+        backend.last_probe_ok = ok
+        metrics.inc("stt_backend_probes", backend=backend.name, result="ok" if ok else "error")
+        if backend.ejected:
+            if ok:
+                backend.ejected = False
+                backend.consecutive_failures = 0
+                logger.info("stt_backend_restored", backend=backend.name)
+            else:
+                backend.ejected_until = time.monotonic() + self.cooldown_seconds
+        return ok
+
+    async def check_all(self) -> dict[str, bool]:
+        """
+        Check every endpoint at once (health check)
+
+        Read-only: ejection state is left alone, so health-check traffic
+        can't put an ejected endpoint back into rotation.
+        """
+        results = await asyncio.gather(*(self._reachable(b) for b in self.backends))
+        return {b.name: ok for b, ok in zip(self.backends, results)}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {b.name: b.snapshot() for b in self.backends}
+
+
+@lru_cache
+def get_stt_backend_pool() -> STTBackendPool:
+    """Get the process-wide STT endpoint pool (cache_clear() to rebuild)"""
+    pool = STTBackendPool(load_backend_urls())
+    metrics.register_collector("stt_backends", pool.snapshot)
+    logger.info("stt_backend_pool", backends=[b.name for b in pool.backends])
+    return pool
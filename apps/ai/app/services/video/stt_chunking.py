@@ -0,0 +1,72 @@
+"""Chunk planning and stitching for long-audio STT
+
+Long audio is cut into equal, overlapping windows that are transcribed
+independently. When stitching, each overlap is split at its midpoint: a
+segment belongs to the chunk whose half of the overlap contains the
+segment's midpoint, so words heard by both chunks appear once.
+"""
+
+import math
+
+from app.models import STTResponse
+
+
+def plan_chunks(
+    duration: float,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> list[tuple[float, float]]:
+    """
+    Split [0, duration] into equal windows of at most chunk_seconds
+
+    Consecutive windows overlap by overlap_seconds. Returns one window when
+    chunking is disabled (chunk_seconds <= 0) or the audio is short.
+    """
+    if chunk_seconds <= 0 or duration <= chunk_seconds:
+        return [(0.0, duration)]
+
+    overlap = min(overlap_seconds, chunk_seconds / 2)
+    count = math.ceil((duration - overlap) / (chunk_seconds - overlap))
+    length = (duration + (count - 1) * overlap) / count
+    step = length - overlap
+
+    windows = [(round(i * step, 3), round(i * step + length, 3)) for i in range(count)]
+    windows[-1] = (windows[-1][0], duration)
+    return windows
+
+
+def stitch_chunks(
+    windows: list[tuple[float, float]],
+    results: list[STTResponse],
+) -> STTResponse:
+    """
+    Merge per-chunk results into one timeline
+
+    Chunk-relative timestamps are offset by the window start, and overlap
+    duplicates are dropped at the overlap midpoint.
+    """
+    if len(results) == 1 and windows[0][0] == 0:
+        return results[0]
+
+    cuts = [(windows[i][1] + windows[i + 1][0]) / 2 for i in range(len(windows) - 1)]
+
+    segments = []
+    for i, ((start, _), result) in enumerate(zip(windows, results)):
+        lower = cuts[i - 1] if i > 0 else float("-inf")
+        upper = cuts[i] if i < len(cuts) else float("inf")
+        for seg in result.segments:
+            seg_start, seg_end = seg.start + start, seg.end + start
+            if lower <= (seg_start + seg_end) / 2 < upper:
+                segments.append(seg.model_copy(update={
+                    "start": round(seg_start, 3),
+                    "end": round(seg_end, 3),
+                }))
+
+    # Language of the chunk that heard the most speech
+    main = max(results, key=lambda r: len(r.text))
+    return STTResponse(
+        text=" ".join(seg.text.strip() for seg in segments if seg.text.strip()),
+        language=main.language,
+        language_probability=main.language_probability,
+        segments=segments,
+    )
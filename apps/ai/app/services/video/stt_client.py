@@ -1,19 +1,31 @@
 """External STT API Client"""
 
 import logging
+import time
 import httpx
 import structlog
+from pydantic_core import from_json
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
     before_sleep_log,
 )
 
 from app.config import get_settings
-from app.models import STTResponse, STTSegment
+from app.models import STTResponse
 from app.core.exceptions import STTError, ValidationError, ErrorCode
+from app.core.http_client import get_http_client
+from app.services.video.stt_backends import get_stt_backend_pool
+from app.services.video.stt_limiter import get_stt_limiter
+from app.services.video.stt_result import build_stt_response
+from app.services.video.multipart_stream import (
+    AudioSource,
+    BytesSource,
+    StreamingMultipartBody,
+    file_too_large_error,
+)
 
 logger = structlog.get_logger()
 
@@ -38,7 +50,6 @@ class STTClient:
 
     def __init__(self):
         settings = get_settings()
-        self.base_url = settings.stt_api_url
         self.max_duration_minutes = settings.stt_max_duration_minutes
         self.max_file_size_mb = settings.max_file_size_mb
         self.timeout = settings.timeout_stt
@@ -47,19 +58,14 @@ class STTClient:
 
     def validate_file(
         self,
-        audio_data: bytes,
+        file_size: int | None,
         filename: str,
         content_type: str | None = None
     ) -> None:
-        """Validate audio file before processing"""
+        """Validate audio file before processing (size is re-checked while streaming)"""
         # Check file size
-        file_size_mb = len(audio_data) / (1024 * 1024)
-        if file_size_mb > self.max_file_size_mb:
-            raise ValidationError(
-                ErrorCode.FILE_TOO_LARGE,
-                f"파일 크기가 {self.max_file_size_mb}MB를 초과합니다",
-                details={"file_size_mb": round(file_size_mb, 2)}
-            )
+        if file_size is not None and file_size > self.max_file_size_mb * 1024 * 1024:
+            raise file_too_large_error(self.max_file_size_mb, file_size)
 
         # Check file extension
         if filename:
@@ -81,19 +87,24 @@ class STTClient:
 
     async def transcribe(
         self,
-        audio_data: bytes,
+        audio_data: bytes | AudioSource,
         filename: str = "audio.webm",
         language: str = "auto",
-        content_type: str | None = None
+        content_type: str | None = None,
+        file_size: int | None = None
     ) -> STTResponse:
         """
         Transcribe audio using external STT API
 
+        The audio is streamed to the STT API in chunks; pass an UploadFile
+        (or any AudioSource) to avoid loading the whole file into memory.
+
         Args:
-            audio_data: Audio file bytes
+            audio_data: Audio file bytes or an async readable source
             filename: Original filename
             language: Language hint ("auto" for auto-detection)
             content_type: MIME type of the file
+            file_size: Source size in bytes, if known
 
         Returns:
             STTResponse with text, language, and segments
@@ -102,19 +113,23 @@ class STTClient:
             ValidationError: If file validation fails
             STTError: If STT API call fails
         """
+        if isinstance(audio_data, bytes):
+            audio_data = BytesSource(audio_data)
+            file_size = audio_data.size
+
         # Validate file
-        self.validate_file(audio_data, filename, content_type)
+        self.validate_file(file_size, filename, content_type)
 
         logger.info(
             "stt_request_start",
-            audio_size=len(audio_data),
+            audio_size=file_size,
             filename=filename,
             language=language
         )
 
         try:
             result = await self._transcribe_with_retry(
-                audio_data, filename, language
+                audio_data, filename, language, file_size, content_type
             )
         except httpx.HTTPStatusError as e:
             if e.response.status_code >= 500:
@@ -167,50 +182,79 @@ class STTClient:
                 segments_count=0
             )
 
-        return STTResponse(
-            text=result.get("text", ""),
-            language=result.get("language", language),
-            language_probability=result.get("language_probability", 1.0),
-            segments=[
-                STTSegment(**seg) for seg in result.get("segments", [])
-            ]
-        )
+        return build_stt_response(result, language)
 
     async def _transcribe_with_retry(
         self,
-        audio_data: bytes,
+        source: AudioSource,
         filename: str,
-        language: str
+        language: str,
+        file_size: int | None,
+        content_type: str | None = None
     ) -> dict:
-        """Execute transcription with retry logic"""
+        """
+        Execute transcription with retry logic
+
+        Each attempt takes a slot from the adaptive concurrency limiter,
+        then goes to the least-loaded endpoint this request hasn't tried
+        yet; failing over to a fresh endpoint doesn't wait for the backoff,
+        retrying one that already failed does.
+        """
         settings = get_settings()
+        pool = get_stt_backend_pool()
+        limiter = get_stt_limiter()
+        tried: set[str] = set()
+        backoff = wait_exponential(
+            multiplier=settings.retry_base_delay,
+            min=settings.retry_base_delay,
+            max=settings.retry_base_delay * 4
+        )
+
+        def wait(retry_state) -> float:
+            return 0 if pool.untried(frozenset(tried)) else backoff(retry_state)
 
         @retry(
-            stop=stop_after_attempt(settings.retry_max_attempts),
-            wait=wait_exponential(
-                multiplier=settings.retry_base_delay,
-                min=settings.retry_base_delay,
-                max=settings.retry_base_delay * 4
-            ),
-            retry=retry_if_exception_type((
-                httpx.ConnectError,
-                httpx.TimeoutException,
-            )),
+            stop=stop_after_attempt(max(settings.retry_max_attempts, len(pool.backends))),
+            wait=wait,
+            retry=retry_if_exception(is_retryable_error),
             before_sleep=before_sleep_log(logger, logging.WARNING),
             reraise=True
         )
         async def _do_request() -> dict:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                files = {"audio": (filename, audio_data, "audio/webm")}
-                data = {"language": language}
-
-                response = await client.post(
-                    f"{self.base_url}/whisperX/transcribe",
-                    files=files,
-                    data=data
-                )
-                response.raise_for_status()
-                return response.json()
+            # Fresh body per attempt - it rewinds the source before streaming
+            body = StreamingMultipartBody(
+                source,
+                field_name="audio",
+                filename=filename,
+                content_type=content_type or "audio/webm",
+                fields={"language": language},
+                max_file_size_mb=self.max_file_size_mb,
+                file_size=file_size,
+            )
+            async with limiter.slot() as slot:
+                backend = pool.acquire(frozenset(tried))
+                tried.add(backend.name)
+                start_time = time.perf_counter()
+                try:
+                    response = await get_http_client().post(
+                        f"{backend.url}/whisperX/transcribe",
+                        content=body,
+                        headers=body.headers(),
+                        timeout=self.timeout
+                    )
+                    response.raise_for_status()
+                    # Parsed straight from bytes by pydantic-core's JSON parser
+                    result = from_json(response.content)
+                except BaseException as e:
+                    if is_retryable_error(e):
+                        pool.record_failure(backend, time.perf_counter() - start_time, e)
+                        slot.congested()
+                    else:
+                        pool.release(backend)  # 4xx, oversized upload, cancelled
+                    raise
+                pool.record_success(backend, time.perf_counter() - start_time)
+                slot.succeeded()
+                return result
 
         return await _do_request()
 
@@ -0,0 +1,345 @@
+"""Asynchronous STT jobs run by a bounded in-process worker pool
+
+A YouTube download plus STT can take minutes, longer than most proxies
+keep a request open. Work is submitted as a job instead: the caller gets a
+job id right away and follows progress by polling or SSE. A fixed number
+of workers drain a bounded queue, so concurrent STT work per process is
+capped; the synchronous endpoints submit to the same pool and wait (so
+stt_job_workers also bounds concurrent synchronous requests), and cancel
+their job if the request is cancelled.
+
+Jobs live in memory and are forgotten stt_job_retention_seconds after
+they finish, so polling must hit the same process that accepted the job.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.metrics import metrics
+from app.models import FlatErrorResponse, STTJobStatus, STTResponse
+from app.services.video.stt_progress import progress_callback
+
+logger = structlog.get_logger()
+
+JobWork = Callable[[], Awaitable[STTResponse]]
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _cancelled_error() -> AIServiceError:
+    return AIServiceError(
+        code=ErrorCode.SERVICE_UNAVAILABLE,
+        message="요청이 취소되어 작업이 중단되었습니다",
+        status_code=503
+    )
+
+
+class STTJob:
+    """One unit of STT work and its observable state"""
+
+    def __init__(self, kind: str, work: JobWork, request_id: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request_id = request_id
+        self.status = QUEUED
+        self.stage = QUEUED
+        self.chunks_done: int | None = None
+        self.chunks_total: int | None = None
+        self.result: STTResponse | None = None
+        self.exception: BaseException | None = None
+        self.created_at = self.updated_at = _now()
+        self.submitted_at = time.perf_counter()
+        self.finished_at: float | None = None
+        self._work = work
+        self._task: asyncio.Task | None = None
+        self._version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def _touch(self) -> None:
+        self.updated_at = _now()
+        self._version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def set_stage(self, stage: str, chunks_done: int | None = None, chunks_total: int | None = None) -> None:
+        """Progress callback for the pipeline (see stt_progress)"""
+        self.stage = stage
+        self.chunks_done = chunks_done
+        self.chunks_total = chunks_total
+        self._touch()
+
+    def _start(self) -> None:
+        self.status = RUNNING
+        self._touch()
+
+    def _finish(self, result: STTResponse | None, exception: BaseException | None = None) -> None:
+        self.status = FAILED if exception else COMPLETED
+        self.stage = self.status
+        self.result = result
+        self.exception = exception
+        self.finished_at = time.monotonic()
+        self._work = None
+        self._task = None
+        self._touch()
+
+    def cancel(self) -> bool:
+        """
+        Stop the job: dropped if still queued, its work cancelled if running
+
+        Returns:
+            False if the job had already finished
+        """
+        if self.done:
+            return False
+        if self._task is not None:
+            self._task.cancel()  # the worker records the outcome
+        else:
+            self._finish(None, _cancelled_error())
+        return True
+
+    def snapshot(self) -> STTJobStatus:
+        error = None
+        if isinstance(self.exception, AIServiceError):
+            error = FlatErrorResponse(**self.exception.to_flat_dict())
+        elif self.exception is not None:
+            error = FlatErrorResponse(
+                error=ErrorCode.SERVICE_UNAVAILABLE.value,
+                message="서비스를 일시적으로 사용할 수 없습니다"
+            )
+        return STTJobStatus(
+            job_id=self.id,
+            status=self.status,
+            stage=self.stage,
+            chunks_done=self.chunks_done,
+            chunks_total=self.chunks_total,
+            result=self.result,
+            error=error,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    async def stopped(self) -> None:
+        """Wait until the job has finished, whatever the outcome"""
+        while not self.done:
+            await self._changed.wait()
+
+    async def wait(self) -> STTResponse:
+        """Wait for the job and return its result (re-raises its error)"""
+        await self.stopped()
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+    async def changes(self, heartbeat: float) -> AsyncIterator[STTJobStatus | None]:
+        """
+        Yield a snapshot now and after every change until the job finishes
+
+        None is yielded after heartbeat seconds without a change, so
+        streaming callers can keep idle connections alive.
+        """
+        version = -1
+        while True:
+            if version != self._version:
+                version, changed = self._version, self._changed
+                snapshot = self.snapshot()
+                yield snapshot
+                # Judge by what was sent: the job may have finished meanwhile
+                if snapshot.status in (COMPLETED, FAILED):
+                    return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class STTJobManager:
+    """Job registry plus a fixed pool of asyncio workers"""
+
+    def __init__(self, workers: int, queue_size: int, retention_seconds: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, STTJob] = {}
+        self._queue: asyncio.Queue[STTJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._running = 0
+
+    def start(self) -> None:
+        """Start workers on the running loop (no-op if already running there)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # A new loop means the old workers are gone (TestClient without
+        # lifespan runs every request on its own loop)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._running = 0
+        self._tasks = [loop.create_task(self._worker(self._queue)) for _ in range(self.workers)]
+        logger.info("stt_job_workers_started", workers=self.workers, queue_size=self.queue_size)
+
+    async def stop(self) -> None:
+        """Cancel workers; queued and running jobs fail with 503"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        shutdown = AIServiceError(
+            code=ErrorCode.SERVICE_UNAVAILABLE,
+            message="서비스가 재시작되어 작업이 취소되었습니다. 다시 요청해주세요",
+            status_code=503
+        )
+        for job in self._jobs.values():
+            if not job.done:
+                job._finish(None, shutdown)
+        self._queue = None
+        self._loop = None
+
+    def submit(self, kind: str, work: JobWork, request_id: str | None = None) -> STTJob:
+        """
+        Queue work and return its job immediately
+
+        Raises:
+            AIServiceError: 503 if the queue is full
+        """
+        self.start()
+        self._prune()
+        job = STTJob(kind, work, request_id)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            metrics.inc("stt_jobs_rejected", kind=kind)
+            logger.warning("stt_job_queue_full", kind=kind, queue_size=self.queue_size)
+            raise AIServiceError(
+                code=ErrorCode.SERVICE_UNAVAILABLE,
+                message="STT 작업이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요",
+                status_code=503,
+                details={"queue_size": self.queue_size}
+            ) from None
+        self._jobs[job.id] = job
+        metrics.inc("stt_jobs_submitted", kind=kind)
+        logger.info("stt_job_submitted", job_id=job.id, kind=kind, queued=self._queue.qsize())
+        return job
+
+    async def run(self, kind: str, work: JobWork, request_id: str | None = None) -> STTResponse:
+        """
+        Submit work and wait for its result (synchronous endpoints)
+
+        If the caller is cancelled (client gone), the job is cancelled too
+        and this only returns once its work has stopped, since the work may
+        use request-scoped resources such as the uploaded file.
+        """
+        job = self.submit(kind, work, request_id)
+        try:
+            return await job.wait()
+        except asyncio.CancelledError:
+            if job.cancel():
+                metrics.inc("stt_jobs_cancelled", kind=kind)
+                logger.info("stt_job_cancelled", job_id=job.id, kind=kind)
+            await job.stopped()
+            raise
+
+    def get(self, job_id: str) -> STTJob | None:
+        return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget jobs that finished more than retention_seconds ago"""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                if not job.done:  # cancelled while queued
+                    await self._run_job(job)
+            finally:
+                queue.task_done()
+
+    async def _run_job(self, job: STTJob) -> None:
+        metrics.observe("stt_job_wait_seconds", time.perf_counter() - job.submitted_at)
+        self._running += 1
+        job._start()
+        start_time = time.perf_counter()
+        with structlog.contextvars.bound_contextvars(request_id=job.request_id, job_id=job.id):
+            # The work runs as its own task (inheriting this context), so
+            # job.cancel() stops it without taking the worker down
+            with progress_callback(job.set_stage):
+                task = job._task = asyncio.ensure_future(job._work())
+            try:
+                await asyncio.wait([task])
+            except asyncio.CancelledError:
+                task.cancel()  # worker stopped; stop() fails the job
+                raise
+            finally:
+                self._running -= 1
+
+            if task.cancelled():
+                job._finish(None, _cancelled_error())
+            elif task.exception() is not None:
+                error = task.exception()
+                if not isinstance(error, AIServiceError):
+                    logger.error("stt_job_unexpected_error", kind=job.kind, exc_info=error)
+                job._finish(None, error)
+            else:
+                job._finish(task.result())
+
+            elapsed = time.perf_counter() - start_time
+            metrics.inc("stt_jobs_finished", kind=job.kind, status=job.status)
+            metrics.observe("stt_job_seconds", elapsed, kind=job.kind)
+            logger.info("stt_job_finished", kind=job.kind, status=job.status, elapsed=round(elapsed, 2))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self._running,
+            "tracked": len(self._jobs),
+        }
+
+
+@lru_cache
+def get_job_manager() -> STTJobManager:
+    """Get the process-wide STT job manager"""
+    settings = get_settings()
+    manager = STTJobManager(
+        workers=settings.stt_job_workers,
+        queue_size=settings.stt_job_queue_size,
+        retention_seconds=settings.stt_job_retention_seconds,
+    )
+    metrics.register_collector("stt_jobs", manager.stats)
+    return manager
+
+
+async def start_stt_jobs() -> None:
+    """Start the worker pool (app startup)"""
+    get_job_manager().start()
+
+
+async def stop_stt_jobs() -> None:
+    """Stop the worker pool (app shutdown)"""
+    await get_job_manager().stop()
@@ -0,0 +1,216 @@
+"""Adaptive concurrency limit for STT requests (AIMD)
+
+WhisperX is GPU-bound: requests beyond its capacity queue on the server
+until timeout_stt fires and are then retried, which only adds load. Every
+request to an STT endpoint therefore takes a slot here first.
+
+The limit grows by about one slot per limit's worth of successful requests while
+their latency stays within stt_concurrency_latency_tolerance x the usual
+latency (additive increase), and is multiplied by stt_concurrency_backoff
+on timeouts, connection errors and 5xx responses (multiplicative decrease),
+at most once per usual latency so one burst of failures only counts once.
+
+Requests over the limit wait up to stt_concurrency_queue_timeout seconds
+for a slot, then get 503 with Retry-After (0 = fail fast).
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Smoothing factor for the usual request latency
+LATENCY_EWMA_ALPHA = 0.1
+MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded local wait"""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        backoff: float,
+        latency_tolerance: float,
+        queue_timeout: float
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.queue_timeout = queue_timeout
+        self.latency = 0.0
+        self.in_flight = 0
+        self._waiters: list[asyncio.Future] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._last_decrease = 0.0
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures are bound to the loop they were created on
+            self._loop = loop
+            self._waiters = []
+            self.in_flight = 0
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait (about one request's latency)"""
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(self.latency)))
+
+    def _rejected(self, reason: str) -> AIServiceError:
+        metrics.inc("stt_limiter_rejected", reason=reason)
+        logger.warning(
+            "stt_concurrency_limited",
+            reason=reason,
+            limit=int(self.limit),
+            in_flight=self.in_flight,
+            waiting=len(self._waiters)
+        )
+        retry_after = self.retry_after()
+        return AIServiceError(
+            code=ErrorCode.STT_UNAVAILABLE,
+            message="STT 요청이 많습니다. 잠시 후 다시 시도해주세요",
+            status_code=503,
+            details={"retry_after": retry_after, "limit": int(self.limit)}
+        )
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting up to queue_timeout for one
+
+        Raises:
+            AIServiceError: 503 (with retry_after) if no slot frees up in time
+        """
+        self._bind_loop()
+        if self._has_slot() and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.queue_timeout <= 0:
+            raise self._rejected("full")
+
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not (waiter.done() and not waiter.cancelled()):
+                raise self._rejected("queue_timeout")
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1  # slot was handed over as we were cancelled
+                self._wake()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        metrics.observe("stt_limiter_wait_seconds", time.perf_counter() - start_time)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters, oldest first (the slot moves with the wake-up)"""
+        while self._waiters and self._has_slot():
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def release(self) -> None:
+        """Give a slot back without a congestion signal (4xx, cancelled)"""
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency: float) -> None:
+        self.in_flight -= 1
+        stable = self.latency == 0 or latency <= self.latency * self.latency_tolerance
+        self.latency = latency if self.latency == 0 else (
+            self.latency + LATENCY_EWMA_ALPHA * (latency - self.latency)
+        )
+        if stable and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_congestion(self) -> None:
+        """Timeout, connection error or 5xx"""
+        self.in_flight -= 1
+        now = time.monotonic()
+        if now - self._last_decrease >= self.latency:
+            previous = int(self.limit)
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_decrease = now
+            metrics.inc("stt_limiter_decreases")
+            logger.warning("stt_concurrency_decreased", previous=previous, limit=int(self.limit))
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator["_Slot"]:
+        """Hold a slot for one request; report its outcome on the yielded handle"""
+        await self.acquire()
+        handle = _Slot(self)
+        try:
+            yield handle
+        finally:
+            handle.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency": round(self.latency, 3),
+        }
+
+
+class _Slot:
+    """One held slot; released once with the outcome of its request"""
+
+    def __init__(self, limiter: AdaptiveLimiter):
+        self.limiter = limiter
+        self.start_time = time.perf_counter()
+        self._done = False
+
+    def succeeded(self) -> None:
+        if not self._done:
+            self._done = True
+            self.limiter.on_success(time.perf_counter() - self.start_time)
+
+    def congested(self) -> None:
+        if not self._done:
+            self._done = True
+            self.limiter.on_congestion()
+
+    def close(self) -> None:
+        if not self._done:
+            self._done = True
+            self.limiter.release()
+
+
+@lru_cache
+def get_stt_limiter() -> AdaptiveLimiter:
+    """Get the process-wide STT concurrency limiter"""
+    settings = get_settings()
+    limiter = AdaptiveLimiter(
+        initial=settings.stt_concurrency_initial,
+        min_limit=settings.stt_concurrency_min,
+        max_limit=settings.stt_concurrency_max,
+        backoff=settings.stt_concurrency_backoff,
+        latency_tolerance=settings.stt_concurrency_latency_tolerance,
+        queue_timeout=settings.stt_concurrency_queue_timeout,
+    )
+    metrics.register_collector("stt_concurrency", limiter.stats)
+    return limiter
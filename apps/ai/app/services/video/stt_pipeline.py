@@ -0,0 +1,461 @@
+"""STT pipeline - preprocessing stages in front of the STT API
+
+audio -> validate -> transcript cache (content hash) -> decode + trim
+silence (VAD) -> split into overlapping chunks -> STTClient.transcribe per
+chunk (concurrently) -> stitch -> remap timestamps to original time
+
+Without ffmpeg (or if it can't decode the input) the audio is uploaded in
+one request, normalized if possible. YouTube videos go through
+transcribe_video(), which checks the cache by video id, then uses the
+video's own captions if it has any (captions), and otherwise has ffmpeg
+read the audio from its media URL (or downloads it when streaming isn't
+possible); both go through the same VAD / chunking path.
+Stages are reported via stt_progress for the job API.
+
+max_seconds (preview) transcribes only the start of the audio: ffmpeg
+stops after that much (-t) when decoding, normalizing or streaming, a
+YouTube download fetches only that range, and the result is marked
+partial so the full transcript can be requested later.
+"""
+
+import asyncio
+import time
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode, STTError
+from app.core.metrics import metrics
+from app.models import STTResponse
+from app.services.video.audio_normalizer import find_ffmpeg, normalize_audio, record_normalized, upload_format
+from app.services.video.audio_stream import FFmpegStreamSource
+from app.services.video.captions import fetch_captions
+from app.services.video.multipart_stream import AudioSource, BytesSource
+from app.services.video.stt_chunking import plan_chunks, stitch_chunks
+from app.services.video.stt_client import STTClient
+from app.services.video.stt_progress import DOWNLOADING, TRANSCODING, TRANSCRIBING, report_progress
+from app.services.video.transcript_cache import (
+    content_cache_key,
+    get_transcript_cache,
+    hash_source,
+    video_cache_key,
+)
+from app.services.video.vad import DecodedAudio, decode_audio
+from app.services.video.youtube_audio import AudioStream, YouTubeAudioDownloader
+
+logger = structlog.get_logger()
+
+# Decoded audio this close to max_seconds was cut by ffmpeg -t
+PREVIEW_TOLERANCE_SECONDS = 0.1
+
+
+def _stem(filename: str) -> str:
+    return filename.rsplit(".", 1)[0] if "." in filename else filename
+
+
+async def _transcribe_single(
+    stt_client: STTClient,
+    audio: AudioSource,
+    filename: str,
+    language: str,
+    content_type: str | None,
+    file_size: int | None,
+    max_seconds: int | None = None
+) -> STTResponse:
+    """One request with the normalized (or original) audio, cut to max_seconds"""
+    report_progress(TRANSCODING)
+    normalized = await normalize_audio(audio, file_size, max_seconds)
+    report_progress(TRANSCRIBING, chunks_done=0, chunks_total=1)
+    if normalized is None:
+        return await stt_client.transcribe(
+            audio_data=audio,
+            filename=filename,
+            language=language,
+            content_type=content_type,
+            file_size=file_size
+        )
+
+    try:
+        return await stt_client.transcribe(
+            audio_data=normalized,
+            filename=f"{_stem(filename)}.{normalized.extension}",
+            language=language,
+            content_type=normalized.content_type,
+            file_size=normalized.size
+        )
+    finally:
+        normalized.close()
+
+
+async def _transcribe_chunked(
+    stt_client: STTClient,
+    decoded: DecodedAudio,
+    filename: str,
+    language: str,
+    file_size: int | None
+) -> STTResponse:
+    """Transcribe overlapping chunks concurrently and stitch the results"""
+    settings = get_settings()
+    start_time = time.perf_counter()
+    windows = plan_chunks(
+        decoded.offset_map.trimmed_duration,
+        settings.stt_chunk_seconds,
+        settings.stt_chunk_overlap_seconds,
+    )
+    semaphore = asyncio.Semaphore(settings.stt_chunk_concurrency)
+    uploaded_bytes = 0
+    chunks_done = 0
+    report_progress(TRANSCRIBING, chunks_done=0, chunks_total=len(windows))
+
+    logger.info(
+        "stt_chunks_planned",
+        duration=round(decoded.duration, 1),
+        trimmed_seconds=round(decoded.trimmed_seconds, 1),
+        chunks=len(windows),
+        concurrency=settings.stt_chunk_concurrency
+    )
+
+    async def transcribe_chunk(idx: int, start: float, end: float) -> STTResponse:
+        nonlocal uploaded_bytes, chunks_done
+        async with semaphore:
+            chunk_start = time.perf_counter()
+            encoded = await decoded.encode(start, end)
+            if encoded is None:
+                raise STTError(
+                    message="오디오를 변환할 수 없습니다",
+                    details={"chunk": idx}
+                )
+            try:
+                name = _stem(filename) if len(windows) == 1 else f"{_stem(filename)}.part{idx}"
+                result = await stt_client.transcribe(
+                    audio_data=encoded,
+                    filename=f"{name}.{encoded.extension}",
+                    language=language,
+                    content_type=encoded.content_type,
+                    file_size=encoded.size
+                )
+                uploaded_bytes += encoded.size
+            finally:
+                encoded.close()
+            metrics.observe("stt_chunk_seconds", time.perf_counter() - chunk_start)
+            chunks_done += 1
+            report_progress(TRANSCRIBING, chunks_done=chunks_done, chunks_total=len(windows))
+            return result
+
+    tasks = [
+        asyncio.create_task(transcribe_chunk(idx, start, end))
+        for idx, (start, end) in enumerate(windows)
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    if file_size:
+        record_normalized(
+            file_size,
+            uploaded_bytes,
+            time.perf_counter() - start_time,
+            chunks=len(windows),
+            trimmed_seconds=round(decoded.trimmed_seconds, 1)
+        )
+    metrics.observe("stt_chunks", len(windows))
+
+    # Stitch in trimmed time, then map back to original time
+    result = stitch_chunks(windows, results)
+    return result.model_copy(update={"segments": decoded.offset_map.remap_segments(result.segments)})
+
+
+def _decoding_enabled() -> bool:
+    """Whether audio is decoded for VAD / chunking before upload"""
+    settings = get_settings()
+    return settings.stt_normalize_audio and (settings.stt_vad_enabled or settings.stt_chunk_seconds > 0)
+
+
+def _exceeds(duration: float | None, max_seconds: int | None) -> bool:
+    return bool(max_seconds and duration and duration > max_seconds)
+
+
+def limit_transcript(result: STTResponse, max_seconds: int | None, cut: bool = False) -> STTResponse:
+    """
+    Keep the first max_seconds of a transcript
+
+    Segments past the limit are dropped (sources that couldn't be cut,
+    captions). The result is marked partial if anything was dropped or
+    the audio itself was cut (cut).
+    """
+    if not max_seconds:
+        return result
+    segments = [
+        seg if seg.end <= max_seconds else seg.model_copy(update={"end": float(max_seconds)})
+        for seg in result.segments
+        if seg.start < max_seconds
+    ]
+    dropped = any(seg.end > max_seconds for seg in result.segments)
+    if not (cut or dropped):
+        return result
+    text = " ".join(seg.text.strip() for seg in segments) if dropped else result.text
+    return result.model_copy(update={"text": text, "segments": segments, "partial": True})
+
+
+async def transcribe_audio(
+    audio: bytes | AudioSource,
+    filename: str,
+    language: str = "auto",
+    content_type: str | None = None,
+    file_size: int | None = None,
+    max_seconds: int | None = None
+) -> STTResponse:
+    """
+    Transcribe audio through the preprocessing pipeline
+
+    Args:
+        audio: Audio bytes or an async readable source (UploadFile)
+        filename: Original filename
+        language: Language hint ("auto" for auto-detection)
+        content_type: MIME type of the file
+        file_size: Source size in bytes, if known
+        max_seconds: Transcribe only the first max_seconds (preview)
+
+    Raises:
+        ValidationError: If file validation fails
+        STTError: If STT API call fails
+    """
+    if isinstance(audio, bytes):
+        audio = BytesSource(audio)
+        file_size = audio.size
+
+    stt_client = STTClient()
+    # Reject bad input before spending time on hashing/transcoding
+    stt_client.validate_file(file_size, filename, content_type)
+
+    cache = get_transcript_cache()
+    cache_key = None
+    if cache.enabled:
+        cache_key = content_cache_key(await hash_source(audio), language, max_seconds)
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    result = await _transcribe_uncached(
+        stt_client, audio, filename, language, content_type, file_size, max_seconds
+    )
+
+    if cache_key is not None:
+        await cache.put(cache_key, result)
+    return result
+
+
+async def _transcribe_uncached(
+    stt_client: STTClient,
+    audio: AudioSource,
+    filename: str,
+    language: str,
+    content_type: str | None,
+    file_size: int | None,
+    max_seconds: int | None
+) -> STTResponse:
+    """
+    Chunked path when ffmpeg can decode the audio, single request otherwise
+
+    Both paths cut the audio to max_seconds with ffmpeg; only an original
+    uploaded as-is (no ffmpeg) is transcribed in full and has its later
+    segments dropped.
+    """
+    result = await _transcribe_decoded(stt_client, audio, filename, language, file_size, max_seconds)
+    if result is None:
+        result = await _transcribe_single(
+            stt_client, audio, filename, language, content_type, file_size, max_seconds
+        )
+        result = limit_transcript(result, max_seconds)
+    return result
+
+
+async def _transcribe_decoded(
+    stt_client: STTClient,
+    audio: AudioSource,
+    filename: str,
+    language: str,
+    file_size: int | None,
+    max_seconds: int | None
+) -> STTResponse | None:
+    """
+    Decode, trim silence, transcribe in chunks and remap timestamps
+
+    Returns:
+        The transcript, or None if decoding is off or ffmpeg can't decode
+        the audio (caller uploads it in one request)
+    """
+    if not _decoding_enabled():
+        return None
+    report_progress(TRANSCODING)
+    decoded = await decode_audio(audio, file_size, max_seconds)
+    if decoded is None:
+        return None
+
+    try:
+        result = await _transcribe_chunked(stt_client, decoded, filename, language, file_size)
+    finally:
+        decoded.close()
+    cut = bool(max_seconds) and decoded.duration >= max_seconds - PREVIEW_TOLERANCE_SECONDS
+    return limit_transcript(result, max_seconds, cut)
+
+
+def _video_unavailable_error(
+    downloader: YouTubeAudioDownloader,
+    video_id: str,
+    duration: int | None,
+    max_seconds: int | None = None
+) -> AIServiceError:
+    if duration and not downloader.is_within_limit(duration, max_seconds):
+        duration_minutes = duration / 60
+        max_minutes = downloader.max_duration_minutes
+        return AIServiceError(
+            code=ErrorCode.AUDIO_TOO_LONG,
+            message=f"영상 길이({int(duration_minutes)}분)가 최대 허용 시간({max_minutes}분)을 초과했습니다. 더 짧은 영상을 시도해주세요!",
+            status_code=422,
+            details={
+                "video_id": video_id,
+                "duration_minutes": round(duration_minutes, 1),
+                "max_duration_minutes": max_minutes
+            }
+        )
+    return AIServiceError(
+        code=ErrorCode.STT_ERROR,
+        message="영상 오디오를 다운로드할 수 없습니다. 영상이 비공개이거나 접근이 제한되었을 수 있습니다.",
+        status_code=400,
+        details={"video_id": video_id}
+    )
+
+
+async def _transcribe_stream(
+    ffmpeg: str,
+    stream: AudioStream,
+    video_id: str,
+    language: str,
+    max_seconds: int | None
+) -> STTResponse:
+    """
+    ffmpeg reads the media URL itself - nothing is downloaded by yt-dlp
+
+    With VAD or chunking on, ffmpeg decodes the URL to PCM and the audio
+    goes through the same trim / chunk / remap path as a download, so long
+    videos are split into requests that fit timeout_stt. Otherwise its
+    encoded output is uploaded as one request while it is produced.
+    """
+    start_time = time.perf_counter()
+    stt_client = STTClient()
+    source = FFmpegStreamSource(
+        ffmpeg, stream.url, upload_format(), stream.http_headers, max_seconds=max_seconds
+    )
+    filename = f"{video_id}.{source.extension}"
+    try:
+        result = await _transcribe_decoded(stt_client, source, filename, language, None, max_seconds)
+        decoded = result is not None
+        if result is None:
+            report_progress(TRANSCRIBING, chunks_done=0, chunks_total=1)
+            result = await stt_client.transcribe(
+                audio_data=source,
+                filename=filename,
+                language=language,
+                content_type=source.content_type
+            )
+    finally:
+        await source.close()
+
+    if source.bytes_read:
+        metrics.observe("stt_audio_bytes", source.bytes_read, stage="streamed")
+    logger.info(
+        "stt_video_streamed",
+        video_id=video_id,
+        duration=stream.duration,
+        decoded=decoded,
+        uploaded_bytes=source.bytes_read,
+        ffmpeg_starts=source.starts,
+        elapsed=round(time.perf_counter() - start_time, 2)
+    )
+    return limit_transcript(result, max_seconds, _exceeds(stream.duration, max_seconds))
+
+
+async def transcribe_video(
+    video_id: str,
+    language: str = "auto",
+    max_seconds: int | None = None
+) -> STTResponse:
+    """
+    Transcribe a YouTube video's audio
+
+    The transcript cache is checked by (video_id, language) first, then
+    the video's captions (no duration limit, see captions). With
+    STT_VIDEO_STREAMING and ffmpeg available ffmpeg reads the audio from
+    its media URL (no yt-dlp download); otherwise it is downloaded. Either
+    way it goes through the full pipeline (VAD, chunking). max_seconds
+    transcribes only the start of the video; the duration limit then
+    applies to that part only.
+
+    Raises:
+        AIServiceError: If the video is too long (422) or can't be downloaded (400)
+        STTError: If STT API call fails
+    """
+    cache = get_transcript_cache()
+    cache_key = video_cache_key(video_id, language, max_seconds)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    report_progress(DOWNLOADING)
+    downloader = YouTubeAudioDownloader()
+
+    if get_settings().stt_captions_enabled:
+        info = await downloader.get_video_info(video_id)
+        if info is None:
+            raise _video_unavailable_error(downloader, video_id, None)
+        result = await fetch_captions(info, language)
+        if result is not None:
+            result = limit_transcript(result, max_seconds, _exceeds(info.get("duration"), max_seconds))
+            await cache.put(cache_key, result)
+            return result
+
+    ffmpeg = find_ffmpeg() if get_settings().stt_video_streaming else None
+    if ffmpeg:
+        stream, duration = await downloader.resolve_audio_stream(video_id, max_seconds)
+        if stream is not None:
+            result = await _transcribe_stream(ffmpeg, stream, video_id, language, max_seconds)
+            await cache.put(cache_key, result)
+            return result
+        if duration is None or not downloader.is_within_limit(duration, max_seconds):
+            raise _video_unavailable_error(downloader, video_id, duration, max_seconds)
+        # No single audio URL - download instead
+
+    audio, duration = await downloader.download_audio(video_id, max_seconds)
+    if audio is None:
+        raise _video_unavailable_error(downloader, video_id, duration, max_seconds)
+
+    logger.info(
+        "stt_video_audio_downloaded",
+        video_id=video_id,
+        size_mb=round(audio.size / 1024 / 1024, 2),
+        duration=duration
+    )
+
+    # Stream the downloaded file instead of loading it into memory
+    with audio:
+        source = audio.open()
+        try:
+            result = await transcribe_audio(
+                audio=source,
+                filename=f"{video_id}.{audio.extension}",
+                language=language,
+                content_type=audio.content_type,
+                file_size=audio.size,
+                max_seconds=max_seconds
+            )
+        finally:
+            source.close()
+
+    result = limit_transcript(result, max_seconds, _exceeds(duration, max_seconds))
+    await cache.put(cache_key, result)
+    return result
@@ -0,0 +1,37 @@
+"""Stage progress reporting for STT work
+
+Pipeline stages call report_progress(); whoever runs the work (the STT job
+worker) installs a callback with progress_callback(). The callback lives in
+a contextvar, so tasks spawned by the pipeline (chunk uploads) inherit it
+and code running outside a job reports into the void.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+# Stages in pipeline order
+DOWNLOADING = "downloading"
+TRANSCODING = "transcoding"
+TRANSCRIBING = "transcribing"
+
+ProgressCallback = Callable[..., None]
+
+_callback: ContextVar[ProgressCallback | None] = ContextVar("stt_progress_callback", default=None)
+
+
+def report_progress(stage: str, **details: int) -> None:
+    """Report the current stage (details: chunks_done / chunks_total)"""
+    callback = _callback.get()
+    if callback is not None:
+        callback(stage, **details)
+
+
+@contextmanager
+def progress_callback(callback: ProgressCallback) -> Iterator[None]:
+    """Send report_progress() calls in this context to callback"""
+    token = _callback.set(callback)
+    try:
+        yield
+    finally:
+        _callback.reset(token)
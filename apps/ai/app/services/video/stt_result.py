@@ -0,0 +1,89 @@
+"""Fast construction of large STT results
+
+WhisperX returns thousands of segments for long audio. Building each with
+STTSegment(**seg) runs field validation and the validate_timestamps model
+validator per segment, in Python, on the event loop. Instead the
+timestamps of all segments are checked at once with numpy and the models
+are built with model_construct (no validation). Anything the vectorized
+check can't vouch for - a missing key, a non-string text, a negative or
+reversed timestamp - goes through normal validation, so bad input fails
+exactly as before.
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+import structlog
+
+from app.core.metrics import metrics
+from app.models import STTResponse, STTSegment
+
+logger = structlog.get_logger()
+
+
+def construct_segments(
+    starts: Sequence[Any],
+    ends: Sequence[Any],
+    texts: Sequence[Any]
+) -> list[STTSegment] | None:
+    """
+    Segments built without per-item validation
+
+    Returns:
+        The segments, or None if any of them would fail STTSegment
+        validation (the caller validates normally then)
+    """
+    if not all(type(t) is str for t in texts):
+        return None
+    try:
+        start_array = np.asarray(starts, dtype=np.float64)
+        end_array = np.asarray(ends, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if start_array.shape != end_array.shape or start_array.ndim != 1:
+        return None
+    # NaN compares False, so it is rejected here too
+    if not (np.all(start_array >= 0) and np.all(end_array >= start_array)):
+        return None
+
+    construct = STTSegment.model_construct
+    return [
+        construct(start=start, end=end, text=text)
+        for start, end, text in zip(start_array.tolist(), end_array.tolist(), texts)
+    ]
+
+
+def build_stt_response(result: dict[str, Any], language: str) -> STTResponse:
+    """
+    STTResponse from a parsed WhisperX result
+
+    Args:
+        result: Parsed /whisperX/transcribe JSON
+        language: Requested language, used if the result has none
+    """
+    raw_segments = result.get("segments") or []
+    segments = None
+    try:
+        segments = construct_segments(
+            [seg["start"] for seg in raw_segments],
+            [seg["end"] for seg in raw_segments],
+            [seg["text"] for seg in raw_segments],
+        )
+    except (KeyError, TypeError):
+        pass
+
+    if segments is None:
+        metrics.inc("stt_result_build", path="validated")
+        logger.debug("stt_result_validated", segments_count=len(raw_segments))
+        segments = [STTSegment(**seg) for seg in raw_segments]
+    else:
+        metrics.inc("stt_result_build", path="trusted")
+
+    # Top-level fields are few; validate them normally, then attach segments
+    response = STTResponse(
+        text=result.get("text", ""),
+        language=result.get("language", language),
+        language_probability=result.get("language_probability", 1.0),
+        segments=[],
+    )
+    return response.model_copy(update={"segments": segments})
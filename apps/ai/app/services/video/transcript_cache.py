@@ -0,0 +1,242 @@
+"""Persistent transcript cache
+
+STT is by far the most expensive stage, so finished transcripts are kept
+in a local SQLite file, keyed by
+
+- (video_id, language)          for /stt/video/{video_id}
+- (sha256 of audio, language)   for uploaded files
+
+Entries are stored compactly (short-key JSON, zlib-compressed), expire
+after transcript_cache_ttl_hours and are evicted least-recently-used once
+the store exceeds transcript_cache_max_mb.
+
+The cache is off until transcript_cache_path names a file on a persistent
+volume: /tmp does not survive a restart, and on Cloud Run it is RAM that
+counts against the container's memory limit.
+"""
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.models import STTResponse, STTSegment
+from app.services.video.audio_normalizer import read_source
+from app.services.video.multipart_stream import AudioSource, backing_file
+from app.services.video.stt_result import construct_segments
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcripts_accessed_at ON transcripts (accessed_at);
+"""
+
+
+def _preview_suffix(max_seconds: int | None) -> str:
+    return f":{max_seconds}s" if max_seconds else ""
+
+
+def video_cache_key(video_id: str, language: str, max_seconds: int | None = None) -> str:
+    return f"video:{video_id}:{language}{_preview_suffix(max_seconds)}"
+
+
+def content_cache_key(digest: str, language: str, max_seconds: int | None = None) -> str:
+    return f"sha256:{digest}:{language}{_preview_suffix(max_seconds)}"
+
+
+def _hash_file(file) -> str:
+    """sha256 of a file on disk through mmap (one C call, GIL released)"""
+    file.flush()
+    fd = file.fileno()
+    if os.fstat(fd).st_size == 0:
+        return hashlib.sha256().hexdigest()
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        return hashlib.sha256(mapped).hexdigest()
+
+
+async def hash_source(source: AudioSource) -> str:
+    """sha256 of an audio source (source is rewound)"""
+    file = backing_file(source)
+    if file is not None:
+        digest = await asyncio.to_thread(_hash_file, file)
+        await source.seek(0)
+        return digest
+
+    digest = hashlib.sha256()
+    async for chunk in read_source(source):
+        digest.update(chunk)
+    await source.seek(0)
+    return digest.hexdigest()
+
+
+def encode_transcript(response: STTResponse) -> bytes:
+    """Compact form: short keys, segments as [start, end, text] rows"""
+    payload = {
+        "t": response.text,
+        "l": response.language,
+        "p": response.language_probability,
+        "s": [[seg.start, seg.end, seg.text] for seg in response.segments],
+        "src": response.source,
+        "pt": response.partial,
+    }
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def decode_transcript(data: bytes) -> STTResponse:
+    payload = json.loads(zlib.decompress(data))
+    columns = list(zip(*payload["s"])) or [(), (), ()]
+    segments = construct_segments(*columns)
+    if segments is None:
+        segments = [STTSegment(start=s, end=e, text=t) for s, e, t in payload["s"]]
+    response = STTResponse(
+        text=payload["t"],
+        language=payload["l"],
+        language_probability=payload["p"],
+        segments=[],
+        source=payload.get("src", "stt"),
+        partial=payload.get("pt", False),
+    )
+    return response.model_copy(update={"segments": segments})
+
+
+class TranscriptCache:
+    """
+    SQLite-backed LRU + TTL store (blocking calls run in worker threads)
+
+    path=None gives a disabled cache that always misses.
+    """
+
+    def __init__(self, path: str | None, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if path is None:
+            return
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("transcript_cache_unavailable", path=path, error=str(e))
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def _get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, created_at FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE transcripts SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return data
+
+    def _put(self, key: str, data: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, data, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            self._conn.execute("DELETE FROM transcripts WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the store fits max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM transcripts ORDER BY accessed_at ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            metrics.inc("transcript_cache_evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    async def get(self, key: str) -> STTResponse | None:
+        """Cached transcript, or None on miss/expiry/error"""
+        if not self.enabled:
+            return None
+        kind = key.split(":", 1)[0]
+        try:
+            data = await asyncio.to_thread(self._get, key)
+            result = decode_transcript(data) if data is not None else None
+        except (sqlite3.Error, ValueError, zlib.error, KeyError) as e:
+            logger.warning("transcript_cache_read_failed", key=key, error=str(e))
+            result = None
+
+        metrics.inc("transcript_cache_lookups", kind=kind, result="hit" if result else "miss")
+        logger.info("transcript_cache_lookup", key=key, hit=result is not None)
+        return result
+
+    async def put(self, key: str, response: STTResponse) -> None:
+        """Store a transcript (errors are logged, never raised)"""
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._put, key, encode_transcript(response))
+        except sqlite3.Error as e:
+            logger.warning("transcript_cache_write_failed", key=key, error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+        return {"enabled": True, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+
+@lru_cache
+def get_transcript_cache() -> TranscriptCache:
+    """Get the process-wide transcript cache (cache_clear() to reopen)"""
+    settings = get_settings()
+    cache = TranscriptCache(
+        (settings.transcript_cache_path or None) if settings.transcript_cache_enabled else None,
+        max_bytes=settings.transcript_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.transcript_cache_ttl_hours * 3600,
+    )
+    metrics.register_collector("transcript_cache", cache.stats)
+    return cache
@@ -0,0 +1,330 @@
+"""PCM decoding and voice-activity-based silence trimming before STT
+
+Audio is decoded to 16 kHz mono PCM with ffmpeg and scored per 30 ms frame
+by RMS energy (NumPy). Long stretches below the speech threshold are cut;
+windows of the remaining speech are encoded to the upload format on
+demand, and an OffsetMap translates STT timestamps from trimmed time back
+to original time.
+
+The detector is energy-based: it removes silence and very quiet passages,
+not loud music. Without ffmpeg the stage is skipped and plain
+normalization runs instead.
+"""
+
+import asyncio
+import bisect
+import tempfile
+import time
+from typing import AsyncIterator
+
+import numpy as np
+import structlog
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.models import STTSegment
+from app.services.video.audio_normalizer import (
+    FFMPEG_INPUT_ARGS,
+    TARGET_SAMPLE_RATE,
+    NormalizedAudio,
+    ffmpeg_input,
+    ffmpeg_limit_args,
+    ffmpeg_output_args,
+    find_ffmpeg,
+    run_ffmpeg,
+    upload_format,
+)
+from app.services.video.multipart_stream import AudioSource, CHUNK_SIZE
+from app.services.video.scratch import get_scratch_space
+
+logger = structlog.get_logger()
+
+FRAME_SECONDS = 0.03
+FRAME_SAMPLES = int(TARGET_SAMPLE_RATE * FRAME_SECONDS)
+BYTES_PER_SAMPLE = 2  # s16le
+# Frames quieter than this are never speech, whatever the noise floor
+ABSOLUTE_SILENCE_DB = -60.0
+# Percentile of frame energies taken as the noise floor
+NOISE_FLOOR_PERCENTILE = 10
+
+
+class OffsetMap:
+    """
+    Maps timestamps in trimmed audio back to original time
+
+    spans are the kept (original_start, original_end) ranges in seconds,
+    laid end to end in the trimmed audio.
+    """
+
+    def __init__(self, spans: list[tuple[float, float]]):
+        self.spans = spans
+        self._trimmed_starts: list[float] = []
+        position = 0.0
+        for start, end in spans:
+            self._trimmed_starts.append(position)
+            position += end - start
+        self.trimmed_duration = position
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """
+        Convert a trimmed-audio time to original time
+
+        At a span boundary, starts map to the next span and ends to the
+        previous one, so a segment never stretches across a cut.
+        """
+        if not self.spans:
+            return t
+        find = bisect.bisect_left if is_end else bisect.bisect_right
+        idx = max(0, find(self._trimmed_starts, t) - 1)
+        start, end = self.spans[idx]
+        offset = max(0.0, t - self._trimmed_starts[idx])
+        if idx < len(self.spans) - 1:
+            offset = min(offset, end - start)
+        return round(start + offset, 3)
+
+    def window(self, start: float, end: float) -> list[tuple[float, float]]:
+        """Original-time spans covering the trimmed-time window [start, end)"""
+        result = []
+        for (span_start, span_end), trimmed_start in zip(self.spans, self._trimmed_starts):
+            trimmed_end = trimmed_start + (span_end - span_start)
+            lo, hi = max(start, trimmed_start), min(end, trimmed_end)
+            if hi > lo:
+                result.append((span_start + lo - trimmed_start, span_start + hi - trimmed_start))
+        return result
+
+    def remap_segments(self, segments: list[STTSegment]) -> list[STTSegment]:
+        remapped = []
+        for seg in segments:
+            start = self.to_original(seg.start)
+            end = max(start, self.to_original(seg.end, is_end=True))
+            remapped.append(seg.model_copy(update={"start": start, "end": end}))
+        return remapped
+
+
+class _EnergyMeter:
+    """Per-frame RMS energy (dBFS) of a streamed s16le PCM signal"""
+
+    def __init__(self):
+        self._rest = b""
+        self._blocks: list[np.ndarray] = []
+
+    def feed(self, chunk: bytes) -> None:
+        data = self._rest + chunk
+        usable = len(data) - len(data) % (FRAME_SAMPLES * BYTES_PER_SAMPLE)
+        self._rest = data[usable:]
+        if not usable:
+            return
+        frames = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, FRAME_SAMPLES).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        self._blocks.append(20 * np.log10(np.maximum(rms, 1.0) / 32768.0))
+
+    def energies(self) -> np.ndarray:
+        return np.concatenate(self._blocks) if self._blocks else np.zeros(0, dtype=np.float32)
+
+
+def detect_speech(
+    energies_db: np.ndarray,
+    threshold_db: float,
+    min_silence_seconds: float,
+    padding_seconds: float,
+) -> list[tuple[float, float]]:
+    """
+    Find speech spans from per-frame energies
+
+    A frame is speech if it is threshold_db above the noise floor. Silent
+    runs of at least min_silence_seconds are cut, keeping padding_seconds
+    of context on each side. Returns (start, end) spans in seconds.
+    """
+    total = len(energies_db) * FRAME_SECONDS
+    if len(energies_db) == 0:
+        return []
+
+    noise_floor = float(np.percentile(energies_db, NOISE_FLOOR_PERCENTILE))
+    threshold = max(noise_floor + threshold_db, ABSOLUTE_SILENCE_DB)
+    voiced = energies_db > threshold
+    if not voiced.any():
+        return [(0.0, round(total, 3))]
+
+    # Runs of silent frames: starts where voiced goes 1->0, ends where 0->1
+    edges = np.diff(np.concatenate(([1], voiced.astype(np.int8), [1])))
+    silence_starts = np.flatnonzero(edges == -1)
+    silence_ends = np.flatnonzero(edges == 1)
+
+    min_frames = int(round(min_silence_seconds / FRAME_SECONDS))
+    spans: list[tuple[float, float]] = []
+    position = 0.0
+    for s, e in zip(silence_starts, silence_ends):
+        if e - s < min_frames:
+            continue
+        cut_start = float(s) * FRAME_SECONDS + (padding_seconds if s > 0 else 0.0)
+        cut_end = float(e) * FRAME_SECONDS - (padding_seconds if e < len(voiced) else 0.0)
+        if cut_end <= cut_start:
+            continue
+        if cut_start > position:
+            spans.append((round(position, 3), round(cut_start, 3)))
+        position = cut_end
+
+    if position < total:
+        spans.append((round(position, 3), round(total, 3)))
+    return spans
+
+
+def _skip(reason: str, **details) -> None:
+    metrics.inc("stt_vad_skipped", reason=reason)
+    logger.warning("vad_skipped", reason=reason, **details)
+
+
+class DecodedAudio:
+    """
+    Decoded 16 kHz mono PCM plus the speech spans to keep
+
+    Windows of the trimmed timeline are encoded on demand, so long audio
+    can be uploaded as several chunks. Reads from the PCM spool are
+    serialized, so concurrent encodes are safe.
+    """
+
+    def __init__(
+        self,
+        pcm: tempfile.SpooledTemporaryFile,
+        ffmpeg: str,
+        offset_map: OffsetMap,
+        duration: float,
+    ):
+        self._pcm = pcm
+        self._ffmpeg = ffmpeg
+        self._lock = asyncio.Lock()
+        self.offset_map = offset_map
+        self.duration = duration
+        self.trimmed_seconds = max(0.0, duration - offset_map.trimmed_duration)
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        self._pcm.seek(offset)
+        return self._pcm.read(size)
+
+    async def _read_spans(self, spans: list[tuple[float, float]]) -> AsyncIterator[bytes]:
+        """Stream the PCM byte ranges covered by spans"""
+        for start, end in spans:
+            offset = int(round(start * TARGET_SAMPLE_RATE)) * BYTES_PER_SAMPLE
+            end_offset = int(round(end * TARGET_SAMPLE_RATE)) * BYTES_PER_SAMPLE
+            while offset < end_offset:
+                async with self._lock:
+                    chunk = await asyncio.to_thread(self._read_at, offset, min(CHUNK_SIZE, end_offset - offset))
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+
+    async def encode(self, start: float = 0.0, end: float | None = None) -> NormalizedAudio | None:
+        """
+        Encode a window of the trimmed timeline to the upload format
+
+        Returns:
+            NormalizedAudio, or None if ffmpeg fails
+        """
+        settings = get_settings()
+        end = self.offset_map.trimmed_duration if end is None else end
+        spans = self.offset_map.window(start, end)
+
+        output = upload_format()
+        encoded = get_scratch_space().spool()
+        args = [
+            self._ffmpeg, *FFMPEG_INPUT_ARGS,
+            "-f", "s16le", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE), "-i", "pipe:0",
+            *ffmpeg_output_args(output),
+        ]
+        try:
+            returncode, stderr, _ = await run_ffmpeg(
+                args, self._read_spans(spans), encoded.write, settings.stt_normalize_timeout
+            )
+        except BaseException:
+            encoded.close()
+            raise
+
+        if returncode != 0 or encoded.tell() == 0:
+            encoded.close()
+            _skip("encode_error", returncode=returncode, stderr=stderr.decode(errors="replace")[-500:])
+            return None
+
+        size = encoded.tell()
+        encoded.seek(0)
+        return NormalizedAudio(encoded, size, output)
+
+    def close(self) -> None:
+        self._pcm.close()
+
+
+async def decode_audio(
+    source: AudioSource,
+    input_size: int | None = None,
+    max_seconds: float | None = None
+) -> DecodedAudio | None:
+    """
+    Decode audio to PCM and find the speech spans (VAD)
+
+    With STT_VAD_ENABLED off the whole timeline is kept. max_seconds
+    decodes only the start of the audio (ffmpeg stops reading the input).
+
+    Returns:
+        DecodedAudio, or None if ffmpeg is missing or can't decode the
+        input (caller falls back to plain normalization)
+    """
+    settings = get_settings()
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        _skip("ffmpeg_missing")
+        return None
+
+    start_time = time.perf_counter()
+    pcm = get_scratch_space().spool()
+    meter = _EnergyMeter()
+
+    def on_pcm(chunk: bytes) -> None:
+        pcm.write(chunk)
+        if settings.stt_vad_enabled:
+            meter.feed(chunk)
+
+    input_args, chunks, pass_fds = await ffmpeg_input(source)
+    decode_args = [
+        ffmpeg, *FFMPEG_INPUT_ARGS, *input_args,
+        "-vn", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+        *ffmpeg_limit_args(max_seconds), "-f", "s16le", "pipe:1",
+    ]
+    try:
+        returncode, stderr, _ = await run_ffmpeg(
+            decode_args, chunks, on_pcm, settings.stt_normalize_timeout, pass_fds
+        )
+    except asyncio.TimeoutError:
+        pcm.close()
+        _skip("timeout", timeout=settings.stt_normalize_timeout)
+        return None
+    except BaseException:
+        pcm.close()
+        raise
+
+    if returncode != 0 or pcm.tell() == 0:
+        pcm.close()
+        _skip("decode_error", returncode=returncode, stderr=stderr.decode(errors="replace")[-500:])
+        return None
+
+    duration = pcm.tell() / (TARGET_SAMPLE_RATE * BYTES_PER_SAMPLE)
+    spans = [(0.0, duration)]
+    if settings.stt_vad_enabled:
+        spans = detect_speech(
+            meter.energies(),
+            threshold_db=settings.stt_vad_threshold_db,
+            min_silence_seconds=settings.stt_vad_min_silence_seconds,
+            padding_seconds=settings.stt_vad_padding_seconds,
+        ) or spans
+
+    decoded = DecodedAudio(pcm, ffmpeg, OffsetMap(spans), duration)
+    metrics.observe("stt_vad_trimmed_seconds", decoded.trimmed_seconds)
+    metrics.observe("stt_vad_speech_ratio", decoded.offset_map.trimmed_duration / duration)
+    logger.info(
+        "audio_decoded",
+        input_size=input_size,
+        duration=round(duration, 1),
+        trimmed_seconds=round(decoded.trimmed_seconds, 1),
+        speech_spans=len(spans),
+        elapsed=round(time.perf_counter() - start_time, 2)
+    )
+    return decoded
@@ -1,18 +1,203 @@
-"""YouTube audio download service using yt-dlp"""
+"""YouTube audio download service using yt-dlp
+
+yt-dlp itself runs in the bounded worker pool (ytdlp_pool); only
+bookkeeping happens on the event loop. Each video is resolved once: the
+info from the duration check is cached per video_id and reused for the
+download (or for handing the media URL to ffmpeg, see audio_stream).
+Downloads are left on disk and handed out as a path for streaming.
+"""
 
 import tempfile
-import os
+import time
 import structlog
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 import yt_dlp
 
 from app.config import get_settings
+from app.core.exceptions import AIServiceError
+from app.core.metrics import metrics
+from app.services.video.audio_normalizer import find_ffmpeg
+from app.services.video.multipart_stream import FileSource
+from app.services.video.ytdlp_pool import get_ytdlp_pool
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Downloaded extension -> (extension sent to STT, content type)
+AUDIO_FORMATS = {
+    ".m4a": ("m4a", "audio/mp4"),
+    ".webm": ("webm", "audio/webm"),
+    ".mp3": ("mp3", "audio/mpeg"),
+    ".ogg": ("ogg", "audio/ogg"),
+    ".opus": ("ogg", "audio/ogg"),
+}
+
+
+def audio_format_selector() -> str:
+    """
+    yt-dlp format selector for STT audio
+
+    Speech recognition doesn't need music-quality audio, so the smallest
+    audio-only format at or above YTDLP_AUDIO_MIN_ABR (kbps) is used; if
+    every format is below the floor, the one closest to it (the best of
+    those). Formats without a known bitrate fall back to the smallest
+    audio-only format before the best one. YTDLP_AUDIO_FORMAT overrides
+    the selector entirely.
+    """
+    if settings.ytdlp_audio_format:
+        return settings.ytdlp_audio_format
+    if settings.ytdlp_audio_min_abr <= 0:
+        return 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best'
+    min_abr = settings.ytdlp_audio_min_abr
+    return f'worstaudio[abr>={min_abr}]/bestaudio[abr<{min_abr}]/worstaudio/bestaudio/best'
+
+
+def format_details(info: dict[str, Any]) -> dict[str, Any]:
+    """Selected format of an extracted info, for logs"""
+    return {
+        "format_id": info.get("format_id"),
+        "ext": info.get("ext"),
+        "acodec": info.get("acodec"),
+        "abr": info.get("abr"),
+        "filesize": info.get("filesize") or info.get("filesize_approx"),
+    }
+
+
+def _ydl_opts(
+    temp_dir: Optional[str] = None,
+    max_seconds: Optional[int] = None,
+    ffmpeg: Optional[str] = None
+) -> dict[str, Any]:
+    opts = {
+        'format': audio_format_selector(),
+        'quiet': True,
+        'no_warnings': True,
+        'extract_audio': True,
+        'noplaylist': True,
+        # Bypass age gate and bot detection
+        'age_limit': None,
+        'geo_bypass': True,
+        'nocheckcertificate': True,
+    }
+    if temp_dir is not None:
+        opts['outtmpl'] = str(Path(temp_dir) / 'audio.%(ext)s')
+    if max_seconds and ffmpeg:
+        # Preview: fetch only the first max_seconds (yt-dlp cuts with ffmpeg)
+        opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [(0, max_seconds)])
+        opts['ffmpeg_location'] = ffmpeg
+    return opts
+
+
+def extract_video_info(video_url: str) -> Optional[dict[str, Any]]:
+    """
+    Blocking yt-dlp info extraction, run on a pool worker
+
+    Returns:
+        Sanitized (picklable) info with the selected audio format, or None
+    """
+    with yt_dlp.YoutubeDL(_ydl_opts()) as ydl:
+        info = ydl.extract_info(video_url, download=False)
+        return ydl.sanitize_info(info) if info else None
+
+
+def download_from_info(
+    info: dict[str, Any],
+    temp_dir: str,
+    max_seconds: Optional[int] = None,
+    ffmpeg: Optional[str] = None
+) -> Optional[str]:
+    """
+    Blocking yt-dlp download, run on a pool worker
+
+    Downloads from an already extracted info, so the video isn't resolved
+    a second time. With max_seconds and ffmpeg only the start of the audio
+    is downloaded.
+
+    Returns:
+        Path of the audio file, or None if nothing was written
+    """
+    with yt_dlp.YoutubeDL(_ydl_opts(temp_dir, max_seconds, ffmpeg)) as ydl:
+        result = ydl.process_ie_result(info, download=True)
+
+    for download in result.get("requested_downloads") or []:
+        if download.get("filepath") and Path(download["filepath"]).is_file():
+            return download["filepath"]
+    for file in Path(temp_dir).iterdir():
+        if file.is_file() and file.suffix in AUDIO_FORMATS:
+            return str(file)
+    return None
+
+
+class VideoInfoCache:
+    """Recently extracted yt-dlp info per video_id (LRU + TTL)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, video_id: str) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(video_id)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[video_id]
+            entry = None
+        metrics.inc("ytdlp_info_cache_lookups", result="hit" if entry else "miss")
+        if entry is None:
+            return None
+        self._entries.move_to_end(video_id)
+        return entry[1]
+
+    def put(self, video_id: str, info: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[video_id] = (time.monotonic() + self.ttl_seconds, info)
+        self._entries.move_to_end(video_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Signed media URLs in the info expire after a few hours, so the TTL is short
+video_info_cache = VideoInfoCache(settings.ytdlp_info_cache_size, settings.ytdlp_info_cache_ttl_seconds)
+
+
+class DownloadedAudio:
+    """Downloaded audio file; owns its temp directory until close()"""
+
+    def __init__(self, path: str, duration: int, temp_dir: tempfile.TemporaryDirectory):
+        self.path = Path(path)
+        self.duration = duration
+        self.size = self.path.stat().st_size
+        self.extension, self.content_type = AUDIO_FORMATS.get(self.path.suffix, ("m4a", "audio/mp4"))
+        self._temp_dir = temp_dir
+
+    def open(self) -> FileSource:
+        """Streamable AudioSource over the file (caller closes it)"""
+        return FileSource(self.path)
+
+    def close(self) -> None:
+        self._temp_dir.cleanup()
+
+    def __enter__(self) -> "DownloadedAudio":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class AudioStream:
+    """Resolved media URL of a video's audio track"""
+    url: str
+    http_headers: dict[str, str]
+    duration: int
+
 
 class YouTubeAudioDownloader:
     """Download audio from YouTube videos using yt-dlp"""
@@ -20,91 +205,158 @@ class YouTubeAudioDownloader:
     def __init__(self):
         self.max_duration_minutes = settings.stt_max_duration_minutes
 
-    async def download_audio(self, video_id: str) -> Tuple[Optional[bytes], Optional[int]]:
+    async def get_video_info(self, video_id: str) -> Optional[dict[str, Any]]:
+        """
+        Extracted yt-dlp info for a video (cached per video_id)
+
+        Returns:
+            Info dict, or None if the video can't be resolved
+
+        Raises:
+            AIServiceError: 503 if the yt-dlp pool queue is full
+        """
+        info = video_info_cache.get(video_id)
+        if info is not None:
+            return info
+
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        try:
+            info = await get_ytdlp_pool().run(extract_video_info, video_url)
+        except AIServiceError:
+            raise
+        except yt_dlp.utils.DownloadError as e:
+            logger.error("youtube_audio_download_error", video_id=video_id, error=str(e))
+            return None
+        except Exception as e:
+            logger.error("youtube_audio_unexpected_error", video_id=video_id, error=str(e))
+            return None
+
+        if not info:
+            logger.error("youtube_audio_info_failed", video_id=video_id)
+            return None
+        logger.info("youtube_audio_format_selected", video_id=video_id, **format_details(info))
+        video_info_cache.put(video_id, info)
+        return info
+
+    def _check_duration(self, video_id: str, info: dict[str, Any], max_seconds: Optional[int]) -> bool:
+        duration_seconds = info.get('duration') or 0
+        if self.is_within_limit(duration_seconds, max_seconds):
+            return True
+        logger.warn(
+            "youtube_audio_duration_exceeded",
+            video_id=video_id,
+            duration=duration_seconds,
+            max_duration=self.max_duration_minutes * 60
+        )
+        return False
+
+    async def resolve_audio_stream(
+        self,
+        video_id: str,
+        max_seconds: Optional[int] = None
+    ) -> Tuple[Optional[AudioStream], Optional[int]]:
+        """
+        Resolve the audio track's media URL without downloading it
+
+        With max_seconds only that much of the video counts against the
+        duration limit (preview).
+
+        Returns:
+            Tuple of (AudioStream, duration_seconds) or (None, None) on
+            failure; (None, duration) if the video is too long or has no
+            single audio URL (download it instead)
+
+        Raises:
+            AIServiceError: 503 if the yt-dlp pool queue is full
+        """
+        info = await self.get_video_info(video_id)
+        if info is None:
+            return None, None
+        duration_seconds = info.get('duration') or 0
+        if not self._check_duration(video_id, info, max_seconds):
+            return None, duration_seconds
+
+        # Merged video+audio selections have no single URL (falls back to download)
+        url = info.get('url')
+        if not url:
+            logger.warning("youtube_audio_stream_url_missing", video_id=video_id)
+            return None, duration_seconds
+        return AudioStream(url, dict(info.get('http_headers') or {}), duration_seconds), duration_seconds
+
+    async def download_audio(
+        self,
+        video_id: str,
+        max_seconds: Optional[int] = None
+    ) -> Tuple[Optional[DownloadedAudio], Optional[int]]:
         """
         Download audio from YouTube video
 
         Args:
             video_id: YouTube video ID
+            max_seconds: Only this much will be transcribed (duration limit);
+                with ffmpeg only this much is downloaded
 
         Returns:
-            Tuple of (audio_bytes, duration_seconds) or (None, None) on failure
+            Tuple of (DownloadedAudio, duration_seconds) or (None, None) on
+            failure; (None, duration) if the video is too long. The caller
+            must close() the DownloadedAudio.
+
+        Raises:
+            AIServiceError: 503 if the yt-dlp pool queue is full
         """
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        info = await self.get_video_info(video_id)
+        if info is None:
+            return None, None
+        duration_seconds = info.get('duration') or 0
+        if not self._check_duration(video_id, info, max_seconds):
+            return None, duration_seconds
 
         logger.info("youtube_audio_download_start", video_id=video_id)
+        start_time = time.perf_counter()
 
+        # Create temp directory for download (handed over to DownloadedAudio)
+        temp_dir = tempfile.TemporaryDirectory(prefix="quickpreview-ytdlp-")
+        if max_seconds and duration_seconds and duration_seconds <= max_seconds:
+            max_seconds = None  # the whole video fits in the preview
         try:
-            # Create temp directory for download
-            with tempfile.TemporaryDirectory() as temp_dir:
-                output_path = os.path.join(temp_dir, "audio")
-
-                ydl_opts = {
-                    'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
-                    'outtmpl': output_path + '.%(ext)s',
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_audio': True,
-                    'noplaylist': True,
-                    # Bypass age gate and bot detection
-                    'age_limit': None,
-                    'geo_bypass': True,
-                    'nocheckcertificate': True,
-                }
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    # Get video info first to check duration
-                    info = ydl.extract_info(video_url, download=False)
-
-                    if not info:
-                        logger.error("youtube_audio_info_failed", video_id=video_id)
-                        return None, None
-
-                    duration_seconds = info.get('duration', 0)
-                    max_duration_seconds = self.max_duration_minutes * 60
-
-                    if duration_seconds > max_duration_seconds:
-                        logger.warn(
-                            "youtube_audio_duration_exceeded",
-                            video_id=video_id,
-                            duration=duration_seconds,
-                            max_duration=max_duration_seconds
-                        )
-                        return None, duration_seconds
-
-                    # Download the audio
-                    ydl.download([video_url])
-
-                # Find the downloaded file
-                audio_file = None
-                for file in Path(temp_dir).iterdir():
-                    if file.is_file() and file.suffix in ['.m4a', '.webm', '.mp3', '.ogg', '.opus']:
-                        audio_file = file
-                        break
-
-                if not audio_file:
-                    logger.error("youtube_audio_file_not_found", video_id=video_id)
-                    return None, None
-
-                # Read the audio file
-                audio_bytes = audio_file.read_bytes()
-
-                logger.info(
-                    "youtube_audio_download_complete",
-                    video_id=video_id,
-                    size_mb=round(len(audio_bytes) / 1024 / 1024, 2),
-                    duration=duration_seconds
-                )
-
-                return audio_bytes, duration_seconds
-
+            audio_file = await get_ytdlp_pool().run(
+                download_from_info, info, temp_dir.name, max_seconds, find_ffmpeg()
+            )
+            if not audio_file:
+                logger.error("youtube_audio_file_not_found", video_id=video_id)
+                temp_dir.cleanup()
+                return None, None
+            audio = DownloadedAudio(audio_file, duration_seconds, temp_dir)
+        except AIServiceError:
+            temp_dir.cleanup()
+            raise
         except yt_dlp.utils.DownloadError as e:
             logger.error("youtube_audio_download_error", video_id=video_id, error=str(e))
+            temp_dir.cleanup()
             return None, None
         except Exception as e:
             logger.error("youtube_audio_unexpected_error", video_id=video_id, error=str(e))
+            temp_dir.cleanup()
             return None, None
 
-    def is_within_limit(self, duration_seconds: int) -> bool:
-        """Check if duration is within STT limit"""
+        elapsed = time.perf_counter() - start_time
+        metrics.observe("ytdlp_download_seconds", elapsed)
+        metrics.observe("ytdlp_download_bytes", audio.size)
+        metrics.observe("ytdlp_download_bytes_per_second", audio.size / max(elapsed, 1e-6))
+        logger.info(
+            "youtube_audio_download_complete",
+            video_id=video_id,
+            size_mb=round(audio.size / 1024 / 1024, 2),
+            bytes=audio.size,
+            format_id=info.get("format_id"),
+            abr=info.get("abr"),
+            duration=duration_seconds,
+            elapsed=round(elapsed, 2)
+        )
+        return audio, duration_seconds
+
+    def is_within_limit(self, duration_seconds: int, max_seconds: Optional[int] = None) -> bool:
+        """Check if duration (or the previewed part of it) is within STT limit"""
+        if max_seconds:
+            duration_seconds = min(duration_seconds, max_seconds)
         return duration_seconds <= self.max_duration_minutes * 60
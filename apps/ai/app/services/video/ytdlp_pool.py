@@ -0,0 +1,161 @@
+"""Bounded worker pool for blocking yt-dlp calls
+
+yt-dlp is synchronous (network I/O, JSON parsing, file writes), so its
+calls run in a dedicated executor instead of on the event loop. In the
+default "process" mode the workers are spawned processes that import
+yt_dlp in their initializer and are warmed up at startup, so the first
+download doesn't pay for process start and extractor import.
+
+At most ytdlp_workers calls run at once; up to ytdlp_queue_size more wait
+for a free worker and anything beyond that is rejected with 503.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+import structlog
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode
+from app.core.metrics import metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+def init_worker() -> None:
+    """Process initializer: import yt_dlp up front"""
+    import yt_dlp  # noqa: F401
+    import yt_dlp.extractor  # noqa: F401
+
+
+def worker_info() -> tuple[int, bool]:
+    """(pid, whether yt_dlp is imported) of the worker running this call"""
+    return os.getpid(), "yt_dlp" in sys.modules
+
+
+class YtDlpPool:
+    """Executor for yt-dlp calls with a bounded wait queue"""
+
+    def __init__(self, mode: str, workers: int, queue_size: int):
+        if mode not in ("process", "thread"):
+            raise AIServiceError(
+                code=ErrorCode.CONFIGURATION_ERROR,
+                message=f"YTDLP_POOL_MODE는 process 또는 thread여야 합니다: {mode}",
+                status_code=500
+            )
+        self.mode = mode
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._running = 0
+        self._waiting = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="ytdlp"
+                )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores are bound to the loop they first wait on
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.workers)
+            self._running = self._waiting = 0
+        return self._slots
+
+    def warm_up(self) -> None:
+        """Start every worker in the background (returns immediately)"""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(worker_info)
+        logger.info("ytdlp_pool_started", mode=self.mode, workers=self.workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run fn(*args) on a pool worker
+
+        In process mode fn and args must be picklable (module-level function).
+
+        Raises:
+            AIServiceError: 503 if ytdlp_queue_size calls are already waiting
+        """
+        slots = self._get_slots()
+        if slots.locked() and self._waiting >= self.queue_size:
+            metrics.inc("ytdlp_rejected")
+            logger.warning("ytdlp_queue_full", waiting=self._waiting, queue_size=self.queue_size)
+            raise AIServiceError(
+                code=ErrorCode.SERVICE_UNAVAILABLE,
+                message="영상 다운로드 요청이 많습니다. 잠시 후 다시 시도해주세요",
+                status_code=503,
+                details={"queue_size": self.queue_size}
+            )
+
+        submitted = time.perf_counter()
+        metrics.observe("ytdlp_queue_depth", self._waiting)
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+        metrics.observe("ytdlp_wait_seconds", time.perf_counter() - submitted)
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(fn, *args))
+        finally:
+            self._running -= 1
+            slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._waiting,
+            "queue_size": self.queue_size,
+        }
+
+
+@lru_cache
+def get_ytdlp_pool() -> YtDlpPool:
+    """Get the process-wide yt-dlp pool"""
+    settings = get_settings()
+    pool = YtDlpPool(settings.ytdlp_pool_mode, settings.ytdlp_workers, settings.ytdlp_queue_size)
+    metrics.register_collector("ytdlp_pool", pool.stats)
+    return pool
+
+
+async def start_ytdlp_pool() -> None:
+    """Spawn and warm up yt-dlp workers (app startup)"""
+    get_ytdlp_pool().warm_up()
+
+
+async def stop_ytdlp_pool() -> None:
+    """Shut down yt-dlp workers (app shutdown)"""
+    get_ytdlp_pool().shutdown()
@@ -13,8 +13,11 @@ from app import __version__
 from app.api import router
 from app.config import get_settings
 from app.core.error_handlers import setup_exception_handlers
+from app.core.http_client import start_http_client, close_http_client
 from app.core.middleware import ApiKeyMiddleware, RequestIdMiddleware, LoggingMiddleware
 from app.core.rate_limiter import limiter
+from app.services.video.stt_jobs import start_stt_jobs, stop_stt_jobs
+from app.services.video.ytdlp_pool import start_ytdlp_pool, stop_ytdlp_pool
 
 
 def setup_logging():
@@ -44,7 +47,13 @@ async def lifespan(app: FastAPI):
         model=settings.openai_model,
         stt_api_url=settings.stt_api_url
     )
+    await start_http_client()
+    await start_ytdlp_pool()
+    await start_stt_jobs()
     yield
+    await stop_stt_jobs()
+    await stop_ytdlp_pool()
+    await close_http_client()
     logger.info("app_shutdown")
 
 
@@ -1,6 +1,11 @@
 """Pytest configuration and fixtures"""
 
+import json
 import os
+import stat
+import sys
+from pathlib import Path
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -13,6 +18,128 @@ from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
 
 from main import app
+from app.config import get_settings
+from app.services.shared.llm_backends import get_backend_pool
+from app.services.video.stt_backends import get_stt_backend_pool
+from app.services.video.stt_limiter import get_stt_limiter
+from app.services.video.transcript_cache import get_transcript_cache
+from app.services.video.youtube_audio import video_info_cache
+from app.services.video.ytdlp_pool import get_ytdlp_pool
+
+
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(tmp_path, monkeypatch):
+    """Give every test its own empty transcript cache"""
+    monkeypatch.setattr(get_settings(), "transcript_cache_path", str(tmp_path / "transcripts.sqlite3"))
+    get_transcript_cache.cache_clear()
+    yield
+    get_transcript_cache().close()
+    get_transcript_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_stt_backends():
+    """Start every test with no load, ejection or concurrency-limit state for STT"""
+    get_stt_backend_pool.cache_clear()
+    get_stt_limiter.cache_clear()
+    yield
+    get_stt_backend_pool.cache_clear()
+    get_stt_limiter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def thread_ytdlp_pool(monkeypatch):
+    """Run yt-dlp calls on threads (no worker processes spawned per test)"""
+    monkeypatch.setattr(get_settings(), "ytdlp_pool_mode", "thread")
+    get_ytdlp_pool.cache_clear()
+    video_info_cache.clear()
+    yield
+    get_ytdlp_pool().shutdown()
+    get_ytdlp_pool.cache_clear()
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that counts extractions and downloads"""
+
+    extractions = 0
+    downloads = 0
+    info = {"id": "abc123", "duration": 90, "ext": "m4a", "url": "https://media.example/audio.m4a"}
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.outtmpl = opts.get("outtmpl")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        type(self).extractions += 1
+        return dict(self.info)
+
+    def sanitize_info(self, info):
+        return dict(info)
+
+    def process_ie_result(self, info, download=True):
+        type(self).downloads += 1
+        type(self).download_opts = self.opts
+        path = self.outtmpl.replace("%(ext)s", info["ext"])
+        with open(path, "wb") as f:
+            f.write(b"a" * 4096)
+        return {**info, "requested_downloads": [{"filepath": path}]}
+
+
+@pytest.fixture
+def fake_youtube_dl(monkeypatch):
+    """Replace yt-dlp with FakeYoutubeDL (downloads write a 4KB m4a file)"""
+    monkeypatch.setattr(FakeYoutubeDL, "extractions", 0)
+    monkeypatch.setattr(FakeYoutubeDL, "downloads", 0)
+    monkeypatch.setattr("app.services.video.youtube_audio.yt_dlp.YoutubeDL", FakeYoutubeDL)
+    return FakeYoutubeDL
+
+
+# Prepended to every fake ffmpeg / ffprobe: logs the argv of each run, one JSON list per line
+FAKE_FFMPEG_PREAMBLE = """#!{python}
+import json, sys
+with open({log!r}, "a") as _log:
+    _log.write(json.dumps(sys.argv[1:]) + "\\n")
+"""
+
+
+class FakeFFmpeg:
+    """Python script installed as ffmpeg_binary (or ffprobe_binary)"""
+
+    def __init__(self, path: Path):
+        self.path = str(path)
+        self.log = path.with_name(f"{path.name}.args")
+
+    def calls(self) -> list[list[str]]:
+        """Arguments of every run so far"""
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    @property
+    def args(self) -> list[str]:
+        """Arguments of the last run"""
+        return self.calls()[-1]
+
+
+@pytest.fixture
+def install_ffmpeg(tmp_path, monkeypatch):
+    """Install a Python script as ffmpeg: install_ffmpeg(script, binary="ffmpeg") -> FakeFFmpeg"""
+
+    def install(script: str, binary: str = "ffmpeg") -> FakeFFmpeg:
+        path = tmp_path / binary
+        fake = FakeFFmpeg(path)
+        path.write_text(FAKE_FFMPEG_PREAMBLE.format(python=sys.executable, log=str(fake.log)) + script)
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setattr(get_settings(), f"{binary}_binary", fake.path)
+        return fake
+
+    return install
 
 
 @pytest.fixture
@@ -31,22 +158,42 @@ async def async_client():
         yield ac
 
 
+# Canned structured-output content per response schema
+LLM_MOCK_CONTENT = {
+    "CompactAnalysis": '{"s": "테스트 요약입니다.", "sc": 8, "r": "테스트 이유", "k": ["테스트", "키워드"], "h": []}',
+    "TranslationBatch": '{"t": ["번역된 텍스트", "번역된 텍스트 2"]}',
+}
+
+
 @pytest.fixture
-def mock_openai():
-    """Mock OpenAI client"""
-    with patch("app.services.llm.OpenAI") as mock:
+def mock_llm():
+    """Mock OpenAI client shared by every backend in the LLM backend pool"""
+    with patch("app.services.shared.llm_backends.OpenAI") as mock:
+        get_backend_pool.cache_clear()
         mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.choices = [
-            MagicMock(
-                message=MagicMock(
-                    content='{"summary": "테스트 요약입니다.", "watchScore": 8, "watchScoreReason": "테스트 이유", "keywords": ["테스트", "키워드"], "highlights": []}'
-                )
+
+        def create(**kwargs):
+            schema = kwargs["response_format"]["json_schema"]["name"]
+            return MagicMock(
+                choices=[MagicMock(message=MagicMock(content=LLM_MOCK_CONTENT[schema]))]
             )
-        ]
-        mock_instance.chat.completions.create.return_value = mock_response
+
+        mock_instance.chat.completions.create.side_effect = create
         mock.return_value = mock_instance
         yield mock_instance
+    get_backend_pool.cache_clear()
+
+
+@pytest.fixture
+def mock_openai(mock_llm):
+    """Mock OpenAI client for video analysis"""
+    return mock_llm
+
+
+@pytest.fixture
+def mock_openai_translation(mock_llm):
+    """Mock OpenAI client for translation"""
+    return mock_llm
 
 
 @pytest.fixture
@@ -64,7 +211,7 @@ def mock_stt_api():
     async def mock_post(*args, **kwargs):
         mock = MagicMock()
         mock.status_code = 200
-        mock.json.return_value = mock_response
+        mock.content = json.dumps(mock_response).encode()
         mock.raise_for_status = MagicMock()
         return mock
 
@@ -98,3 +98,61 @@ class TestAnalyzeEndpoint:
         assert response.status_code == 422
         data = response.json()
         assert "detail" in data or "error" in data
+
+
+class TestAnalyzeTranslateEndpoint:
+    """Tests for /api/v1/analyze-translate endpoint"""
+
+    def test_analyze_translate_success(
+        self, client, mock_openai, mock_openai_translation, sample_analyze_request
+    ):
+        """Test analysis and translation are returned together"""
+        request = {
+            "metadata": sample_analyze_request["metadata"],
+            "segments": [
+                {"start": 0.0, "end": 5.0, "text": "Hello world"},
+                {"start": 5.0, "end": 10.0, "text": "How are you?"},
+            ],
+            "sourceLanguage": "en",
+            "targetLanguages": ["ko", "ja"],
+        }
+        response = client.post("/api/v1/analyze-translate", json=request)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert "watchScore" in data["data"]["analysis"]
+        segments = data["data"]["translation"]["segments"]
+        assert len(segments) == 2
+        assert set(segments[0]["translations"]) == {"ko", "ja"}
+        assert data["meta"]["targetLanguages"] == ["ko", "ja"]
+        assert "analysisTime" in data["meta"]
+        assert "translationTime" in data["meta"]
+
+    def test_analyze_translate_formats_transcript_once(
+        self, client, mock_openai, mock_openai_translation, sample_analyze_request
+    ):
+        """Test both stages reuse the transcript prepared by the endpoint"""
+        from app.services.shared import translation
+        from app.services.video.llm import LLMService
+
+        request = {
+            "metadata": sample_analyze_request["metadata"],
+            "segments": [{"start": 0.0, "end": 5.0, "text": "Hello world"}],
+            "sourceLanguage": "en",
+            "targetLanguages": ["ko"],
+        }
+        with patch.object(translation, "chunk_array", wraps=translation.chunk_array) as chunk, \
+                patch.object(LLMService, "_format_transcript") as format_transcript:
+            response = client.post("/api/v1/analyze-translate", json=request)
+
+        assert response.status_code == 200
+        assert chunk.call_count == 1
+        format_transcript.assert_not_called()
+
+    def test_analyze_translate_requires_segments(self, client, sample_analyze_request):
+        """Test segments are required"""
+        request = {"metadata": sample_analyze_request["metadata"]}
+        response = client.post("/api/v1/analyze-translate", json=request)
+
+        assert response.status_code == 422
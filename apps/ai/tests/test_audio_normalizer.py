@@ -0,0 +1,101 @@
+"""Tests for ffmpeg audio normalization (using a fake ffmpeg script)"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.services.video.audio_normalizer import normalize_audio
+from app.services.video.multipart_stream import BytesSource
+from app.services.video.stt_pipeline import transcribe_audio
+
+# Stands in for ffmpeg: "transcodes" to 1/10 size
+FAKE_FFMPEG = """
+data = sys.stdin.buffer.read()
+sys.stdout.buffer.write(b"OggS" + data[: len(data) // 10])
+"""
+
+FAILING_FFMPEG = """
+sys.stdin.buffer.read()
+sys.stderr.write("Invalid data found when processing input")
+sys.exit(1)
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(FAKE_FFMPEG)
+
+
+@pytest.fixture
+def failing_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(FAILING_FFMPEG)
+
+
+AUDIO = bytes(range(256)) * 2048  # 512KB
+
+
+class TestNormalizeAudio:
+    """Tests for the ffmpeg normalization stage"""
+
+    async def test_transcodes_to_16k_mono(self, fake_ffmpeg):
+        """Test audio is streamed through ffmpeg and the output is returned"""
+        normalized = await normalize_audio(BytesSource(AUDIO), len(AUDIO))
+
+        assert normalized is not None
+        try:
+            data = await normalized.read()
+            assert data == b"OggS" + AUDIO[: len(AUDIO) // 10]
+            assert normalized.size == len(data)
+            assert normalized.extension == "ogg"
+            assert normalized.content_type == "audio/ogg"
+        finally:
+            normalized.close()
+
+        args = " ".join(fake_ffmpeg.args)
+        assert "-ac 1" in args
+        assert "-ar 16000" in args
+        assert "libopus" in args
+
+    async def test_missing_ffmpeg_skips(self, monkeypatch):
+        """Test the original audio is used when ffmpeg isn't installed"""
+        monkeypatch.setattr(get_settings(), "ffmpeg_binary", "ffmpeg-does-not-exist")
+
+        assert await normalize_audio(BytesSource(AUDIO), len(AUDIO)) is None
+
+    async def test_ffmpeg_failure_skips(self, failing_ffmpeg):
+        """Test undecodable input falls back to the original audio"""
+        assert await normalize_audio(BytesSource(AUDIO), len(AUDIO)) is None
+
+    async def test_disabled(self, fake_ffmpeg, monkeypatch):
+        """Test normalization can be turned off"""
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        assert await normalize_audio(BytesSource(AUDIO), len(AUDIO)) is None
+
+
+class TestSTTPipeline:
+    """Tests for the normalization stage in front of the STT API"""
+
+    async def test_uploads_normalized_audio(self, fake_ffmpeg, monkeypatch):
+        """Test the STT API receives the transcoded file"""
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        monkeypatch.setattr(get_settings(), "stt_chunk_seconds", 0)
+        sent = {}
+
+        async def capture_post(self, url, content=None, headers=None, **kwargs):
+            sent["body"] = b"".join([chunk async for chunk in content])
+            response = MagicMock()
+            response.content = json.dumps({"text": "ok", "language": "ko", "segments": []}).encode()
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=capture_post):
+            result = await transcribe_audio(AUDIO, filename="video.m4a", content_type="audio/mp4")
+
+        assert result.text == "ok"
+        assert b'filename="video.ogg"' in sent["body"]
+        assert b"Content-Type: audio/ogg" in sent["body"]
+        assert b"OggS" + AUDIO[: len(AUDIO) // 10] in sent["body"]
+        assert AUDIO not in sent["body"]
@@ -0,0 +1,187 @@
+"""Tests for upload content validation (magic bytes, ffprobe duration)"""
+
+import json
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode, ValidationError
+from app.core.rate_limiter import limiter
+from app.services.video.audio_probe import sniff_audio_format, validate_audio_content
+from app.services.video.multipart_stream import BytesSource, spool_source
+
+# Stands in for ffprobe: reads the file it was given; "dur=N" in the file
+# sets the duration and "noaudio" leaves out the audio stream
+FAKE_FFPROBE = """
+import re
+data = open(sys.argv[-1], "rb").read()
+if b"corrupt" in data:
+    sys.stderr.write("Invalid data found when processing input")
+    sys.exit(1)
+match = re.search(rb"dur=(\\d+)", data)
+streams = [{"codec_type": "video", "codec_name": "h264"}]
+if b"noaudio" not in data:
+    streams.append({"codec_type": "audio", "codec_name": "mp3"})
+print(json.dumps({
+    "format": {"format_name": "mp3", "duration": match.group(1).decode() if match else "N/A"},
+    "streams": streams,
+}))
+"""
+
+
+def _mp3(marker: bytes = b"", padding: int = 0) -> bytes:
+    return b"ID3\x04\x00" + b"\x00" * padding + marker
+
+
+@pytest.fixture
+def fake_ffprobe(install_ffmpeg, monkeypatch):
+    install_ffmpeg(FAKE_FFPROBE, binary="ffprobe")
+    monkeypatch.setattr(get_settings(), "stt_max_duration_minutes", 10)
+
+
+@pytest.fixture
+def stt_calls():
+    """Mock STT API counting calls"""
+    calls = []
+
+    async def mock_post(self, url, **kwargs):
+        calls.append(url)
+        response = MagicMock()
+        response.content = json.dumps({"text": "ok", "language": "ko", "segments": []}).encode()
+        return response
+
+    limiter.reset()
+    with patch("httpx.AsyncClient.post", new=mock_post):
+        yield calls
+
+
+class TestSniffing:
+    """Tests for magic-byte detection"""
+
+    @pytest.mark.parametrize("head, expected", [
+        (b"ID3\x04\x00\x00", "mp3"),
+        (b"\xff\xfb\x90\x64", "mp3"),
+        (b"RIFF\x24\x08\x00\x00WAVEfmt ", "wav"),
+        (b"fLaC\x00\x00\x00\x22", "flac"),
+        (b"OggS\x00\x02", "ogg"),
+        (b"\x1a\x45\xdf\xa3\x9f\x42", "webm"),
+        (b"\x00\x00\x00\x20ftypM4A \x00", "m4a"),
+        (b"%PDF-1.7", None),
+        (b"<html>", None),
+        (b"", None),
+    ])
+    def test_sniff(self, head, expected):
+        """Test container detection from the first bytes"""
+        assert sniff_audio_format(head) == expected
+
+
+class TestValidateAudioContent:
+    """Tests for the pre-STT content check"""
+
+    async def test_rejects_non_audio(self):
+        """Test files that don't start like audio are rejected"""
+        with pytest.raises(ValidationError) as exc_info:
+            await validate_audio_content(BytesSource(b"%PDF-1.7 not audio"), "doc.mp3")
+
+        assert exc_info.value.code == ErrorCode.INVALID_FILE
+
+    async def test_without_ffprobe_only_sniffs(self, monkeypatch):
+        """Test probing is skipped when ffprobe isn't installed"""
+        monkeypatch.setattr(get_settings(), "ffprobe_binary", "ffprobe-not-installed")
+
+        assert await validate_audio_content(BytesSource(_mp3()), "a.mp3") is None
+
+    async def test_probe_reads_spooled_file(self, fake_ffprobe):
+        """Test ffprobe reads the spooled upload from disk (past the memory spool)"""
+        source = await spool_source(BytesSource(_mp3(b"dur=42", padding=1024)))
+        try:
+            probe = await validate_audio_content(source, "a.mp3")
+            rewound = await source.read(3)
+        finally:
+            source.close()
+
+        assert (probe.codec, probe.duration) == ("mp3", 42.0)
+        assert rewound == b"ID3"
+
+    async def test_too_long(self, fake_ffprobe):
+        """Test audio over stt_max_duration_minutes gets AUDIO_TOO_LONG"""
+        source = await spool_source(BytesSource(_mp3(b"dur=3600")))
+        try:
+            with pytest.raises(AIServiceError) as exc_info:
+                await validate_audio_content(source, "a.mp3")
+        finally:
+            source.close()
+
+        assert exc_info.value.code == ErrorCode.AUDIO_TOO_LONG
+        assert exc_info.value.status_code == 422
+
+    async def test_preview_of_long_audio_allowed(self, fake_ffprobe):
+        """Test only max_seconds counts against the limit"""
+        source = await spool_source(BytesSource(_mp3(b"dur=3600")))
+        try:
+            probe = await validate_audio_content(source, "a.mp3", max_seconds=120)
+        finally:
+            source.close()
+
+        assert probe.duration == 3600.0
+
+    async def test_no_audio_stream(self, fake_ffprobe):
+        """Test files without an audio stream are rejected"""
+        source = await spool_source(BytesSource(_mp3(b"noaudio")))
+        try:
+            with pytest.raises(ValidationError):
+                await validate_audio_content(source, "a.mp3")
+        finally:
+            source.close()
+
+    async def test_ffprobe_failure_is_not_fatal(self, fake_ffprobe):
+        """Test an ffprobe error leaves the decision to STT"""
+        source = await spool_source(BytesSource(_mp3(b"corrupt")))
+        try:
+            assert await validate_audio_content(source, "a.mp3") is None
+        finally:
+            source.close()
+
+
+class TestUploadEndpoints:
+    """Tests for validation on /stt/transcribe and /stt/jobs"""
+
+    def test_non_audio_rejected_before_stt(self, client, stt_calls):
+        """Test a renamed non-audio file never reaches STT"""
+        files = {"audio": ("test.mp3", BytesIO(b"<html>not audio</html>"), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 400
+        assert response.json()["error"] == ErrorCode.INVALID_FILE.value
+        assert stt_calls == []
+
+    def test_too_long_rejected_before_stt(self, client, stt_calls, fake_ffprobe):
+        """Test over-long uploads get 422 AUDIO_TOO_LONG without STT work"""
+        files = {"audio": ("test.mp3", BytesIO(_mp3(b"dur=3600")), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 422
+        assert response.json()["error"] == ErrorCode.AUDIO_TOO_LONG.value
+        assert stt_calls == []
+
+    def test_valid_upload_transcribed(self, client, stt_calls, fake_ffprobe):
+        """Test uploads within the limit go through"""
+        files = {"audio": ("test.mp3", BytesIO(_mp3(b"dur=60")), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 200
+        assert len(stt_calls) == 1
+
+    def test_job_not_created_for_long_audio(self, client, stt_calls, fake_ffprobe):
+        """Test /stt/jobs validates before creating a job"""
+        files = {"audio": ("test.mp3", BytesIO(_mp3(b"dur=3600")), "audio/mpeg")}
+
+        response = client.post("/stt/jobs", files=files)
+
+        assert response.status_code == 422
+        assert response.json()["error"] == ErrorCode.AUDIO_TOO_LONG.value
@@ -0,0 +1,219 @@
+"""Tests for streaming video audio through ffmpeg into STT (fake ffmpeg script)"""
+
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import STTError
+from app.services.video.audio_normalizer import upload_format
+from app.services.video.audio_stream import FFmpegStreamSource
+from app.services.video.stt_pipeline import transcribe_video
+
+# Stands in for ffmpeg: "transcodes" the file given with -i to stdout
+STREAM_FFMPEG = """
+args = sys.argv[1:]
+data = open(args[args.index("-i") + 1], "rb").read()
+out = sys.stdout.buffer
+out.write(b"OggS")
+for i in range(0, len(data), 8192):
+    out.write(data[i:i + 8192])
+"""
+
+# Reads -i from stdin or from the file/URL given (decode and encode stages)
+PASSTHROUGH_FFMPEG = """
+import shutil
+args = sys.argv[1:]
+source = args[args.index("-i") + 1]
+with (sys.stdin.buffer if source == "pipe:0" else open(source, "rb")) as data:
+    shutil.copyfileobj(data, sys.stdout.buffer)
+"""
+
+FAILING_FFMPEG = """
+sys.stderr.write("HTTP error 403 Forbidden")
+sys.exit(1)
+"""
+
+AUDIO = bytes(range(256)) * 1024  # 256KB
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "media.m4a"
+    path.write_bytes(AUDIO)
+    return str(path)
+
+
+@pytest.fixture
+def stream_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(STREAM_FFMPEG).path
+
+
+@pytest.fixture
+def failing_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(FAILING_FFMPEG).path
+
+
+class TestFFmpegStreamSource:
+    """Tests for the ffmpeg pipe source"""
+
+    async def test_reads_ffmpeg_output(self, stream_ffmpeg, media_file):
+        """Test the encoded stream is read chunk by chunk"""
+        source = FFmpegStreamSource(stream_ffmpeg, media_file, upload_format())
+        chunks = []
+        try:
+            while chunk := await source.read(16 * 1024):
+                chunks.append(chunk)
+        finally:
+            await source.close()
+
+        assert b"".join(chunks) == b"OggS" + AUDIO
+        assert len(chunks) > 1
+        assert source.bytes_read == len(AUDIO) + 4
+
+    async def test_seek_restarts_ffmpeg(self, stream_ffmpeg, media_file):
+        """Test seek(0) replays the stream (used by STT retries)"""
+        source = FFmpegStreamSource(stream_ffmpeg, media_file, upload_format())
+        try:
+            first = await source.read(1024)
+            await source.seek(0)
+            replay = b""
+            while chunk := await source.read(64 * 1024):
+                replay += chunk
+        finally:
+            await source.close()
+
+        assert first and (b"OggS" + AUDIO).startswith(first)
+        assert replay == b"OggS" + AUDIO
+        assert source.starts == 2
+
+    async def test_ffmpeg_failure_raises(self, failing_ffmpeg):
+        """Test a failed stream (e.g. expired URL) raises STTError"""
+        source = FFmpegStreamSource(failing_ffmpeg, "https://media.example/a.m4a", upload_format())
+        try:
+            with pytest.raises(STTError):
+                await source.read(1024)
+        finally:
+            await source.close()
+
+    async def test_close_reaps_ffmpeg(self, stream_ffmpeg, media_file):
+        """Test closing mid-stream kills ffmpeg and waits for it to exit"""
+        source = FFmpegStreamSource(stream_ffmpeg, media_file, upload_format())
+        await source.read(1024)
+        process = source._process
+
+        await source.close()
+
+        assert process.returncode is not None
+        assert source._process is None
+
+    def test_http_input_args(self):
+        """Test remote URLs get reconnect options and yt-dlp's headers"""
+        source = FFmpegStreamSource(
+            "ffmpeg", "https://media.example/a.m4a", upload_format(), {"User-Agent": "test-agent"}
+        )
+        args = source._args()
+
+        assert "-reconnect" in args
+        assert args[args.index("-headers") + 1] == "User-Agent: test-agent\r\n"
+        assert args.index("-headers") < args.index("-i")
+
+
+class TestTranscribeVideoStreaming:
+    """Tests for /stt/video streaming through the pipeline"""
+
+    @pytest.fixture
+    def stream_info(self, fake_youtube_dl, media_file, monkeypatch):
+        monkeypatch.setattr(fake_youtube_dl, "info", {**fake_youtube_dl.info, "url": media_file})
+        return fake_youtube_dl
+
+    @pytest.fixture
+    def single_request(self, monkeypatch):
+        """VAD and chunking off: the encoded stream is uploaded as it is produced"""
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        monkeypatch.setattr(get_settings(), "stt_chunk_seconds", 0)
+
+    async def test_long_stream_is_chunked(self, tmp_path, monkeypatch, fake_youtube_dl, install_ffmpeg):
+        """Test a streamed video is decoded from its URL and transcribed in chunks"""
+        install_ffmpeg(PASSTHROUGH_FFMPEG)
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        monkeypatch.setattr(get_settings(), "stt_chunk_seconds", 4)
+        monkeypatch.setattr(get_settings(), "stt_chunk_overlap_seconds", 1.0)
+        media = tmp_path / "media.pcm"
+        media.write_bytes(b"\x00\x01" * 16000 * 9)  # 9s of 16 kHz s16le
+        monkeypatch.setattr(fake_youtube_dl, "info", {**fake_youtube_dl.info, "url": str(media)})
+        filenames = []
+
+        async def capture_post(self, url, content=None, headers=None, **kwargs):
+            body = b"".join([chunk async for chunk in content])
+            filenames.append(re.search(rb'filename="([^"]+)"', body).group(1).decode())
+            response = MagicMock()
+            response.content = json.dumps({
+                "text": "ok", "language": "ko", "segments": [{"start": 0.5, "end": 1.5, "text": "ok"}],
+            }).encode()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=capture_post):
+            result = await transcribe_video("abc123", language="ko")
+
+        assert sorted(filenames) == ["abc123.part0.ogg", "abc123.part1.ogg", "abc123.part2.ogg"]
+        assert len(result.segments) == 3
+        assert fake_youtube_dl.downloads == 0
+
+    async def test_streams_without_download(self, stream_ffmpeg, stream_info, single_request):
+        """Test ffmpeg output goes straight into a chunked STT upload"""
+        sent = {}
+
+        async def capture_post(self, url, content=None, headers=None, **kwargs):
+            sent["body"] = b"".join([chunk async for chunk in content])
+            sent["headers"] = headers
+            response = MagicMock()
+            response.content = json.dumps({"text": "ok", "language": "ko", "segments": []}).encode()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=capture_post):
+            result = await transcribe_video("abc123", language="ko")
+
+        assert result.text == "ok"
+        assert b"OggS" + AUDIO in sent["body"]
+        assert b'filename="abc123.ogg"' in sent["body"]
+        assert "Content-Length" not in sent["headers"]
+        assert stream_info.extractions == 1
+        assert stream_info.downloads == 0
+
+    async def test_retry_restarts_stream(self, stream_ffmpeg, stream_info, single_request, monkeypatch):
+        """Test an STT 5xx retry re-runs ffmpeg and resends the whole audio"""
+        monkeypatch.setattr(get_settings(), "retry_base_delay", 0.01)
+        bodies = []
+
+        async def flaky_post(self, url, content=None, headers=None, **kwargs):
+            bodies.append(b"".join([chunk async for chunk in content]))
+            response = MagicMock()
+            if len(bodies) == 1:
+                response.status_code = 503
+                response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                    "unavailable", request=MagicMock(), response=response
+                )
+            else:
+                response.content = json.dumps({"text": "ok", "language": "ko", "segments": []}).encode()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=flaky_post):
+            result = await transcribe_video("abc123", language="ko")
+
+        assert result.text == "ok"
+        assert len(bodies) == 2
+        assert all(b"OggS" + AUDIO in body for body in bodies)
+
+    async def test_streaming_disabled_downloads(self, stream_ffmpeg, stream_info, mock_stt_api, monkeypatch):
+        """Test STT_VIDEO_STREAMING=false keeps the download path"""
+        monkeypatch.setattr(get_settings(), "stt_video_streaming", False)
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        result = await transcribe_video("abc123", language="ko")
+
+        assert result.text == mock_stt_api["text"]
+        assert stream_info.downloads == 1
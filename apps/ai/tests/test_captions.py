@@ -0,0 +1,213 @@
+"""Tests for the caption fast path (track selection, VTT/SRV parsing)"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.services.video.captions import parse_srv, parse_vtt, select_caption_track
+from app.services.video.stt_pipeline import transcribe_video
+
+MANUAL_VTT = """WEBVTT
+Kind: captions
+Language: ko
+
+1
+00:00:01.000 --> 00:00:03.500
+안녕하세요
+여러분
+
+2
+00:00:04.000 --> 00:00:06.000
+<i>오늘은</i> 테스트 &amp; 데모
+"""
+
+# YouTube auto captions: rolling lines with word timing tags
+AUTO_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+
+hello<00:00:00.500><c> world</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+hello world
+
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+hello world
+this<00:00:02.500><c> is</c><00:00:03.000><c> a test</c>
+"""
+
+SRV3 = """<?xml version="1.0" encoding="utf-8" ?><timedtext format="3"><body>
+<p t="1000" d="2500">first <s>line</s></p>
+<p t="4000" d="1000">second &amp; last</p>
+</body></timedtext>"""
+
+
+def _info(**overrides):
+    return {"id": "abc123", "duration": 90, "language": "ko", **overrides}
+
+
+class TestParsing:
+    """Tests for caption formats"""
+
+    def test_parse_vtt(self):
+        """Test cues become segments with tags stripped and entities decoded"""
+        segments = parse_vtt(MANUAL_VTT)
+
+        assert [(s.start, s.end, s.text) for s in segments] == [
+            (1.0, 3.5, "안녕하세요 여러분"),
+            (4.0, 6.0, "오늘은 테스트 & 데모"),
+        ]
+
+    def test_parse_rolling_auto_captions(self):
+        """Test repeated lines of auto captions appear once"""
+        segments = parse_vtt(AUTO_VTT)
+
+        assert [s.text for s in segments] == ["hello world", "this is a test"]
+        assert segments[0].end == 2.01
+        assert segments[1].start == 2.01
+
+    def test_parse_hour_timestamps(self):
+        """Test hh:mm:ss.mmm timings"""
+        segments = parse_vtt("WEBVTT\n\n01:02:03.250 --> 01:02:04.000\nlate")
+
+        assert segments[0].start == 3723.25
+
+    def test_parse_srv3(self):
+        """Test timedtext XML in milliseconds"""
+        segments = parse_srv(SRV3)
+
+        assert [(s.start, s.end, s.text) for s in segments] == [
+            (1.0, 3.5, "first line"),
+            (4.0, 5.0, "second & last"),
+        ]
+
+    def test_parse_srv1(self):
+        """Test srv1 <text start dur> in seconds"""
+        segments = parse_srv('<transcript><text start="0.5" dur="1.5">hi there</text></transcript>')
+
+        assert [(s.start, s.end, s.text) for s in segments] == [(0.5, 2.0, "hi there")]
+
+
+class TestTrackSelection:
+    """Tests for picking a caption track"""
+
+    def test_manual_preferred_over_auto(self):
+        """Test uploaded captions win, in the best available format"""
+        info = _info(
+            subtitles={"ko": [{"ext": "json3", "url": "j"}, {"ext": "vtt", "url": "v"}]},
+            automatic_captions={"ko": [{"ext": "vtt", "url": "a"}]},
+        )
+
+        track = select_caption_track(info, "ko")
+
+        assert (track.language, track.url, track.ext, track.automatic) == ("ko", "v", "vtt", False)
+
+    def test_auto_uses_video_language(self):
+        """Test language "auto" picks the video's own language"""
+        info = _info(subtitles={"en": [{"ext": "vtt", "url": "en"}], "ko-KR": [{"ext": "vtt", "url": "ko"}]})
+
+        assert select_caption_track(info, "auto").url == "ko"
+
+    def test_auto_captions_only_in_original_language(self):
+        """Test machine-translated auto captions are not used"""
+        info = _info(automatic_captions={
+            "ko-orig": [{"ext": "vtt", "url": "orig"}],
+            "en": [{"ext": "vtt", "url": "translated"}],
+        })
+
+        assert select_caption_track(info, "ko").url == "orig"
+        assert select_caption_track(info, "ko").automatic is True
+        assert select_caption_track(info, "en") is None
+
+    def test_auto_captions_can_be_disabled(self, monkeypatch):
+        """Test STT_CAPTIONS_ALLOW_AUTO=false ignores auto captions"""
+        monkeypatch.setattr(get_settings(), "stt_captions_allow_auto", False)
+        info = _info(automatic_captions={"ko": [{"ext": "vtt", "url": "a"}]})
+
+        assert select_caption_track(info, "ko") is None
+
+    def test_no_tracks(self):
+        """Test videos without captions"""
+        assert select_caption_track(_info(), "ko") is None
+
+
+class TestCaptionFastPath:
+    """Tests for /stt/video using captions"""
+
+    @pytest.fixture
+    def captioned_video(self, fake_youtube_dl, monkeypatch):
+        monkeypatch.setattr(fake_youtube_dl, "info", {
+            **fake_youtube_dl.info,
+            "language": "ko",
+            "subtitles": {"ko": [{"ext": "vtt", "url": "https://captions.example/ko.vtt"}]},
+        })
+        return fake_youtube_dl
+
+    @pytest.fixture
+    def caption_server(self):
+        requested = []
+
+        async def fake_get(self, url, **kwargs):
+            requested.append(url)
+            response = MagicMock()
+            response.text = MANUAL_VTT
+            return response
+
+        with patch("httpx.AsyncClient.get", new=fake_get):
+            yield requested
+
+    async def test_captions_skip_download_and_stt(self, captioned_video, caption_server):
+        """Test a captioned video is answered without audio or STT"""
+        stt_post = MagicMock(side_effect=AssertionError("STT must not be called"))
+
+        with patch("httpx.AsyncClient.post", new=stt_post):
+            result = await transcribe_video("abc123", language="ko")
+
+        assert result.source == "captions"
+        assert result.language == "ko"
+        assert result.text == "안녕하세요 여러분 오늘은 테스트 & 데모"
+        assert caption_server == ["https://captions.example/ko.vtt"]
+        assert captioned_video.downloads == 0
+
+    async def test_caption_result_is_cached(self, captioned_video, caption_server):
+        """Test the caption transcript is cached with its source"""
+        await transcribe_video("abc123", language="ko")
+        cached = await transcribe_video("abc123", language="ko")
+
+        assert cached.source == "captions"
+        assert len(caption_server) == 1
+
+    async def test_falls_back_to_stt_without_track(self, fake_youtube_dl, mock_stt_api, monkeypatch):
+        """Test videos without captions still go through STT"""
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        result = await transcribe_video("abc123", language="ko")
+
+        assert result.source == "stt"
+        assert result.text == mock_stt_api["text"]
+        assert fake_youtube_dl.extractions == 1
+        assert fake_youtube_dl.downloads == 1
+
+    async def test_falls_back_when_fetch_fails(self, captioned_video, mock_stt_api, monkeypatch):
+        """Test a failing caption fetch falls back to STT"""
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        async def failing_get(self, url, **kwargs):
+            raise RuntimeError("connection reset")
+
+        with patch("httpx.AsyncClient.get", new=failing_get):
+            result = await transcribe_video("abc123", language="ko")
+
+        assert result.source == "stt"
+        assert captioned_video.downloads == 1
+
+    def test_endpoint_reports_source(self, client, captioned_video, caption_server):
+        """Test /stt/video returns the source field"""
+        response = client.post("/stt/video/abc123?language=ko")
+
+        assert response.status_code == 200
+        assert response.json()["source"] == "captions"
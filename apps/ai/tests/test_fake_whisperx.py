@@ -0,0 +1,96 @@
+"""End-to-end STT tests against the bundled fake WhisperX server"""
+
+import asyncio
+import io
+import wave
+from contextlib import ExitStack
+from io import BytesIO
+
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import STTError
+from app.core.rate_limiter import limiter
+from app.services.video.stt_backends import get_stt_backend_pool
+from app.services.video.stt_client import STTClient
+from tools.fake_whisperx import FakeWhisperXConfig, audio_duration, running_server
+
+
+def _wav(seconds: float, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_whisperx(monkeypatch):
+    """Start a fake WhisperX server and point the STT endpoint pool at it"""
+    monkeypatch.setattr(get_settings(), "retry_base_delay", 0.0)
+    # Keep-alive connections belong to this test's event loop
+    monkeypatch.setattr("app.core.http_client._client", None)
+
+    with ExitStack() as stack:
+        def start(**options):
+            url, stats = stack.enter_context(running_server(FakeWhisperXConfig(seed=0, **options)))
+            monkeypatch.setattr(get_settings(), "stt_api_urls", url)
+            get_stt_backend_pool.cache_clear()
+            return stats
+
+        yield start
+
+
+class TestFakeWhisperX:
+    """Tests for the fake server and STTClient against it"""
+
+    def test_duration_from_wav_header_or_size(self):
+        """Test WAV duration is exact and other audio is estimated from its size"""
+        assert audio_duration(_wav(2.5), 3000) == 2.5
+        assert audio_duration(b"ID3" + b"\x00" * 5997, 3000) == 2.0
+
+    async def test_segments_follow_audio_duration(self, fake_whisperx):
+        """Test the result has one segment per segment_seconds of audio"""
+        fake_whisperx(segment_seconds=5.0)
+
+        result = await STTClient().transcribe(_wav(12), filename="speech.wav", language="ko")
+
+        assert [(s.start, s.end) for s in result.segments] == [(0.0, 5.0), (5.0, 10.0), (10.0, 12.0)]
+        assert result.language == "ko"
+
+    async def test_gpu_slots_bound_concurrency(self, fake_whisperx):
+        """Test requests beyond the GPU slots queue on the server"""
+        stats = fake_whisperx(gpu_slots=1, latency_base=0.05)
+
+        await asyncio.gather(*(
+            STTClient().transcribe(_wav(1), filename="speech.wav") for _ in range(3)
+        ))
+
+        assert stats.requests == 3
+        assert stats.peak_running == 1
+
+    async def test_errors_surface_as_unavailable(self, fake_whisperx):
+        """Test a failing server ends in STT_UNAVAILABLE after the retries"""
+        stats = fake_whisperx(error_rate=1.0)
+
+        with pytest.raises(STTError) as exc_info:
+            await STTClient().transcribe(_wav(1), filename="speech.wav")
+
+        assert exc_info.value.status_code == 503
+        assert stats.errors == get_settings().retry_max_attempts
+
+    def test_transcribe_endpoint_end_to_end(self, client, fake_whisperx):
+        """Test /stt/transcribe against the fake server over real HTTP"""
+        limiter.reset()
+        stats = fake_whisperx()
+        files = {"audio": ("speech.wav", BytesIO(_wav(7)), "audio/wav")}
+
+        response = client.post("/stt/transcribe", files=files, data={"language": "auto"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["language"] == "ko"
+        assert data["segments"][-1]["end"] == 7.0
+        assert stats.audio_seconds == 7.0
@@ -0,0 +1,73 @@
+"""Tests for the shared outbound HTTP client"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.http_client import close_http_client, get_http_client, pool_stats
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+async def fresh_client():
+    await close_http_client()
+    yield get_http_client()
+    await close_http_client()
+
+
+class TestSharedHttpClient:
+    """Tests for connection reuse and pool stats"""
+
+    async def test_client_is_shared(self, fresh_client):
+        """Test callers get the same pooled client"""
+        assert get_http_client() is fresh_client
+
+    async def test_connections_are_reused(self, fresh_client, local_server):
+        """Test sequential requests reuse one keep-alive connection"""
+        for _ in range(3):
+            response = await fresh_client.get(f"{local_server}/")
+            assert response.status_code == 200
+
+        stats = pool_stats()
+        assert stats["open"] is True
+        assert stats["connections"] == 1
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 0
+        assert stats["waiters"] == 0
+
+    async def test_closed_client_is_recreated(self, fresh_client):
+        """Test a closed client is replaced on next use"""
+        await close_http_client()
+
+        assert pool_stats() == {"open": False}
+        assert get_http_client() is not fresh_client
+
+    def test_pool_stats_in_metrics(self, client):
+        """Test pool stats are exposed on /metrics"""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert "http_pool" in response.json()["collectors"]
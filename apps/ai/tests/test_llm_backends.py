@@ -0,0 +1,197 @@
+"""Tests for the LLM backend pool against local OpenAI-compatible stub servers"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError
+from app.models.llm_schemas import TranslationBatch
+from app.services.shared.llm_backends import get_backend_pool
+from app.services.shared.llm_client import complete_structured
+
+
+class StubServer:
+    """Minimal OpenAI-compatible /v1/chat/completions server"""
+
+    def __init__(self, status: int = 200, content: str = '{"t": ["안녕"]}'):
+        self.status = status
+        self.content = content
+        self.requests: list[dict] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(json.loads(body))
+                if stub.status == 200:
+                    payload = {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": stub.requests[-1]["model"],
+                        "choices": [{
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": stub.content},
+                        }],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                    }
+                else:
+                    payload = {"error": {"message": "stub error", "type": "server_error"}}
+                data = json.dumps(payload).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_servers():
+    servers: list[StubServer] = []
+
+    def start(**kwargs) -> StubServer:
+        server = StubServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def configure_backends(monkeypatch):
+    """Point the backend pool at stub servers only"""
+    settings = get_settings()
+
+    def configure(backends: list[dict], failure_threshold: int = 3):
+        monkeypatch.setattr(settings, "llm_openai_weight", 0.0)
+        monkeypatch.setattr(settings, "llm_backends", json.dumps(backends))
+        monkeypatch.setattr(settings, "llm_backend_failure_threshold", failure_threshold)
+        get_backend_pool.cache_clear()
+        return get_backend_pool()
+
+    yield configure
+    get_backend_pool.cache_clear()
+
+
+async def _translate_call() -> TranslationBatch:
+    return await complete_structured(
+        endpoint="translate",
+        messages=[
+            {"role": "system", "content": "translate"},
+            {"role": "user", "content": '["hello"]'},
+        ],
+        response_model=TranslationBatch,
+        temperature=0.3,
+    )
+
+
+class TestBackendPool:
+    """Tests for backend selection, aliasing and failover"""
+
+    async def test_model_alias(self, stub_servers, configure_backends):
+        """Test the routed model is mapped to the backend's model name"""
+        server = stub_servers()
+        configure_backends([
+            {"name": "local", "base_url": server.base_url, "models": {"*": "local-model"}},
+        ])
+
+        result = await _translate_call()
+
+        assert result.t == ["안녕"]
+        assert server.requests[0]["model"] == "local-model"
+
+    async def test_failover_on_server_error(self, stub_servers, configure_backends):
+        """Test a 5xx backend fails over to the next backend"""
+        broken = stub_servers(status=503)
+        healthy = stub_servers()
+        pool = configure_backends([
+            {"name": "broken", "base_url": broken.base_url, "weight": 1e9},
+            {"name": "healthy", "base_url": healthy.base_url, "weight": 1e-9},
+        ])
+
+        result = await _translate_call()
+
+        assert result.t == ["안녕"]
+        assert len(broken.requests) == 1
+        assert len(healthy.requests) == 1
+        state = pool.snapshot()
+        assert state["broken"]["consecutive_failures"] == 1
+        assert state["broken"]["health"] < state["healthy"]["health"]
+
+    async def test_failover_on_connection_error(self, stub_servers, configure_backends):
+        """Test an unreachable backend fails over to the next backend"""
+        closed = stub_servers()
+        closed.close()
+        healthy = stub_servers()
+        configure_backends([
+            {"name": "closed", "base_url": closed.base_url, "weight": 1e9},
+            {"name": "healthy", "base_url": healthy.base_url, "weight": 1e-9},
+        ])
+
+        result = await _translate_call()
+
+        assert result.t == ["안녕"]
+        assert len(healthy.requests) == 1
+
+    async def test_client_error_does_not_fail_over(self, stub_servers, configure_backends):
+        """Test 4xx errors are raised without trying other backends"""
+        rejecting = stub_servers(status=400)
+        healthy = stub_servers()
+        configure_backends([
+            {"name": "rejecting", "base_url": rejecting.base_url, "weight": 1e9},
+            {"name": "healthy", "base_url": healthy.base_url, "weight": 1e-9},
+        ])
+
+        with pytest.raises(Exception):
+            await _translate_call()
+
+        assert healthy.requests == []
+
+    async def test_cooldown_moves_backend_last(self, stub_servers, configure_backends):
+        """Test a backend past the failure threshold is tried last"""
+        broken = stub_servers(status=500)
+        healthy = stub_servers()
+        pool = configure_backends(
+            [
+                {"name": "broken", "base_url": broken.base_url, "weight": 1e9},
+                {"name": "healthy", "base_url": healthy.base_url, "weight": 1e-9},
+            ],
+            failure_threshold=1,
+        )
+
+        await _translate_call()
+
+        assert pool.snapshot()["broken"]["cooling_down"] is True
+        assert [b.name for b in pool.candidates()] == ["healthy", "broken"]
+
+        await _translate_call()
+        assert len(broken.requests) == 1
+        assert len(healthy.requests) == 2
+
+    def test_invalid_backend_config(self, configure_backends):
+        """Test malformed LLM_BACKENDS is a configuration error"""
+        with pytest.raises(AIServiceError) as exc_info:
+            configure_backends([{"base_url": "http://localhost"}])
+
+        assert exc_info.value.code.value == "CONFIGURATION_ERROR"
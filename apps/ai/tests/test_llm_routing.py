@@ -0,0 +1,91 @@
+"""Tests for LLM routing policy"""
+
+import os
+os.environ["OPENAI_API_KEY"] = "sk-test"
+
+import pytest
+
+from app.config import Settings, get_settings
+from app.services.shared.llm_routing import estimate_tokens, plan_route
+
+
+@pytest.fixture
+def tiered_settings(monkeypatch):
+    """Settings with small and large model tiers configured"""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "llm_model_small", "small-model")
+    monkeypatch.setattr(settings, "llm_model_large", "large-model")
+    monkeypatch.setattr(settings, "llm_small_input_tokens", 1000)
+    monkeypatch.setattr(settings, "llm_large_input_tokens", 20000)
+    return settings
+
+
+def _messages(user_text: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": user_text},
+    ]
+
+
+class TestPlanRoute:
+    """Tests for model / max_tokens / timeout selection"""
+
+    def test_small_input_uses_small_model(self, tiered_settings):
+        """Test a one-line lookup goes to the small tier"""
+        route = plan_route("word_lookup", _messages("조회할 단어/구문: resilient"))
+
+        assert route.tier == "small"
+        assert route.model == "small-model"
+        assert route.max_tokens == 500
+
+    def test_large_input_uses_large_model(self, tiered_settings):
+        """Test a long transcript goes to the large tier"""
+        route = plan_route("video_analyze", _messages("가" * 30000))
+
+        assert route.tier == "large"
+        assert route.model == "large-model"
+
+    def test_default_tier_when_unconfigured(self, monkeypatch):
+        """Test empty tier models fall back to openai_model"""
+        settings = get_settings()
+        monkeypatch.setattr(settings, "llm_model_small", "")
+
+        route = plan_route("word_lookup", _messages("word"))
+
+        assert route.tier == "default"
+        assert route.model == settings.openai_model
+
+    def test_budget_scales_with_input(self, tiered_settings):
+        """Test proportional budgets grow with input and are capped"""
+        short = plan_route("article_analyze", _messages("Short article."))
+        long = plan_route("article_analyze", _messages("word " * 20000))
+
+        assert short.max_tokens < long.max_tokens
+        assert long.max_tokens == tiered_settings.llm_max_output_tokens
+
+    def test_timeout_bounds(self, tiered_settings):
+        """Test timeouts stay within configured bounds"""
+        short = plan_route("word_lookup", _messages("word"))
+        long = plan_route("article_analyze", _messages("word " * 20000))
+
+        assert short.timeout >= tiered_settings.llm_timeout_min
+        assert long.timeout <= tiered_settings.llm_timeout_max
+        assert short.timeout < long.timeout
+
+    def test_legacy_timeout_analyze_still_loads(self, tmp_path):
+        """Test an old .env with TIMEOUT_ANALYZE loads instead of failing extra_forbidden"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("TIMEOUT_ANALYZE=45\n")
+
+        settings = Settings(_env_file=env_file)
+
+        assert settings.timeout_analyze == 45
+
+
+class TestEstimateTokens:
+    """Tests for token estimation"""
+
+    def test_ascii_vs_hangul(self):
+        """Test Hangul counts roughly one token per character"""
+        assert estimate_tokens("a" * 400) == 101
+        assert estimate_tokens("가" * 100) == 101
@@ -0,0 +1,180 @@
+"""Tests for the compact LLM response protocol and strict schemas"""
+
+import os
+os.environ["OPENAI_API_KEY"] = "sk-test"
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.exceptions import LLMError
+from app.models import AnalysisResult
+from app.models.article_schemas import ArticleAnalysisResult, WordLookupResult
+from app.models.llm_schemas import (
+    CompactAnalysis,
+    CompactArticleAnalysis,
+    CompactStudyAnalysis,
+    TranslationBatch,
+)
+from app.models.study_schemas import StudyAnalysisResult
+from app.services.shared.llm_client import parse_structured, strict_json_schema
+from app.services.shared.sentences import split_sentences
+
+
+def _response(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content, refusal=None))]
+    return response
+
+
+class TestCompactAnalysis:
+    """Tests for video analysis conversion"""
+
+    def test_to_result(self):
+        """Test short keys map to public field names"""
+        compact = CompactAnalysis.model_validate_json(
+            '{"s": "요약", "sc": 12, "r": "근거", "k": ["키워드"], "h": [{"t": 120, "n": "제목", "d": "설명"}]}'
+        )
+        result = compact.to_result()
+
+        assert result.summary == "요약"
+        assert result.watch_score == 10  # clamped
+        assert result.watch_score_reason == "근거"
+        assert result.highlights[0].timestamp == 120
+        assert result.highlights[0].title == "제목"
+
+    def test_long_highlight_text_is_truncated(self):
+        """Test highlight text is cut to the public field limits"""
+        compact = CompactAnalysis(s="요약", sc=5, r="근거", k=[], h=[{"t": -5, "n": "가" * 80, "d": "나" * 200}])
+        highlight = compact.to_result().highlights[0]
+
+        assert highlight.timestamp == 0
+        assert len(highlight.title) == 50
+        assert len(highlight.description) == 100
+
+
+class TestCompactArticleAnalysis:
+    """Tests for article analysis conversion"""
+
+    def test_rebuilds_sentences_from_source(self):
+        """Test originals come from the server-side split"""
+        compact = CompactArticleAnalysis(
+            t=["첫 문장.", "둘째 문장."],
+            x=[{"e": "break the ice", "m": "어색함을 깨다", "c": "idiom", "i": 1, "f": "broke the ice"}],
+        )
+        result = compact.to_result(["First one.", "They broke the ice."], 12.34)
+
+        assert result.sentences[1].original == "They broke the ice."
+        assert result.sentences[1].translated == "둘째 문장."
+        assert result.expressions[0].sentence_id == 1
+        assert result.expressions[0].context == "broke the ice"
+        assert result.meta.sentence_count == 2
+
+    def test_missing_translation_keeps_positions(self):
+        """Test a short translation array does not shift sentences"""
+        result = CompactArticleAnalysis(t=["하나"], x=[]).to_result(["One.", "Two."], 0)
+
+        assert result.sentences[1].original == "Two."
+        assert result.sentences[1].translated == ""
+
+
+class TestStrictSchema:
+    """Tests for structured-output schema generation"""
+
+    def test_objects_are_closed_and_required(self):
+        """Test every object forbids extra keys and requires all fields"""
+        schema = strict_json_schema(CompactAnalysis)
+        highlight = schema["$defs"]["CompactHighlight"]
+
+        assert schema["additionalProperties"] is False
+        assert schema["required"] == ["s", "sc", "r", "k", "h"]
+        assert highlight["additionalProperties"] is False
+        assert highlight["required"] == ["t", "n", "d"]
+
+    def test_aliases_and_optional_fields(self):
+        """Test public models use aliases and keep nullable fields required"""
+        schema = strict_json_schema(WordLookupResult)
+
+        assert "contextMeaning" in schema["properties"]
+        assert "pronunciation" in schema["required"]
+        assert "default" not in schema["properties"]["pronunciation"]
+
+
+def _size(payload) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+
+
+class TestCompactSize:
+    """Guards the token savings of the compact protocol against the verbose one"""
+
+    @pytest.mark.parametrize("compact, verbose", [
+        (CompactAnalysis, AnalysisResult),
+        (CompactArticleAnalysis, ArticleAnalysisResult),
+        (CompactStudyAnalysis, StudyAnalysisResult),
+    ])
+    def test_schema_is_smaller(self, compact, verbose):
+        """Test the strict schema sent with every request is smaller"""
+        assert _size(strict_json_schema(compact)) < _size(strict_json_schema(verbose))
+
+    def test_analysis_output_is_smaller(self):
+        """Test the same analysis costs fewer characters in short keys"""
+        compact = CompactAnalysis(
+            s="요약", sc=8, r="근거", k=["AI", "LLM"],
+            h=[{"t": 60 * i, "n": "제목", "d": "설명"} for i in range(5)],
+        )
+        verbose = compact.to_result().model_dump(mode="json", by_alias=True)
+
+        assert _size(compact.model_dump()) < _size(verbose) * 0.75
+
+    def test_translation_output_is_smaller(self):
+        """Test positional translations are smaller than the old id/text objects"""
+        texts = [f"번역된 자막 {idx}" for idx in range(20)]
+        verbose = {"translations": [{"id": idx, "text": text} for idx, text in enumerate(texts)]}
+
+        assert _size(TranslationBatch(t=texts).model_dump()) < _size(verbose) * 0.75
+
+    def test_article_output_drops_echoed_sentences(self):
+        """Test the model no longer echoes original sentences back"""
+        sentences = [f"This is the original sentence number {idx}." for idx in range(10)]
+        compact = CompactArticleAnalysis(t=[f"원문 문장 {idx}번입니다." for idx in range(10)], x=[])
+        verbose = compact.to_result(sentences, 1.0).model_dump(mode="json", by_alias=True)
+        del verbose["meta"]  # computed on the server in both protocols
+
+        assert _size(compact.model_dump()) < _size(verbose) * 0.5
+
+
+class TestParseStructured:
+    """Tests for parsing responses into models"""
+
+    def test_parses_into_model(self):
+        """Test content is validated straight into the model"""
+        result = parse_structured(_response('{"t": ["하나", "둘"]}'), TranslationBatch)
+        assert result.t == ["하나", "둘"]
+
+    def test_malformed_response(self):
+        """Test malformed content raises LLMError instead of a 400"""
+        with pytest.raises(LLMError):
+            parse_structured(_response('{"t": "not a list"'), TranslationBatch)
+
+
+class TestSplitSentences:
+    """Tests for server-side sentence splitting"""
+
+    def test_abbreviations(self):
+        """Test abbreviations and decimals don't end sentences"""
+        text = "Dr. Kim met U.S. officials on Jan. 5. Prices rose 3.5% in May!"
+        assert split_sentences(text) == [
+            "Dr. Kim met U.S. officials on Jan. 5.",
+            "Prices rose 3.5% in May!",
+        ]
+
+    def test_quotes(self):
+        """Test closing quotes stay with their sentence"""
+        text = '"Is it over?" she asked. "Yes." He left.'
+        assert split_sentences(text) == ['"Is it over?" she asked.', '"Yes."', "He left."]
+
+    def test_korean_and_line_breaks(self):
+        """Test Korean sentences and line breaks"""
+        text = "오늘 날씨가 좋습니다. 내일은 비가 온대요!\n새 문단입니다"
+        assert split_sentences(text) == ["오늘 날씨가 좋습니다.", "내일은 비가 온대요!", "새 문단입니다"]
@@ -0,0 +1,274 @@
+"""Tests for scratch spooling (disk quota, file-backed reads)"""
+
+import gc
+import hashlib
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+from app.api.video.uploads import ScratchRequest
+from app.config import get_settings
+from app.core.exceptions import AIServiceError
+from app.core.rate_limiter import limiter
+from app.services.video.audio_normalizer import normalize_audio
+from app.services.video.multipart_stream import BytesSource, FileSource, backing_file, spool_source
+from app.services.video.scratch import ScratchFile, ScratchSpace, get_scratch_space
+from app.services.video.transcript_cache import hash_source
+
+# Stands in for ffmpeg: copies the -i input (stdin or a path) to stdout,
+# keeping every other byte so output is smaller
+RECORDING_FFMPEG = """
+args = sys.argv[1:]
+src = args[args.index("-i") + 1]
+data = sys.stdin.buffer.read() if src == "pipe:0" else open(src, "rb").read()
+sys.stdout.buffer.write(data[::2])
+"""
+
+
+@pytest.fixture
+def scratch_settings(tmp_path, monkeypatch):
+    """Fresh process scratch space in tmp_path with a 1MB memory threshold"""
+    monkeypatch.setattr(get_settings(), "scratch_dir", str(tmp_path / "scratch"))
+    monkeypatch.setattr(get_settings(), "scratch_memory_threshold_mb", 1)
+    get_scratch_space.cache_clear()
+    yield get_settings()
+    get_scratch_space.cache_clear()
+
+
+@pytest.fixture
+def recording_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(RECORDING_FFMPEG)
+
+
+class TestScratchSpace:
+    """Tests for quota accounting"""
+
+    def test_memory_spool_is_free(self, tmp_path):
+        """Test data below the memory threshold doesn't count"""
+        space = ScratchSpace(str(tmp_path), memory_threshold=1024, quota_bytes=4096)
+        spool = space.spool()
+        spool.write(b"a" * 1000)
+
+        assert space.stats()["used_bytes"] == 0
+        spool.close()
+
+    def test_disk_use_counted_and_released(self, tmp_path):
+        """Test rollover and later writes count until close()"""
+        space = ScratchSpace(str(tmp_path), memory_threshold=1024, quota_bytes=10_000)
+        spool = space.spool()
+        spool.write(b"a" * 2000)
+        spool.write(b"b" * 500)
+
+        assert spool._rolled
+        assert space.stats()["used_bytes"] == 2500
+        spool.close()
+        assert space.stats()["used_bytes"] == 0
+
+    def test_quota_exceeded(self, tmp_path):
+        """Test writes beyond the quota get 503 and give the space back on close"""
+        space = ScratchSpace(str(tmp_path), memory_threshold=1024, quota_bytes=4096)
+        first = space.spool()
+        first.write(b"a" * 3000)
+        second = space.spool()
+
+        with pytest.raises(AIServiceError) as exc_info:
+            second.write(b"b" * 2000)
+
+        assert exc_info.value.status_code == 503
+        second.close()
+        first.close()
+        assert space.stats()["used_bytes"] == 0
+
+    def test_dropped_file_releases_quota(self, tmp_path):
+        """Test a spool that is never closed (e.g. cancelled job) is released on collection"""
+        space = ScratchSpace(str(tmp_path), memory_threshold=10, quota_bytes=4096)
+        spool = space.spool()
+        spool.write(b"a" * 100)
+        assert space.stats()["used_bytes"] == 100
+
+        del spool
+        gc.collect()
+
+        assert space.stats()["used_bytes"] == 0
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses /proc")
+    def test_files_live_in_scratch_dir(self, tmp_path):
+        """Test rolled spools are created in the scratch directory"""
+        directory = tmp_path / "scratch"
+        space = ScratchSpace(str(directory), memory_threshold=10, quota_bytes=0)
+        spool = space.spool()
+        spool.write(b"a" * 100)
+
+        assert os.readlink(f"/proc/self/fd/{spool.fileno()}").startswith(str(directory))
+        spool.close()
+
+
+class TestFileBackedSources:
+    """Tests for reading spooled audio through file handles"""
+
+    async def test_spool_source_respects_quota(self, scratch_settings, monkeypatch):
+        """Test copying an upload beyond the quota fails and frees what was taken"""
+        monkeypatch.setattr(scratch_settings, "scratch_quota_mb", 1)
+        get_scratch_space.cache_clear()
+
+        with pytest.raises(AIServiceError):
+            await spool_source(BytesSource(b"a" * (3 * 1024 * 1024)))
+
+        gc.collect()
+        assert get_scratch_space().stats()["used_bytes"] == 0
+
+    async def test_backing_file(self, scratch_settings, tmp_path):
+        """Test only sources already on disk expose their file"""
+        small = await spool_source(BytesSource(b"a" * 100))
+        large = await spool_source(BytesSource(b"a" * (2 * 1024 * 1024)))
+        path = tmp_path / "audio.m4a"
+        path.write_bytes(b"a")
+        on_disk = FileSource(path)
+        try:
+            assert backing_file(BytesSource(b"a")) is None
+            assert backing_file(small) is None
+            assert backing_file(large) is not None
+            assert backing_file(on_disk) is not None
+        finally:
+            small.close()
+            large.close()
+            on_disk.close()
+
+    async def test_hash_through_mmap(self, scratch_settings):
+        """Test hashing a disk-backed spool matches hashing the bytes"""
+        data = bytes(range(256)) * 8192  # 2MB, rolls to disk
+        source = await spool_source(BytesSource(data))
+        try:
+            digest = await hash_source(source)
+            assert await source.read(4) == data[:4]
+        finally:
+            source.close()
+
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert await hash_source(BytesSource(data)) == digest
+
+    async def test_ffmpeg_reads_file_directly(self, scratch_settings, recording_ffmpeg):
+        """Test ffmpeg opens disk-backed sources as /dev/fd/N instead of stdin"""
+        data = bytes(range(256)) * 8192
+        source = await spool_source(BytesSource(data))
+        try:
+            normalized = await normalize_audio(source, source.size)
+        finally:
+            source.close()
+
+        args = recording_ffmpeg.args
+        assert args[args.index("-i") + 1].startswith("/dev/fd/")
+        assert normalized.size == len(data) // 2
+        normalized.close()
+
+    async def test_memory_sources_use_stdin(self, scratch_settings, recording_ffmpeg):
+        """Test in-memory sources are still piped through stdin"""
+        normalized = await normalize_audio(BytesSource(b"a" * 1000), 1000)
+
+        args = recording_ffmpeg.args
+        assert args[args.index("-i") + 1] == "pipe:0"
+        normalized.close()
+
+    async def test_form_parser_spools_into_scratch(self, scratch_settings):
+        """Test uploads are spooled by the scratch space while the form is parsed"""
+        boundary = "scratch-boundary"
+        data = b"\x01" * (2 * 1024 * 1024)
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="audio"; filename="a.mp3"\r\n'
+            "Content-Type: audio/mpeg\r\n\r\n"
+        ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            return messages.pop(0)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/stt/transcribe",
+            "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())],
+        }
+        form = await ScratchRequest(scope, receive).form()
+        upload = form["audio"]
+
+        assert isinstance(upload.file, ScratchFile)
+        assert upload.file._rolled
+        assert get_scratch_space().stats()["used_bytes"] == len(data)
+        assert await upload.read() == data
+
+        await form.close()
+        assert get_scratch_space().stats()["used_bytes"] == 0
+
+    async def test_form_parser_fields_across_chunks(self, scratch_settings):
+        """Test fields and files are parsed from a body split into small chunks"""
+        boundary = "scratch-boundary"
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="language"\r\n\r\n'
+            f"ko\r\n--{boundary}\r\n"
+            'Content-Disposition: form-data; name="audio"; filename="녹음.mp3"\r\n'
+            "Content-Type: audio/mpeg\r\n\r\n"
+            f"ID3 audio\r\n--{boundary}--\r\n"
+        ).encode()
+        messages = [
+            {"type": "http.request", "body": body[i:i + 7], "more_body": i + 7 < len(body)}
+            for i in range(0, len(body), 7)
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/stt/transcribe",
+            "headers": [(b"content-type", f"multipart/form-data; boundary={boundary}".encode())],
+        }
+        form = await ScratchRequest(scope, receive).form()
+
+        assert form["language"] == "ko"
+        assert form["audio"].filename == "녹음.mp3"
+        assert form["audio"].content_type == "audio/mpeg"
+        assert await form["audio"].read() == b"ID3 audio"
+        await form.close()
+
+    def test_malformed_upload_releases_scratch(self, client, scratch_settings, monkeypatch):
+        """Test a part without a name gets 400 and closes the files spooled so far"""
+        space = get_scratch_space()
+        spools = []
+        spool = space.spool
+        monkeypatch.setattr(space, "spool", lambda: spools.append(spool()) or spools[-1])
+        limiter.reset()
+        boundary = "scratch-boundary"
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="audio"; filename="a.mp3"\r\n\r\n'
+            f"ID3 audio\r\n--{boundary}\r\n"
+            "Content-Disposition: form-data\r\n\r\n"
+            f"x\r\n--{boundary}--\r\n"
+        ).encode()
+
+        response = client.post(
+            "/stt/transcribe",
+            content=body,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+
+        assert response.status_code == 400
+        assert len(spools) == 1
+        assert spools[0].closed
+
+    def test_upload_over_quota_rejected(self, client, scratch_settings, monkeypatch):
+        """Test /stt/transcribe counts the spooled upload against the quota"""
+        monkeypatch.setattr(scratch_settings, "scratch_quota_mb", 1)
+        get_scratch_space.cache_clear()
+        limiter.reset()
+        files = {"audio": ("test.mp3", BytesIO(b"ID3" + b"\x00" * (2 * 1024 * 1024)), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 503
+        assert get_scratch_space().stats()["used_bytes"] == 0
@@ -0,0 +1,267 @@
+"""Tests for the STT endpoint pool against local WhisperX stub servers"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, STTError
+from app.services.video.stt_backends import get_stt_backend_pool
+from app.services.video.stt_client import STTClient
+
+
+class StubServer:
+    """Minimal WhisperX server: POST /whisperX/transcribe, GET /"""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.requests = 0
+        self.probes = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.probes += 1
+                self._send(stub.status, {"status": "ok"})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests += 1
+                self._send(stub.status, {
+                    "text": "안녕하세요",
+                    "language": "ko",
+                    "language_probability": 0.9,
+                    "segments": [{"start": 0.0, "end": 1.0, "text": "안녕하세요"}],
+                })
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def name(self) -> str:
+        return f"127.0.0.1:{self.server.server_port}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_servers():
+    servers: list[StubServer] = []
+
+    def start(**kwargs) -> StubServer:
+        server = StubServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def configure_endpoints(monkeypatch):
+    """Point the STT endpoint pool at stub servers (no retry backoff)"""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "retry_base_delay", 0.0)
+
+    def configure(servers: list[StubServer], failure_threshold: int = 3, cooldown: float = 30.0):
+        monkeypatch.setattr(settings, "stt_api_urls", ",".join(s.url for s in servers))
+        monkeypatch.setattr(settings, "stt_backend_failure_threshold", failure_threshold)
+        monkeypatch.setattr(settings, "stt_backend_cooldown_seconds", cooldown)
+        get_stt_backend_pool.cache_clear()
+        return get_stt_backend_pool()
+
+    return configure
+
+
+async def _transcribe():
+    return await STTClient().transcribe(b"ID3fake audio", filename="test.mp3", language="ko")
+
+
+class TestSTTBackendPool:
+    """Tests for endpoint selection, failover, ejection and re-probing"""
+
+    def test_single_url_fallback(self, monkeypatch):
+        """Test STT_API_URL alone gives a one-endpoint pool"""
+        monkeypatch.setattr(get_settings(), "stt_api_urls", "")
+        get_stt_backend_pool.cache_clear()
+
+        assert [b.url for b in get_stt_backend_pool().backends] == [get_settings().stt_api_url]
+
+    def test_duplicate_endpoints_rejected(self, monkeypatch):
+        """Test the same endpoint listed twice is a configuration error"""
+        monkeypatch.setattr(get_settings(), "stt_api_urls", "http://stt-1:1,http://stt-1:1/")
+        get_stt_backend_pool.cache_clear()
+
+        with pytest.raises(AIServiceError) as exc_info:
+            get_stt_backend_pool()
+
+        assert exc_info.value.code.value == "CONFIGURATION_ERROR"
+
+    def test_least_outstanding_first(self, stub_servers, configure_endpoints):
+        """Test concurrent requests spread over idle endpoints"""
+        pool = configure_endpoints([stub_servers(), stub_servers()])
+
+        first = pool.acquire()
+        second = pool.acquire()
+
+        assert first is not second
+        assert first.outstanding == second.outstanding == 1
+
+    def test_slow_endpoint_gets_less_traffic(self, stub_servers, configure_endpoints):
+        """Test outstanding requests are weighted by observed latency"""
+        fast_server, slow_server = stub_servers(), stub_servers()
+        pool = configure_endpoints([fast_server, slow_server])
+        fast, slow = pool.backends
+        fast.latency, slow.latency = 1.0, 10.0
+
+        picks = [pool.acquire().name for _ in range(5)]
+
+        # The fast endpoint takes requests until (n + 1) x 1s passes 10s
+        assert picks == [fast.name] * 5
+
+    async def test_requests_are_spread(self, stub_servers, configure_endpoints):
+        """Test concurrent requests reach every endpoint and record latency"""
+        servers = [stub_servers(), stub_servers()]
+        pool = configure_endpoints(servers)
+
+        results = await asyncio.gather(*(_transcribe() for _ in range(4)))
+
+        assert all(result.text == "안녕하세요" for result in results)
+        assert [server.requests for server in servers] == [2, 2]
+        assert all(b.latency > 0 and b.outstanding == 0 for b in pool.backends)
+
+    async def test_failover_on_server_error(self, stub_servers, configure_endpoints):
+        """Test a 5xx endpoint fails over to the next one"""
+        broken, healthy = stub_servers(status=503), stub_servers()
+        pool = configure_endpoints([broken, healthy])
+        pool.backends[0].latency, pool.backends[1].latency = 1.0, 100.0  # broken is tried first
+
+        result = await _transcribe()
+
+        assert result.text == "안녕하세요"
+        assert (broken.requests, healthy.requests) == (1, 1)
+        assert pool.snapshot()[broken.name]["consecutive_failures"] == 1
+
+    async def test_client_error_does_not_fail_over(self, stub_servers, configure_endpoints):
+        """Test 4xx responses are raised without trying other endpoints"""
+        rejecting, healthy = stub_servers(status=400), stub_servers()
+        pool = configure_endpoints([rejecting, healthy])
+        pool.backends[0].latency, pool.backends[1].latency = 1.0, 100.0
+
+        with pytest.raises(STTError):
+            await _transcribe()
+
+        assert healthy.requests == 0
+        assert pool.backends[0].consecutive_failures == 0
+        assert pool.backends[0].outstanding == 0
+
+    async def test_failing_endpoint_is_ejected(self, stub_servers, configure_endpoints):
+        """Test an endpoint past the failure threshold leaves the rotation"""
+        broken, healthy = stub_servers(status=500), stub_servers()
+        pool = configure_endpoints([broken, healthy], failure_threshold=1)
+        pool.backends[0].latency, pool.backends[1].latency = 1.0, 100.0
+
+        await _transcribe()
+        await _transcribe()
+
+        assert pool.snapshot()[broken.name]["ejected"] is True
+        assert [b.name for b in pool.candidates()] == [healthy.name, broken.name]
+        assert (broken.requests, healthy.requests) == (1, 2)
+
+    async def test_ejected_endpoint_rejoins_after_probe(self, stub_servers, configure_endpoints):
+        """Test an ejected endpoint is re-probed after its cooldown and restored"""
+        flaky, healthy = stub_servers(status=500), stub_servers()
+        pool = configure_endpoints([flaky, healthy], failure_threshold=1, cooldown=0.0)
+        backend = pool.backends[0]
+        pool.backends[0].latency, pool.backends[1].latency = 1.0, 100.0
+
+        await _transcribe()
+        assert backend.ejected is True
+
+        assert await pool.probe(backend) is False  # still failing
+        assert backend.ejected is True
+
+        flaky.status = 200
+        assert await pool.probe(backend) is True
+        assert backend.ejected is False
+        assert pool.candidates()[0] is backend
+
+    async def test_all_endpoints_down(self, stub_servers, configure_endpoints):
+        """Test the request fails as unavailable once every endpoint failed"""
+        servers = [stub_servers(status=502), stub_servers(status=502)]
+        configure_endpoints(servers)
+
+        with pytest.raises(STTError) as exc_info:
+            await _transcribe()
+
+        assert exc_info.value.status_code == 503
+        assert sum(server.requests for server in servers) == get_settings().retry_max_attempts
+
+
+class TestHealthBackends:
+    """Tests for STT endpoint state in /health and /metrics"""
+
+    def test_health_is_boolean_only(self, client, stub_servers, configure_endpoints):
+        """Test public /health is ok while one endpoint answers and names none of them"""
+        up, down = stub_servers(), stub_servers(status=503)
+        configure_endpoints([up, down])
+
+        response = client.get("/health")
+        data = response.json()
+
+        assert data["services"]["stt_api"] is True
+        assert set(data) == {"status", "version", "services"}
+        assert up.name not in response.text and down.name not in response.text
+        assert up.probes == down.probes == 1
+
+    async def test_health_does_not_readmit(self, async_client, stub_servers, configure_endpoints):
+        """Test an ejected endpoint stays ejected when /health finds it reachable"""
+        flaky, healthy = stub_servers(status=500), stub_servers()
+        pool = configure_endpoints([flaky, healthy], failure_threshold=1)
+        backend = pool.backends[0]
+        pool.backends[0].latency, pool.backends[1].latency = 1.0, 100.0
+        await _transcribe()
+        assert backend.ejected is True
+
+        flaky.status = 200
+        response = await async_client.get("/health")
+
+        assert response.json()["services"]["stt_api"] is True
+        assert flaky.probes == 1
+        assert backend.ejected is True
+        assert pool.candidates()[0] is not backend
+
+    def test_endpoint_state_on_metrics(self, client, stub_servers, configure_endpoints, monkeypatch):
+        """Test per-endpoint state is on /metrics, which requires the API key"""
+        server = stub_servers()
+        configure_endpoints([server])
+        monkeypatch.setattr(get_settings(), "internal_api_key", "secret")
+
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", headers={"X-Internal-API-Key": "secret"})
+
+        backends = response.json()["collectors"]["stt_backends"]
+        assert backends[server.name]["url"] == server.url
+        assert backends[server.name]["ejected"] is False
@@ -0,0 +1,135 @@
+"""Tests for chunked STT (planning, stitching and the concurrent pipeline)"""
+
+import asyncio
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.models import STTResponse, STTSegment
+from app.services.video.stt_chunking import plan_chunks, stitch_chunks
+from app.services.video.stt_pipeline import transcribe_audio
+
+PASSTHROUGH_FFMPEG = """
+import shutil
+shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)
+"""
+
+
+def _response(*segments: tuple[float, float, str], language: str = "ko") -> STTResponse:
+    return STTResponse(
+        text=" ".join(text for _, _, text in segments),
+        language=language,
+        language_probability=0.9,
+        segments=[STTSegment(start=s, end=e, text=t) for s, e, t in segments],
+    )
+
+
+class TestPlanChunks:
+    """Tests for chunk windows"""
+
+    def test_short_audio_single_chunk(self):
+        """Test audio under the chunk length isn't split"""
+        assert plan_chunks(300.0, 600, 5.0) == [(0.0, 300.0)]
+
+    def test_disabled(self):
+        """Test chunk_seconds=0 disables chunking"""
+        assert plan_chunks(7200.0, 0, 5.0) == [(0.0, 7200.0)]
+
+    def test_long_audio_overlapping_windows(self):
+        """Test a 2-hour file becomes equal overlapping chunks"""
+        windows = plan_chunks(7200.0, 600, 5.0)
+
+        assert len(windows) == 13
+        assert windows[0][0] == 0.0
+        assert windows[-1][1] == 7200.0
+        assert all(end - start <= 600 for start, end in windows)
+        for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+            assert prev_end - next_start == pytest.approx(5.0, abs=0.01)
+
+
+class TestStitchChunks:
+    """Tests for merging chunk results"""
+
+    def test_offsets_and_dedupes_overlap(self):
+        """Test overlap duplicates are kept once, split at the midpoint"""
+        windows = [(0.0, 10.0), (8.0, 18.0)]
+        results = [
+            _response((0.0, 3.0, "하나"), (7.0, 9.5, "둘")),
+            _response((0.0, 1.5, "둘"), (2.0, 5.0, "셋")),
+        ]
+
+        stitched = stitch_chunks(windows, results)
+
+        assert [(s.start, s.end, s.text) for s in stitched.segments] == [
+            (0.0, 3.0, "하나"),
+            (7.0, 9.5, "둘"),
+            (10.0, 13.0, "셋"),
+        ]
+        assert stitched.text == "하나 둘 셋"
+
+    def test_single_chunk_unchanged(self):
+        """Test one chunk is returned as-is"""
+        result = _response((1.0, 2.0, "안녕"))
+
+        assert stitch_chunks([(0.0, 5.0)], [result]) is result
+
+
+class TestChunkedPipeline:
+    """Tests for concurrent chunk transcription"""
+
+    @pytest.fixture
+    def chunked_settings(self, install_ffmpeg, monkeypatch):
+        install_ffmpeg(PASSTHROUGH_FFMPEG)
+        settings = get_settings()
+        monkeypatch.setattr(settings, "stt_vad_enabled", False)
+        monkeypatch.setattr(settings, "stt_chunk_seconds", 4)
+        monkeypatch.setattr(settings, "stt_chunk_overlap_seconds", 1.0)
+        monkeypatch.setattr(settings, "stt_chunk_concurrency", 2)
+        monkeypatch.setattr(settings, "retry_base_delay", 0.01)
+        return settings
+
+    async def test_chunks_run_concurrently_and_retry(self, chunked_settings):
+        """Test chunks are bounded by the concurrency limit and retried alone"""
+        pcm = b"\x00\x01" * 16000 * 9  # 9s of 16 kHz s16le
+        calls: list[int] = []
+        in_flight = 0
+        max_in_flight = 0
+        failed_once = set()
+
+        async def mock_post(self, url, content=None, headers=None, **kwargs):
+            nonlocal in_flight, max_in_flight
+            body = b"".join([chunk async for chunk in content])
+            idx = int(re.search(rb'filename="audio\.part(\d+)\.', body).group(1))
+            calls.append(idx)
+
+            if idx == 1 and idx not in failed_once:
+                failed_once.add(idx)
+                raise httpx.ConnectError("connection reset")
+
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+
+            response = MagicMock()
+            response.content = json.dumps({
+                "text": f"청크{idx}",
+                "language": "ko",
+                "segments": [{"start": 0.5, "end": 1.5, "text": f"청크{idx}"}],
+            }).encode()
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=mock_post):
+            result = await transcribe_audio(pcm, filename="audio.wav")
+
+        assert sorted(calls) == [0, 1, 1, 2]
+        assert max_in_flight <= 2
+        assert [s.text for s in result.segments] == ["청크0", "청크1", "청크2"]
+        starts = [s.start for s in result.segments]
+        assert starts == sorted(starts)
+        assert starts[0] == pytest.approx(0.5)
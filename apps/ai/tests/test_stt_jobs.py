@@ -0,0 +1,305 @@
+"""Tests for asynchronous STT jobs (worker pool, progress, job endpoints)"""
+
+import asyncio
+import json
+import time
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import AIServiceError, ErrorCode, STTError
+from app.core.rate_limiter import limiter
+from app.models import STTResponse, STTSegment
+from app.services.video.stt_jobs import STTJobManager, get_job_manager
+from app.services.video.stt_progress import TRANSCRIBING, report_progress
+from main import app
+
+
+def _response(text: str = "안녕하세요") -> STTResponse:
+    return STTResponse(
+        text=text,
+        language="ko",
+        language_probability=0.9,
+        segments=[STTSegment(start=0.0, end=1.0, text=text)],
+    )
+
+
+@pytest.fixture
+async def manager():
+    manager = STTJobManager(workers=2, queue_size=2, retention_seconds=60)
+    yield manager
+    await manager.stop()
+
+
+@pytest.fixture
+def jobs_client():
+    """Test client with lifespan, so job workers outlive single requests"""
+    limiter.reset()
+    with TestClient(app) as client:
+        yield client
+    get_job_manager.cache_clear()
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(f"/stt/jobs/{job_id}").json()
+        if data["status"] in ("completed", "failed"):
+            return data
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestSTTJobManager:
+    """Tests for the worker pool"""
+
+    async def test_job_completes(self, manager):
+        """Test a submitted job runs and returns its result"""
+        async def work():
+            return _response()
+
+        job = manager.submit("upload", work)
+
+        assert job.status == "queued"
+        assert await job.wait() == _response()
+        assert job.snapshot().status == "completed"
+        assert manager.get(job.id) is job
+
+    async def test_progress_is_reported(self, manager):
+        """Test report_progress() inside the work updates the job stage"""
+        release = asyncio.Event()
+
+        async def work():
+            report_progress(TRANSCRIBING, chunks_done=1, chunks_total=3)
+            await release.wait()
+            return _response()
+
+        job = manager.submit("upload", work)
+        stream = job.changes(heartbeat=5.0)
+        seen = []
+        async for status in stream:
+            seen.append((status.status, status.stage, status.chunks_done, status.chunks_total))
+            if status.stage == TRANSCRIBING:
+                release.set()
+            if status.status == "completed":
+                break
+
+        assert ("running", TRANSCRIBING, 1, 3) in seen
+        assert seen[-1][:2] == ("completed", "completed")
+
+    async def test_changes_ends_with_final_snapshot(self, manager):
+        """Test the final snapshot is sent even if the job finished while the consumer was busy"""
+        release = asyncio.Event()
+
+        async def work():
+            report_progress(TRANSCRIBING)
+            await release.wait()
+            return _response()
+
+        job = manager.submit("upload", work)
+        seen = []
+        async for status in job.changes(heartbeat=5.0):
+            seen.append(status.status)
+            if status.stage == TRANSCRIBING:
+                release.set()
+                await job.wait()  # finishes before the generator resumes
+
+        assert seen[-1] == "completed"
+
+    async def test_failure_is_recorded_and_reraised(self, manager):
+        """Test errors fail the job and are re-raised to waiters"""
+        async def work():
+            raise STTError(message="STT API 호출에 실패했습니다")
+
+        job = manager.submit("upload", work)
+
+        with pytest.raises(STTError):
+            await job.wait()
+        snapshot = job.snapshot()
+        assert snapshot.status == "failed"
+        assert snapshot.error.error == ErrorCode.STT_ERROR.value
+
+    async def test_pool_bounds_concurrency(self):
+        """Test no more than `workers` jobs run at once"""
+        manager = STTJobManager(workers=2, queue_size=10, retention_seconds=60)
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return _response()
+
+        jobs = [manager.submit("upload", work) for _ in range(4)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+        await manager.stop()
+
+        assert peak == 2
+
+    async def test_full_queue_rejected(self, manager):
+        """Test submissions beyond the queue size get 503"""
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return _response()
+
+        jobs = [manager.submit("upload", work) for _ in range(2)]
+        await asyncio.sleep(0)  # workers pick up the first two
+        jobs += [manager.submit("upload", work) for _ in range(2)]
+
+        with pytest.raises(AIServiceError) as exc_info:
+            manager.submit("upload", work)
+
+        assert exc_info.value.status_code == 503
+        release.set()
+        await asyncio.gather(*(job.wait() for job in jobs))
+
+    async def test_cancelled_run_cancels_running_work(self, manager):
+        """Test a cancelled synchronous caller stops the job's work before returning"""
+        started = asyncio.Event()
+        work_cancelled = False
+
+        async def work():
+            nonlocal work_cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                work_cancelled = True
+                raise
+            return _response()
+
+        caller = asyncio.create_task(manager.run("upload", work))
+        await started.wait()
+        caller.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert work_cancelled
+        job = next(iter(manager._jobs.values()))
+        assert job.status == "failed"
+        assert manager.stats()["running"] == 0
+
+    async def test_cancelled_run_drops_queued_job(self):
+        """Test a job cancelled while queued never runs and doesn't hold a worker"""
+        manager = STTJobManager(workers=1, queue_size=10, retention_seconds=60)
+        release = asyncio.Event()
+        ran = []
+
+        async def blocking():
+            await release.wait()
+            return _response()
+
+        async def work():
+            ran.append(True)
+            return _response()
+
+        first = manager.submit("upload", blocking)
+        caller = asyncio.create_task(manager.run("upload", work))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        release.set()
+        await first.wait()
+        await manager.stop()
+
+        assert ran == []
+        assert caller.cancelled()
+
+    async def test_stop_fails_pending_jobs(self, manager):
+        """Test shutdown fails queued and running jobs instead of hanging"""
+        async def work():
+            await asyncio.sleep(10)
+            return _response()
+
+        job = manager.submit("upload", work)
+        await asyncio.sleep(0)
+        await manager.stop()
+
+        assert job.status == "failed"
+        assert job.snapshot().error.error == ErrorCode.SERVICE_UNAVAILABLE.value
+
+
+class TestSTTJobEndpoints:
+    """Tests for /stt/jobs"""
+
+    def test_video_job_lifecycle(self, jobs_client, mock_stt_api, fake_youtube_dl):
+        """Test POST returns a job id immediately and GET reports the result"""
+        response = jobs_client.post("/stt/jobs/video/dQw4w9WgXcQ?language=ko")
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ("queued", "running")
+        assert job["result"] is None
+
+        data = _wait_for_job(jobs_client, job["job_id"])
+
+        assert data["status"] == "completed"
+        assert data["result"]["text"] == mock_stt_api["text"]
+        assert fake_youtube_dl.extractions == 1
+
+    def test_upload_job(self, jobs_client, mock_stt_api):
+        """Test an uploaded file outlives the request that created the job"""
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+
+        response = jobs_client.post("/stt/jobs", files=files)
+
+        assert response.status_code == 202
+        data = _wait_for_job(jobs_client, response.json()["job_id"])
+        assert data["status"] == "completed"
+        assert data["result"]["segments"][0]["text"] == mock_stt_api["segments"][0]["text"]
+
+    def test_upload_job_validates_upfront(self, jobs_client):
+        """Test invalid files are rejected before a job is created"""
+        files = {"audio": ("test.txt", BytesIO(b"not audio"), "text/plain")}
+
+        response = jobs_client.post("/stt/jobs", files=files)
+
+        assert response.status_code == 400
+
+    def test_failed_job_reports_error(self, jobs_client, fake_youtube_dl):
+        """Test a failing download ends the job with a flat error"""
+        download = AsyncMock(return_value=(None, None))
+        with patch("app.services.video.stt_pipeline.YouTubeAudioDownloader.download_audio", new=download):
+            job_id = jobs_client.post("/stt/jobs/video/private123").json()["job_id"]
+            data = _wait_for_job(jobs_client, job_id)
+
+        assert data["status"] == "failed"
+        assert data["error"]["error"] == ErrorCode.STT_ERROR.value
+        assert data["result"] is None
+
+    def test_unknown_job(self, jobs_client):
+        """Test unknown job ids return 404"""
+        response = jobs_client.get("/stt/jobs/does-not-exist")
+
+        assert response.status_code == 404
+        assert response.json()["error"] == ErrorCode.JOB_NOT_FOUND.value
+
+    def test_events_stream(self, jobs_client, mock_stt_api):
+        """Test the SSE stream ends with a completed event carrying the result"""
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+        job_id = jobs_client.post("/stt/jobs", files=files).json()["job_id"]
+
+        with jobs_client.stream("GET", f"/stt/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+
+        events = [block for block in body.split("\n\n") if block.startswith("event:")]
+        last_event, last_data = events[-1].split("\n", 1)
+        assert last_event == "event: completed"
+        assert json.loads(last_data.removeprefix("data: "))["result"]["text"] == mock_stt_api["text"]
+
+    def test_sync_endpoint_still_returns_result(self, jobs_client, mock_stt_api):
+        """Test /stt/transcribe keeps its synchronous response"""
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+
+        response = jobs_client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 200
+        assert response.json()["text"] == mock_stt_api["text"]
@@ -0,0 +1,175 @@
+"""Tests for the adaptive STT concurrency limiter"""
+
+import asyncio
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError, ErrorCode, STTError
+from app.core.metrics import metrics
+from app.core.rate_limiter import limiter as rate_limiter
+from app.services.video.stt_client import STTClient
+from app.services.video.stt_limiter import AdaptiveLimiter, get_stt_limiter
+
+
+def _limiter(**kwargs) -> AdaptiveLimiter:
+    options = dict(
+        initial=2, min_limit=1, max_limit=10, backoff=0.5,
+        latency_tolerance=2.0, queue_timeout=1.0,
+    )
+    return AdaptiveLimiter(**{**options, **kwargs})
+
+
+class TestAdaptiveLimiter:
+    """Tests for AIMD limit changes and the local wait queue"""
+
+    async def test_additive_increase_while_latency_is_stable(self):
+        """Test stable successes add about one slot per limit's worth of requests"""
+        limiter = _limiter(initial=2)
+
+        for _ in range(3):  # 2 -> 2.5 -> 2.9 -> 3.24
+            await limiter.acquire()
+            limiter.on_success(1.0)
+
+        assert limiter.stats()["limit"] == 3
+
+    async def test_slow_responses_hold_the_limit(self):
+        """Test latency beyond the tolerance stops the limit growing"""
+        limiter = _limiter(initial=2)
+        await limiter.acquire()
+        limiter.on_success(1.0)
+        before = limiter.limit
+
+        await limiter.acquire()
+        limiter.on_success(5.0)
+
+        assert limiter.limit == before
+
+    async def test_multiplicative_decrease_once_per_latency(self):
+        """Test a burst of failures halves the limit once, not per failure"""
+        limiter = _limiter(initial=8)
+        limiter.latency = 30.0
+
+        for _ in range(3):
+            await limiter.acquire()
+            limiter.on_congestion()
+
+        assert limiter.stats()["limit"] == 4
+        assert limiter.stats()["in_flight"] == 0
+
+    async def test_limit_never_below_min(self):
+        """Test repeated congestion stops at the minimum limit"""
+        limiter = _limiter(initial=2, min_limit=1)
+
+        for _ in range(5):
+            await limiter.acquire()
+            limiter.on_congestion()
+
+        assert limiter.stats()["limit"] == 1
+
+    async def test_overflow_waits_for_a_slot(self):
+        """Test a request over the limit runs once a slot is released"""
+        limiter = _limiter(initial=1)
+        await limiter.acquire()
+
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["waiting"] == 1
+
+        limiter.release()
+        await waiting
+
+        assert limiter.stats() | {"latency": 0} == {"limit": 1, "in_flight": 1, "waiting": 0, "latency": 0}
+
+    async def test_queue_timeout_rejects_with_retry_after(self):
+        """Test a request that can't get a slot in time gets 503 with retry_after"""
+        limiter = _limiter(initial=1, queue_timeout=0.05)
+        limiter.latency = 4.2
+        await limiter.acquire()
+
+        with pytest.raises(AIServiceError) as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.code == ErrorCode.STT_UNAVAILABLE
+        assert exc_info.value.details["retry_after"] == 5
+        assert limiter.stats()["waiting"] == 0
+
+    async def test_fail_fast_without_queue(self):
+        """Test queue_timeout 0 rejects immediately"""
+        limiter = _limiter(initial=1, queue_timeout=0)
+        await limiter.acquire()
+
+        with pytest.raises(AIServiceError):
+            await limiter.acquire()
+
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test cancelling a waiting request doesn't leak a slot"""
+        limiter = _limiter(initial=1)
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        limiter.release()
+
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["waiting"] == 0
+
+
+def _server_error(*args, **kwargs):
+    request = httpx.Request("POST", "http://localhost:12321/whisperX/transcribe")
+    response = MagicMock()
+    response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        "server error", request=request, response=httpx.Response(503, request=request)
+    )
+    return response
+
+
+class TestSTTClientLimiting:
+    """Tests for the limiter in front of STT requests"""
+
+    async def test_server_errors_cut_the_limit(self, monkeypatch):
+        """Test 5xx responses from WhisperX lower the concurrency limit"""
+        monkeypatch.setattr(get_settings(), "retry_base_delay", 0.0)
+
+        async def post(*args, **kwargs):
+            return _server_error()
+
+        with patch("httpx.AsyncClient.post", new=post):
+            with pytest.raises(STTError):
+                await STTClient().transcribe(b"ID3fake audio", filename="test.mp3")
+
+        stats = get_stt_limiter().stats()
+        assert stats["limit"] < get_settings().stt_concurrency_initial
+        assert stats["in_flight"] == 0
+
+    def test_overloaded_endpoint_returns_retry_after(self, client, mock_stt_api):
+        """Test a request that gets no slot answers 503 with a Retry-After header"""
+        rate_limiter.reset()
+
+        async def busy_acquire():
+            raise get_stt_limiter()._rejected("full")
+
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+        with patch.object(get_stt_limiter(), "acquire", new=busy_acquire):
+            response = client.post("/stt/transcribe", files=files)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json()["error"] == ErrorCode.STT_UNAVAILABLE.value
+
+    def test_limit_is_exposed_in_metrics(self, client, mock_stt_api):
+        """Test /metrics reports the current limit and in-flight count"""
+        rate_limiter.reset()
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+        client.post("/stt/transcribe", files=files)
+
+        state = metrics.snapshot()["collectors"]["stt_concurrency"]
+
+        assert state["in_flight"] == 0
+        assert state["limit"] >= get_settings().stt_concurrency_initial
@@ -0,0 +1,210 @@
+"""Tests for preview mode (max_seconds, partial transcripts)"""
+
+import json
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.config import get_settings
+from app.models import STTResponse, STTSegment
+from app.services.video.audio_normalizer import upload_format
+from app.services.video.audio_stream import FFmpegStreamSource
+from app.services.video.stt_pipeline import limit_transcript, transcribe_audio, transcribe_video
+
+SAMPLE_RATE = 16000
+
+# Stands in for ffmpeg: copies 16 kHz s16le PCM, honouring -t
+LIMITING_FFMPEG = """
+args = sys.argv[1:]
+limit = None
+if "-t" in args:
+    limit = int(float(args[args.index("-t") + 1]) * 16000 * 2)
+data = sys.stdin.buffer.read(limit) if limit else sys.stdin.buffer.read()
+sys.stdout.buffer.write(data)
+"""
+
+STT_SEGMENTS = [
+    {"start": 0.0, "end": 3.0, "text": "첫 문장"},
+    {"start": 3.0, "end": 8.0, "text": "두 번째 문장"},
+    {"start": 8.0, "end": 10.0, "text": "마지막"},
+]
+
+
+def _response(segments=STT_SEGMENTS) -> STTResponse:
+    return STTResponse(
+        text=" ".join(s["text"] for s in segments),
+        language="ko",
+        language_probability=0.9,
+        segments=[STTSegment(**s) for s in segments],
+    )
+
+
+@pytest.fixture
+def limiting_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(LIMITING_FFMPEG)
+
+
+@pytest.fixture
+def stt_capture():
+    """Mock STT API that records uploaded bytes and returns STT_SEGMENTS"""
+    uploads = []
+
+    async def capture_post(self, url, content=None, files=None, **kwargs):
+        if content is not None:
+            uploads.append(b"".join([chunk async for chunk in content]))
+        response = MagicMock()
+        response.content = json.dumps({"text": "x", "language": "ko", "segments": STT_SEGMENTS}).encode()
+        return response
+
+    with patch("httpx.AsyncClient.post", new=capture_post):
+        yield uploads
+
+
+class TestLimitTranscript:
+    """Tests for cutting a transcript to max_seconds"""
+
+    def test_drops_and_clamps_segments(self):
+        """Test later segments are dropped and the straddling one is clamped"""
+        result = limit_transcript(_response(), 5)
+
+        assert result.partial is True
+        assert [(s.start, s.end) for s in result.segments] == [(0.0, 3.0), (3.0, 5.0)]
+        assert result.text == "첫 문장 두 번째 문장"
+
+    def test_short_transcript_is_complete(self):
+        """Test a transcript within the limit is returned unchanged"""
+        result = _response()
+
+        assert limit_transcript(result, 60) is result
+        assert limit_transcript(result, None) is result
+
+    def test_cut_audio_is_partial(self):
+        """Test audio cut by ffmpeg is marked partial even if no segment was dropped"""
+        result = limit_transcript(_response(), 60, cut=True)
+
+        assert result.partial is True
+        assert result.segments == _response().segments
+
+
+class TestPreviewUpload:
+    """Tests for max_seconds on uploads"""
+
+    async def test_decode_is_cut(self, limiting_ffmpeg, stt_capture, monkeypatch):
+        """Test only the first max_seconds are decoded and uploaded"""
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        pcm = np.zeros(10 * SAMPLE_RATE, dtype="<i2").tobytes()
+
+        result = await transcribe_audio(pcm, "audio.wav", language="ko", max_seconds=4)
+
+        assert len(stt_capture) == 1
+        assert 4 * SAMPLE_RATE * 2 <= len(stt_capture[0]) < 5 * SAMPLE_RATE * 2
+        assert result.partial is True
+        assert result.segments[-1].end == 4.0
+
+    async def test_normalized_upload_is_cut(self, limiting_ffmpeg, stt_capture, monkeypatch):
+        """Test the single-request path transcodes only max_seconds without VAD or chunking"""
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        monkeypatch.setattr(get_settings(), "stt_chunk_seconds", 0)
+        pcm = np.zeros(10 * SAMPLE_RATE, dtype="<i2").tobytes()
+
+        await transcribe_audio(pcm, "audio.wav", language="ko", max_seconds=4)
+
+        (args,) = limiting_ffmpeg.calls()
+        assert args[args.index("-t") + 1] == "4"
+        assert len(stt_capture) == 1
+        assert 4 * SAMPLE_RATE * 2 <= len(stt_capture[0]) < 5 * SAMPLE_RATE * 2
+
+    async def test_short_audio_is_not_partial(self, limiting_ffmpeg, stt_capture, monkeypatch):
+        """Test audio shorter than max_seconds gives a complete transcript"""
+        monkeypatch.setattr(get_settings(), "stt_vad_enabled", False)
+        pcm = np.zeros(12 * SAMPLE_RATE, dtype="<i2").tobytes()
+
+        result = await transcribe_audio(pcm, "audio.wav", language="ko", max_seconds=30)
+
+        assert result.partial is False
+        assert len(result.segments) == 3
+
+    def test_endpoint_without_ffmpeg(self, client, mock_stt_api):
+        """Test the single-request fallback drops segments past max_seconds"""
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files, data={"max_seconds": "2"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["partial"] is True
+        assert data["segments"] == [{"start": 0.0, "end": 2.0, "text": mock_stt_api["segments"][0]["text"]}]
+
+    def test_invalid_max_seconds(self, client):
+        """Test max_seconds must be positive"""
+        files = {"audio": ("test.mp3", BytesIO(b"ID3fake audio content"), "audio/mpeg")}
+
+        response = client.post("/stt/transcribe", files=files, data={"max_seconds": "0"})
+
+        assert response.status_code == 422
+
+
+class TestPreviewVideo:
+    """Tests for max_seconds on /stt/video"""
+
+    def test_stream_is_cut(self):
+        """Test ffmpeg stops reading the media URL after max_seconds"""
+        source = FFmpegStreamSource("ffmpeg", "https://media.example/a.m4a", upload_format(), max_seconds=120)
+        args = source._args()
+
+        assert args[args.index("-t") + 1] == "120"
+        assert args.index("-i") < args.index("-t")
+
+    async def test_long_video_preview_is_allowed(self, fake_youtube_dl, stt_capture, monkeypatch):
+        """Test a video over the duration limit can still be previewed"""
+        monkeypatch.setattr(fake_youtube_dl, "info", {**fake_youtube_dl.info, "duration": 99999})
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        result = await transcribe_video("abc123", language="ko", max_seconds=60)
+
+        assert result.partial is True
+        assert fake_youtube_dl.downloads == 1
+
+    async def test_download_fetches_only_the_preview(self, fake_youtube_dl, limiting_ffmpeg, stt_capture, monkeypatch):
+        """Test the download fallback asks yt-dlp for the first max_seconds only"""
+        monkeypatch.setattr(get_settings(), "stt_video_streaming", False)
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        await transcribe_video("abc123", language="ko", max_seconds=60)
+
+        ranges = fake_youtube_dl.download_opts["download_ranges"]
+        assert ranges.ranges == [(0, 60)]
+        assert fake_youtube_dl.download_opts["ffmpeg_location"] == limiting_ffmpeg.path
+
+    async def test_short_video_download_is_whole(self, fake_youtube_dl, limiting_ffmpeg, stt_capture, monkeypatch):
+        """Test a video shorter than max_seconds is downloaded without a range"""
+        monkeypatch.setattr(get_settings(), "stt_video_streaming", False)
+        monkeypatch.setattr(get_settings(), "stt_normalize_audio", False)
+
+        await transcribe_video("abc123", language="ko", max_seconds=600)
+
+        assert "download_ranges" not in fake_youtube_dl.download_opts
+
+    async def test_captions_are_cut(self, fake_youtube_dl, monkeypatch):
+        """Test caption transcripts are limited too, under their own cache key"""
+        monkeypatch.setattr(fake_youtube_dl, "info", {
+            **fake_youtube_dl.info,
+            "language": "ko",
+            "subtitles": {"ko": [{"ext": "vtt", "url": "https://captions.example/ko.vtt"}]},
+        })
+
+        async def fake_get(self, url, **kwargs):
+            response = MagicMock()
+            response.text = "WEBVTT\n\n00:00:01.000 --> 00:00:03.000\n하나\n\n00:01:10.000 --> 00:01:12.000\n둘\n"
+            return response
+
+        with patch("httpx.AsyncClient.get", new=fake_get):
+            preview = await transcribe_video("abc123", language="ko", max_seconds=60)
+            full = await transcribe_video("abc123", language="ko")
+
+        assert preview.partial is True
+        assert preview.text == "하나"
+        assert full.partial is False
+        assert len(full.segments) == 2
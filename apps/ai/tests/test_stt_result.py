@@ -0,0 +1,82 @@
+"""Tests for the fast STT result construction and pre-serialized responses"""
+
+import json
+
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.metrics import metrics
+from app.core.responses import model_response
+from app.models import STTResponse, STTSegment
+from app.services.video.stt_result import build_stt_response, construct_segments
+
+
+def _result(segments: list[dict]) -> dict:
+    return {"text": "전체", "language": "ko", "language_probability": 0.9, "segments": segments}
+
+
+def _build_path() -> str:
+    counters = metrics.snapshot()["counters"]["stt_result_build"]
+    return counters[0]["labels"]["path"]
+
+
+class TestBuildSTTResponse:
+    """Tests for trusted construction and its fallback to validation"""
+
+    def test_trusted_path_matches_validation(self):
+        """Test segments built without validation equal validated ones"""
+        metrics.reset()
+        segments = [{"start": i, "end": i + 0.5, "text": f"문장 {i}", "words": []} for i in range(3000)]
+
+        response = build_stt_response(_result(segments), "auto")
+
+        assert _build_path() == "trusted"
+        expected = [STTSegment(**seg) for seg in segments]
+        assert response.segments == expected
+        assert type(response.segments[0].start) is float
+        assert response.model_dump() == STTResponse(**{**_result(segments), "segments": expected}).model_dump()
+
+    def test_defaults_for_missing_fields(self):
+        """Test language falls back to the requested one and segments to empty"""
+        response = build_stt_response({"text": "ok"}, "ko")
+
+        assert (response.language, response.language_probability, response.segments) == ("ko", 1.0, [])
+
+    @pytest.mark.parametrize("segment", [
+        {"start": 2.0, "end": 1.0, "text": "거꾸로"},
+        {"start": -1.0, "end": 1.0, "text": "음수"},
+        {"start": 0.0, "end": 1.0, "text": 5},
+        {"start": 0.0, "text": "끝 없음"},
+    ])
+    def test_invalid_segments_fail_validation_as_before(self, segment):
+        """Test segments the vectorized check rejects go through normal validation"""
+        metrics.reset()
+        segments = [{"start": 0.0, "end": 0.5, "text": "정상"}, segment]
+
+        with pytest.raises(PydanticValidationError):
+            build_stt_response(_result(segments), "ko")
+
+        assert _build_path() == "validated"
+
+    def test_nan_is_not_trusted(self):
+        """Test NaN timestamps are left to validation"""
+        assert construct_segments([float("nan")], [1.0], ["x"]) is None
+
+
+class TestModelResponse:
+    """Tests for pre-serialized JSON responses"""
+
+    def test_body_matches_model(self):
+        """Test the response body is the model's JSON"""
+        response = STTResponse(
+            text="안녕",
+            language="ko",
+            language_probability=0.9,
+            segments=[STTSegment(start=0, end=1, text="안녕")],
+        )
+
+        http_response = model_response(response, status_code=202)
+
+        assert http_response.status_code == 202
+        assert http_response.media_type == "application/json"
+        assert json.loads(http_response.body) == response.model_dump()
@@ -0,0 +1,164 @@
+"""Tests for the persistent transcript cache"""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.config import get_settings
+from app.core.rate_limiter import limiter
+from app.models import STTResponse, STTSegment
+from app.services.video.stt_pipeline import transcribe_audio
+from app.services.video.transcript_cache import (
+    TranscriptCache,
+    decode_transcript,
+    encode_transcript,
+    get_transcript_cache,
+    video_cache_key,
+)
+
+STT_RESULT = {
+    "text": "캐시된 자막입니다.",
+    "language": "ko",
+    "language_probability": 0.95,
+    "segments": [{"start": 0.0, "end": 2.5, "text": "캐시된 자막입니다."}],
+}
+
+
+def _response(text: str = "안녕하세요") -> STTResponse:
+    return STTResponse(
+        text=text,
+        language="ko",
+        language_probability=0.9,
+        segments=[STTSegment(start=0.0, end=1.25, text=text)],
+    )
+
+
+@pytest.fixture
+def counting_stt_api():
+    """Mock STT API that counts requests"""
+    calls = []
+
+    async def mock_post(*args, **kwargs):
+        calls.append(kwargs)
+        mock = MagicMock()
+        mock.status_code = 200
+        mock.content = json.dumps(STT_RESULT).encode()
+        return mock
+
+    with patch("httpx.AsyncClient.post", new=mock_post):
+        yield calls
+
+
+class TestTranscriptEncoding:
+    """Tests for the compact serialized form"""
+
+    def test_round_trip(self):
+        """Test a transcript survives encode/decode unchanged"""
+        response = _response("한국어 텍스트 " * 50)
+
+        data = encode_transcript(response)
+
+        assert decode_transcript(data) == response
+        assert len(data) < len(response.model_dump_json())
+
+
+class TestTranscriptCache:
+    """Tests for TTL and LRU eviction"""
+
+    async def test_get_put(self, tmp_path):
+        """Test a stored transcript is returned by key"""
+        cache = TranscriptCache(str(tmp_path / "t.sqlite3"), max_bytes=1 << 20, ttl_seconds=60)
+
+        assert await cache.get("video:abc:ko") is None
+        await cache.put("video:abc:ko", _response())
+
+        assert await cache.get("video:abc:ko") == _response()
+        assert cache.stats()["entries"] == 1
+        cache.close()
+
+    async def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test entries older than the TTL are dropped"""
+        cache = TranscriptCache(str(tmp_path / "t.sqlite3"), max_bytes=1 << 20, ttl_seconds=60)
+        await cache.put("video:abc:ko", _response())
+
+        with patch("app.services.video.transcript_cache.time.time", return_value=time.time() + 120):
+            assert await cache.get("video:abc:ko") is None
+
+        assert cache.stats()["entries"] == 0
+        cache.close()
+
+    async def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entry is evicted when over size"""
+        entry_size = len(encode_transcript(_response("a")))
+        cache = TranscriptCache(str(tmp_path / "t.sqlite3"), max_bytes=entry_size * 2, ttl_seconds=60)
+
+        await cache.put("k1", _response("a"))
+        await cache.put("k2", _response("b"))
+        # Touch k1 so k2 becomes least recently used
+        assert await cache.get("k1") is not None
+        await cache.put("k3", _response("c"))
+
+        assert await cache.get("k1") is not None
+        assert await cache.get("k2") is None
+        assert await cache.get("k3") is not None
+        cache.close()
+
+    async def test_disabled_cache_always_misses(self):
+        """Test path=None never stores anything"""
+        cache = TranscriptCache(None, max_bytes=1 << 20, ttl_seconds=60)
+        await cache.put("k1", _response())
+
+        assert await cache.get("k1") is None
+        assert cache.stats() == {"enabled": False}
+
+    def test_off_without_a_path(self, monkeypatch):
+        """Test the default empty TRANSCRIPT_CACHE_PATH leaves the cache off"""
+        monkeypatch.setattr(get_settings(), "transcript_cache_path", "")
+        get_transcript_cache.cache_clear()
+
+        assert not get_transcript_cache().enabled
+
+
+class TestTranscriptCacheLookups:
+    """Tests for cache lookups in the STT pipeline and video route"""
+
+    async def test_same_audio_skips_stt(self, counting_stt_api):
+        """Test re-uploading identical audio is served from the cache"""
+        audio = b"identical audio bytes" * 100
+
+        first = await transcribe_audio(audio, filename="a.mp3", language="ko")
+        second = await transcribe_audio(audio, filename="b.mp3", language="ko")
+
+        assert len(counting_stt_api) == 1
+        assert second == first
+
+    async def test_language_is_part_of_the_key(self, counting_stt_api):
+        """Test the same audio with another language hint is transcribed again"""
+        audio = b"identical audio bytes" * 100
+
+        await transcribe_audio(audio, filename="a.mp3", language="ko")
+        await transcribe_audio(audio, filename="a.mp3", language="en")
+
+        assert len(counting_stt_api) == 2
+
+    def test_cached_video_skips_download(self, client, counting_stt_api, fake_youtube_dl):
+        """Test a cached video id returns without downloading"""
+        limiter.reset()
+        first = client.post("/stt/video/dQw4w9WgXcQ?language=ko")
+        second = client.post("/stt/video/dQw4w9WgXcQ?language=ko")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert fake_youtube_dl.extractions == 1
+        assert len(counting_stt_api) == 1
+
+    async def test_cached_video_key(self):
+        """Test video results are stored under (video_id, language)"""
+        cache = get_transcript_cache()
+        await cache.put(video_cache_key("abc", "auto"), _response())
+
+        assert await cache.get(video_cache_key("abc", "auto")) is not None
+        assert await cache.get(video_cache_key("abc", "ko")) is None
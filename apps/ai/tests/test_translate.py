@@ -143,20 +143,46 @@ class TestTranslateEndpoint:
         assert "translatedCount" in data["meta"]
         assert "processingTime" in data["meta"]
 
+        # Single-target responses keep the original shape
+        assert "translations" not in segment
+        assert "targetLanguages" not in data["meta"]
+
+    def test_translate_multiple_targets(self, client, mock_openai_translation):
+        """Test multiple target languages in one request"""
+        response = client.post(
+            "/api/v1/translate",
+            json={
+                "segments": [
+                    {"start": 0.0, "end": 5.0, "text": "Hello world"},
+                    {"start": 5.0, "end": 10.0, "text": "How are you?"},
+                ],
+                "sourceLanguage": "en",
+                "targetLanguages": ["ko", "ja", "ko"],
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meta"]["targetLanguages"] == ["ko", "ja"]
+
+        segment = data["data"]["segments"][0]
+        assert set(segment["translations"]) == {"ko", "ja"}
+        assert segment["translatedText"] == segment["translations"]["ko"]
+
+        # One batch per language, no duplicate work for repeated languages
+        assert mock_openai_translation.chat.completions.create.call_count == 2
+
+    def test_translate_empty_target_languages(self, client):
+        """Test with empty targetLanguages list"""
+        response = client.post(
+            "/api/v1/translate",
+            json={
+                "segments": [
+                    {"start": 0.0, "end": 5.0, "text": "Hello"},
+                ],
+                "targetLanguages": [],
+            },
+        )
+
+        assert response.status_code == 422
 
-@pytest.fixture
-def mock_openai_translation():
-    """Mock OpenAI client for translation"""
-    with patch("app.services.translation.OpenAI") as mock:
-        mock_instance = MagicMock()
-        mock_response = MagicMock()
-        mock_response.choices = [
-            MagicMock(
-                message=MagicMock(
-                    content='{"translations": [{"id": 0, "text": "번역된 텍스트"}, {"id": 1, "text": "번역된 텍스트 2"}]}'
-                )
-            )
-        ]
-        mock_instance.chat.completions.create.return_value = mock_response
-        mock.return_value = mock_instance
-        yield mock_instance
@@ -0,0 +1,161 @@
+"""Tests for VAD silence trimming and timestamp remapping"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.models import STTSegment
+from app.services.video.multipart_stream import BytesSource
+from app.services.video.stt_pipeline import transcribe_audio
+from app.services.video.vad import FRAME_SECONDS, OffsetMap, decode_audio, detect_speech
+
+SAMPLE_RATE = 16000
+
+# Stands in for ffmpeg: input is already 16 kHz s16le PCM, so decoding and
+# encoding are both a copy
+PASSTHROUGH_FFMPEG = """
+import shutil
+shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)
+"""
+
+
+def _pcm(*parts: tuple[str, float]) -> bytes:
+    """Build s16le PCM from ("tone"|"silence", seconds) parts"""
+    chunks = []
+    for kind, seconds in parts:
+        n = int(seconds * SAMPLE_RATE)
+        if kind == "tone":
+            t = np.arange(n) / SAMPLE_RATE
+            chunks.append((np.sin(2 * np.pi * 220 * t) * 8000).astype("<i2"))
+        else:
+            chunks.append(np.zeros(n, dtype="<i2"))
+    return np.concatenate(chunks).tobytes()
+
+
+@pytest.fixture
+def passthrough_ffmpeg(install_ffmpeg):
+    return install_ffmpeg(PASSTHROUGH_FFMPEG)
+
+
+class TestOffsetMap:
+    """Tests for trimmed -> original time mapping"""
+
+    def test_maps_across_cuts(self):
+        """Test times after a cut are shifted by the removed silence"""
+        offset_map = OffsetMap([(0.0, 10.0), (30.0, 40.0)])
+
+        assert offset_map.trimmed_duration == 20.0
+        assert offset_map.to_original(5.0) == 5.0
+        assert offset_map.to_original(15.0) == 35.0
+
+    def test_boundary_start_and_end(self):
+        """Test a boundary time maps forward for starts, backward for ends"""
+        offset_map = OffsetMap([(0.0, 10.0), (30.0, 40.0)])
+
+        assert offset_map.to_original(10.0) == 30.0
+        assert offset_map.to_original(10.0, is_end=True) == 10.0
+
+    def test_window(self):
+        """Test a trimmed-time window maps to original spans"""
+        offset_map = OffsetMap([(0.0, 10.0), (30.0, 40.0)])
+
+        assert offset_map.window(5.0, 15.0) == [(5.0, 10.0), (30.0, 35.0)]
+        assert offset_map.window(12.0, 20.0) == [(32.0, 40.0)]
+
+    def test_remap_segments(self):
+        """Test segments are remapped and never stretch across a cut"""
+        offset_map = OffsetMap([(2.0, 5.0), (60.0, 70.0)])
+        segments = [
+            STTSegment(start=0.0, end=3.0, text="첫 문장"),
+            STTSegment(start=3.0, end=8.0, text="두 번째"),
+        ]
+
+        remapped = offset_map.remap_segments(segments)
+
+        assert (remapped[0].start, remapped[0].end) == (2.0, 5.0)
+        assert (remapped[1].start, remapped[1].end) == (60.0, 65.0)
+        assert remapped[1].text == "두 번째"
+
+
+class TestDetectSpeech:
+    """Tests for energy-based speech detection"""
+
+    def _energies(self, pattern: list[tuple[float, float]]) -> np.ndarray:
+        """Per-frame energies from (dBFS, seconds) parts"""
+        return np.concatenate([
+            np.full(int(round(seconds / FRAME_SECONDS)), db, dtype=np.float32)
+            for db, seconds in pattern
+        ])
+
+    def test_cuts_long_silence_with_padding(self):
+        """Test a long silence is cut, keeping padding on both sides"""
+        energies = self._energies([(-20, 3.0), (-80, 6.0), (-20, 3.0)])
+
+        spans = detect_speech(energies, threshold_db=12, min_silence_seconds=2.0, padding_seconds=0.3)
+
+        assert spans == [(0.0, 3.3), (8.7, 12.0)]
+
+    def test_keeps_short_pauses(self):
+        """Test pauses shorter than min_silence_seconds are kept"""
+        energies = self._energies([(-20, 3.0), (-80, 0.9), (-20, 3.0)])
+
+        spans = detect_speech(energies, threshold_db=12, min_silence_seconds=2.0, padding_seconds=0.3)
+
+        assert spans == [(0.0, 6.9)]
+
+    def test_all_silence_keeps_everything(self):
+        """Test silent audio isn't trimmed to nothing"""
+        energies = self._energies([(-90, 6.0)])
+
+        spans = detect_speech(energies, threshold_db=12, min_silence_seconds=2.0, padding_seconds=0.3)
+
+        assert spans == [(0.0, 6.0)]
+
+
+class TestDecodeAudio:
+    """Tests for the VAD stage with a passthrough ffmpeg"""
+
+    async def test_trims_and_reports(self, passthrough_ffmpeg):
+        """Test silence is removed from the encoded audio"""
+        pcm = _pcm(("tone", 2.0), ("silence", 5.0), ("tone", 2.0))
+
+        decoded = await decode_audio(BytesSource(pcm), len(pcm))
+
+        assert decoded is not None
+        try:
+            assert decoded.duration == pytest.approx(9.0)
+            assert decoded.trimmed_seconds == pytest.approx(4.4, abs=0.05)
+
+            encoded = await decoded.encode()
+            assert encoded.size == pytest.approx(len(pcm) * 4.6 / 9.0, rel=0.01)
+            encoded.close()
+        finally:
+            decoded.close()
+
+    async def test_pipeline_remaps_segments(self, passthrough_ffmpeg):
+        """Test STT timestamps come back in original video time"""
+        pcm = _pcm(("tone", 2.0), ("silence", 5.0), ("tone", 2.0))
+        stt_result = {
+            "text": "하나 둘",
+            "language": "ko",
+            "segments": [
+                {"start": 0.5, "end": 1.5, "text": "하나"},
+                {"start": 2.6, "end": 4.0, "text": "둘"},
+            ],
+        }
+
+        async def mock_post(*args, **kwargs):
+            response = MagicMock()
+            response.content = json.dumps(stt_result).encode()
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch("httpx.AsyncClient.post", new=mock_post):
+            result = await transcribe_audio(pcm, filename="audio.wav")
+
+        assert (result.segments[0].start, result.segments[0].end) == (0.5, 1.5)
+        # The second span starts ~0.3s before the tone resumes at 7.0s
+        assert result.segments[1].start == pytest.approx(7.0, abs=0.05)
+        assert result.segments[1].end == pytest.approx(8.4, abs=0.05)
@@ -0,0 +1,195 @@
+"""Tests for the yt-dlp worker pool"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+import yt_dlp
+
+from app.config import get_settings
+from app.core.exceptions import AIServiceError
+from app.core.metrics import metrics
+from app.services.video.youtube_audio import YouTubeAudioDownloader, audio_format_selector
+from app.services.video.ytdlp_pool import YtDlpPool, worker_info
+
+
+def _blocking_sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+class TestYtDlpPool:
+    """Tests for pool sizing and queueing"""
+
+    async def test_process_workers_have_yt_dlp_imported(self):
+        """Test process mode runs calls in warm worker processes"""
+        pool = YtDlpPool("process", workers=1, queue_size=1)
+        try:
+            pid, imported = await pool.run(worker_info)
+        finally:
+            pool.shutdown()
+
+        assert pid != os.getpid()
+        assert imported is True
+
+    async def test_blocking_call_does_not_block_loop(self):
+        """Test the event loop keeps running while yt-dlp blocks a worker"""
+        pool = YtDlpPool("thread", workers=1, queue_size=1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await pool.run(_blocking_sleep, 0.2)
+        task.cancel()
+        pool.shutdown()
+
+        assert ticks >= 5
+
+    async def test_queue_limit(self):
+        """Test calls beyond workers + queue_size are rejected with 503"""
+        pool = YtDlpPool("thread", workers=1, queue_size=1)
+        release = threading.Event()
+
+        running = asyncio.create_task(pool.run(release.wait, 5))
+        queued = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        assert pool.stats()["running"] == 1
+        assert pool.stats()["queued"] == 1
+        with pytest.raises(AIServiceError) as exc_info:
+            await pool.run(release.wait, 5)
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        await asyncio.gather(running, queued)
+        pool.shutdown()
+
+    def test_invalid_mode(self):
+        """Test unknown pool modes fail fast"""
+        with pytest.raises(AIServiceError):
+            YtDlpPool("fork", workers=1, queue_size=1)
+
+
+class TestYouTubeAudioDownloader:
+    """Tests for downloads through the pool"""
+
+    async def test_download_returns_file_and_records_throughput(self, fake_youtube_dl):
+        """Test the download is left on disk and throughput is recorded"""
+        metrics.reset()
+
+        audio, duration = await YouTubeAudioDownloader().download_audio("abc123")
+
+        with audio:
+            assert duration == 90
+            assert audio.size == 4096
+            assert (audio.extension, audio.content_type) == ("m4a", "audio/mp4")
+            source = audio.open()
+            assert await source.read() == b"a" * 4096
+            source.close()
+        assert not audio.path.exists()
+
+        summaries = metrics.snapshot()["summaries"]
+        assert summaries["ytdlp_download_bytes"][0]["sum"] == 4096
+        assert summaries["ytdlp_download_bytes_per_second"][0]["count"] == 1
+        assert summaries["ytdlp_wait_seconds"][0]["count"] == 2  # extraction + download
+
+    async def test_single_extraction_and_cached_info(self, fake_youtube_dl):
+        """Test one extraction per video, reused by later downloads"""
+        downloader = YouTubeAudioDownloader()
+
+        first, _ = await downloader.download_audio("abc123")
+        first.close()
+        second, _ = await downloader.download_audio("abc123")
+        second.close()
+
+        assert fake_youtube_dl.extractions == 1
+        assert fake_youtube_dl.downloads == 2
+
+    async def test_cached_too_long_video_skips_worker(self, fake_youtube_dl, monkeypatch):
+        """Test a cached duration over the limit returns without yt-dlp"""
+        monkeypatch.setattr(fake_youtube_dl, "info", {**fake_youtube_dl.info, "duration": 99999})
+        downloader = YouTubeAudioDownloader()
+
+        assert await downloader.download_audio("long1") == (None, 99999)
+        assert await downloader.download_audio("long1") == (None, 99999)
+        assert fake_youtube_dl.extractions == 1
+        assert fake_youtube_dl.downloads == 0
+
+    async def test_worker_error_returns_none(self, monkeypatch):
+        """Test yt-dlp failures in the worker keep the (None, None) contract"""
+        def failing_extract(video_url):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr("app.services.video.youtube_audio.extract_video_info", failing_extract)
+
+        assert await YouTubeAudioDownloader().download_audio("abc123") == (None, None)
+
+
+# Audio-only formats as YouTube lists them, plus a muxed video format
+FORMATS = [
+    {"format_id": "249", "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 35.0},
+    {"format_id": "139", "ext": "m4a", "acodec": "mp4a.40.5", "vcodec": "none", "abr": 48.8},
+    {"format_id": "250", "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 70.0},
+    {"format_id": "140", "ext": "m4a", "acodec": "mp4a.40.2", "vcodec": "none", "abr": 129.5},
+    {"format_id": "251", "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 160.0},
+    {"format_id": "18", "ext": "mp4", "acodec": "mp4a.40.2", "vcodec": "avc1", "abr": 96.0, "height": 360},
+]
+
+
+def _select_format(formats: list[dict] = FORMATS) -> str:
+    """Run yt-dlp's real format selection offline"""
+    info = {
+        "id": "abc123",
+        "title": "test",
+        "extractor": "generic",
+        "extractor_key": "Generic",
+        "webpage_url": "https://www.youtube.com/watch?v=abc123",
+        "formats": [{**f, "url": f"https://media.example/{f['format_id']}"} for f in formats],
+    }
+    with yt_dlp.YoutubeDL({"quiet": True, "format": audio_format_selector()}) as ydl:
+        return ydl.process_ie_result(info, download=False)["format_id"]
+
+
+class TestAudioFormatSelection:
+    """Tests for the lowest-sufficient-bitrate format policy"""
+
+    def test_smallest_format_above_floor(self, monkeypatch):
+        """Test the smallest audio-only format at or above the floor wins"""
+        monkeypatch.setattr(get_settings(), "ytdlp_audio_min_abr", 48)
+
+        assert _select_format() == "139"
+
+    def test_floor_above_every_format_uses_best(self, monkeypatch):
+        """Test a floor no format reaches falls back to the best audio"""
+        monkeypatch.setattr(get_settings(), "ytdlp_audio_min_abr", 256)
+
+        assert _select_format() == "251"
+
+    def test_unknown_bitrates_use_smallest_audio(self, monkeypatch):
+        """Test formats without abr fall back to the smallest audio-only format"""
+        monkeypatch.setattr(get_settings(), "ytdlp_audio_min_abr", 48)
+        formats = [
+            {k: v for k, v in f.items() if k != "abr"} | {"filesize": int(f["abr"] * 1000)}
+            for f in FORMATS if f["acodec"] == "opus"
+        ]
+
+        assert _select_format(formats) == "249"
+
+    def test_zero_floor_keeps_best_quality(self, monkeypatch):
+        """Test YTDLP_AUDIO_MIN_ABR=0 restores the best-quality selector"""
+        monkeypatch.setattr(get_settings(), "ytdlp_audio_min_abr", 0)
+
+        assert _select_format() == "140"
+
+    def test_explicit_selector_overrides(self, monkeypatch):
+        """Test YTDLP_AUDIO_FORMAT is passed through as is"""
+        monkeypatch.setattr(get_settings(), "ytdlp_audio_format", "250")
+
+        assert _select_format() == "250"
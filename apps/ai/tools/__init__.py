@@ -0,0 +1 @@
+"""Development tools (not imported by the service)"""
@@ -0,0 +1,197 @@
+"""Fake WhisperX server for integration tests and load tests
+
+Implements the two routes the service uses - POST /whisperX/transcribe
+and GET / - with synthetic results, so STTClient and /stt/* can be run end
+to end without the real GPU host:
+
+    python -m tools.fake_whisperx --port 12321 --gpu-slots 2 --realtime-factor 0.05
+    STT_API_URL=http://localhost:12321 python main.py
+
+Audio duration comes from the WAV header, or from the upload size at
+--bytes-per-second for compressed audio (the default matches the 24 kbps
+Opus the service uploads after normalization). The result has one segment
+per --segment-seconds of audio.
+
+Each request holds one of --gpu-slots while it "runs" for
+latency-base + realtime-factor x duration seconds, scaled by log-normal
+jitter. Requests beyond the slots queue like on a real GPU host; more than
+--max-queue waiting get 503. --error-rate answers that share of requests
+with 500.
+
+GET /stats returns request, error and concurrency counters.
+"""
+
+import argparse
+import asyncio
+import io
+import math
+import random
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import uvicorn
+from fastapi import FastAPI, File, Form, UploadFile
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeWhisperXConfig:
+    """Behaviour of the fake server"""
+    segment_seconds: float = 5.0
+    bytes_per_second: int = 3000  # 24 kbps
+    latency_base: float = 0.0  # seconds per request
+    realtime_factor: float = 0.0  # seconds of latency per second of audio
+    latency_jitter: float = 0.0  # sigma of the log-normal latency multiplier
+    error_rate: float = 0.0  # share of requests answered with 500
+    gpu_slots: int = 4  # requests processed at once
+    max_queue: int = 64  # waiting beyond this gets 503
+    language: str = "ko"  # detected language for "auto"
+    seed: int | None = None
+
+
+class FakeWhisperXStats:
+    """Counters for load tests (GET /stats)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.running = 0
+        self.waiting = 0
+        self.peak_running = 0
+        self.audio_seconds = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(vars(self))
+
+
+def audio_duration(data: bytes, bytes_per_second: int) -> float:
+    """Duration from a WAV header, else estimated from the size"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        try:
+            with wave.open(io.BytesIO(data)) as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError):
+            pass
+    return len(data) / bytes_per_second
+
+
+def synthetic_segments(duration: float, segment_seconds: float) -> list[dict[str, Any]]:
+    """One segment per segment_seconds of audio (the last one is shorter)"""
+    count = max(1, math.ceil(duration / segment_seconds))
+    return [
+        {
+            "start": round(i * segment_seconds, 3),
+            "end": round(min(duration, (i + 1) * segment_seconds), 3),
+            "text": f"테스트 문장 {i + 1}번입니다.",
+        }
+        for i in range(count)
+    ]
+
+
+def create_app(config: FakeWhisperXConfig | None = None) -> FastAPI:
+    """Build the fake server app"""
+    config = config or FakeWhisperXConfig()
+    rng = random.Random(config.seed)
+    stats = FakeWhisperXStats()
+    slots = asyncio.Semaphore(config.gpu_slots)
+    app = FastAPI(title="Fake WhisperX")
+    app.state.stats = stats
+
+    @app.get("/")
+    async def root() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    async def get_stats() -> dict[str, Any]:
+        return stats.to_dict()
+
+    @app.post("/whisperX/transcribe")
+    async def transcribe(audio: UploadFile = File(...), language: str = Form("auto")):
+        data = await audio.read()
+        stats.requests += 1
+
+        if stats.waiting >= config.max_queue and slots.locked():
+            stats.rejected += 1
+            return JSONResponse(status_code=503, content={"detail": "queue full"})
+
+        duration = audio_duration(data, config.bytes_per_second)
+        latency = config.latency_base + config.realtime_factor * duration
+        if config.latency_jitter:
+            latency *= rng.lognormvariate(0, config.latency_jitter)
+
+        stats.waiting += 1
+        async with slots:
+            stats.waiting -= 1
+            stats.running += 1
+            stats.peak_running = max(stats.peak_running, stats.running)
+            try:
+                await asyncio.sleep(latency)
+            finally:
+                stats.running -= 1
+
+        if rng.random() < config.error_rate:
+            stats.errors += 1
+            return JSONResponse(status_code=500, content={"detail": "synthetic failure"})
+
+        stats.audio_seconds += duration
+        segments = synthetic_segments(duration, config.segment_seconds)
+        return {
+            "text": " ".join(seg["text"] for seg in segments),
+            "language": config.language if language == "auto" else language,
+            "language_probability": 0.99,
+            "segments": segments,
+        }
+
+    return app
+
+
+@contextmanager
+def running_server(config: FakeWhisperXConfig | None = None) -> Iterator[tuple[str, FakeWhisperXStats]]:
+    """
+    Run the fake server on a free local port in a background thread
+
+    Yields:
+        (base URL, live stats)
+    """
+    app = create_app(config)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("fake WhisperX server did not start")
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    try:
+        yield f"http://127.0.0.1:{port}", app.state.stats
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12321)
+    defaults = FakeWhisperXConfig()
+    for name, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=type(value) if value is not None else int,
+            default=value,
+        )
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    uvicorn.run(create_app(FakeWhisperXConfig(**args)), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()